@@ -9,7 +9,7 @@ from environment variables and .env files.
 from functools import lru_cache
 
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -42,6 +42,18 @@ class Settings(BaseSettings):
     # Temporary Files Configuration
     tmp_path: str = Field(default="tmp", description="Path to temporary files directory")
 
+    question_cache_ttl_seconds: int = Field(
+        default=3600, description="How long a generated assessment question set is reused"
+    )
+
+    strategic_cache_ttl_seconds: int = Field(
+        default=21600, description="How long strategic research and analysis responses are reused"
+    )
+
+    valuation_research_cache_ttl_seconds: int = Field(
+        default=86400, description="How long cached valuation web research is reused"
+    )
+
     # Agent Configuration
     max_tokens_per_request: int = Field(
         default=8000, description="Maximum tokens per OpenAI API request (increased for GPT-5 reasoning tokens)"
@@ -64,14 +76,18 @@ class Settings(BaseSettings):
     # Development Configuration
     reload: bool = Field(default=True, description="Enable auto-reload for development")
 
-    model_config = {
-        "env_file": ".env",
-        "env_file_encoding": "utf-8",
-        "case_sensitive": False,
-    }
+    # Reason: defer_build postpones building the validator until the first Settings()
+    # call, which get_settings() memoizes, instead of paying for it at import time
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        defer_build=True,
+        frozen=True,
+    )
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get cached application settings instance.
@@ -80,6 +96,7 @@ def get_settings() -> Settings:
         Settings instance with loaded configuration
 
     Note:
-        Uses lru_cache for singleton pattern and performance
+        Uses lru_cache for singleton pattern and performance; the instance is
+        frozen so it can be shared safely across the application
     """
     return Settings()
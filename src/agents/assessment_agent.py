@@ -1,12 +1,288 @@
 """Assessment Agent for dynamically generating contextual investment questions."""
 
+import asyncio
+import hashlib
 import logging
-
-from ..models.assessment import AssessmentQuestion, AssessmentResponse, AssessmentResult
+import os
+import random
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Mapping
+from functools import cached_property
+from types import MappingProxyType
+from typing import Final
+
+import orjson
+from pydantic import TypeAdapter
+
+from config.settings import get_settings
+
+from ..models.assessment import (
+    QUESTION_CATEGORIES,
+    AssessmentQuestion,
+    AssessmentResponse,
+    AssessmentResult,
+)
+from ..utils.json_stream import JsonArrayItemStream
 from ..utils.openai_client import OpenAIClient
 
 logger = logging.getLogger(__name__)
 
+_QUESTION_LIST_ADAPTER = TypeAdapter(list[AssessmentQuestion])
+
+# Dedicated generator for answer-position shuffling, seedable in tests without
+# touching the process-wide random state
+_rng = random.Random()
+
+# Position of each category in QUESTION_CATEGORIES, for list-based score tallies
+_CATEGORY_INDEX: Final[dict[str, int]] = {
+    category: index for index, category in enumerate(QUESTION_CATEGORIES)
+}
+
+# Generated questions always carry exactly this many options (enforced by the schema)
+OPTIONS_PER_QUESTION = 4
+
+QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "minimum": 1, "maximum": 20},
+                    "difficulty_level": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": 10,
+                    },
+                    "category": {
+                        "type": "string",
+                        "enum": list(QUESTION_CATEGORIES),
+                    },
+                    "question": {"type": "string", "maxLength": 800},
+                    "options": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": OPTIONS_PER_QUESTION,
+                        "maxItems": OPTIONS_PER_QUESTION,
+                    },
+                    "correct_answer_index": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "maximum": OPTIONS_PER_QUESTION - 1,
+                    },
+                    "weight": {"type": "number", "minimum": 1.0, "maximum": 2.0},
+                },
+                "required": [
+                    "id",
+                    "difficulty_level",
+                    "category",
+                    "question",
+                    "options",
+                    "correct_answer_index",
+                    "weight",
+                ],
+                "additionalProperties": False,
+            },
+            "minItems": 20,
+            "maxItems": 20,
+        }
+    },
+    "required": ["questions"],
+    "additionalProperties": False,
+}
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "expertise_level": {"type": "integer", "minimum": 1, "maximum": 10},
+        "explanation": {"type": "string", "minLength": 100, "maxLength": 1000},
+        "confidence_score": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+    },
+    "required": [
+        "expertise_level",
+        "explanation",
+        "confidence_score",
+    ],
+    "additionalProperties": False,
+}
+
+# Report complexity per expertise level 1-10 (index = level - 1), with the page
+# budget per tier: foundational 250-300, educational 150-200, intermediate 80-100,
+# advanced 50-60, executive 10-20
+_COMPLEXITY_BY_LEVEL: Final[tuple[str, ...]] = (
+    "foundational",
+    "foundational",
+    "educational",
+    "educational",
+    "intermediate",
+    "intermediate",
+    "advanced",
+    "advanced",
+    "executive",
+    "executive",
+)
+
+# Static report complexity descriptions, shared read-only across requests
+_COMPLEXITY_INFO: Final[Mapping[str, Mapping[str, str]]] = MappingProxyType(
+    {
+        "foundational": MappingProxyType(
+            {
+                "page_range": "250-300",
+                "description": "Comprehensive educational reports with maximum detail and fundamentals",
+                "target_audience": "Complete novices needing extensive education",
+            }
+        ),
+        "educational": MappingProxyType(
+            {
+                "page_range": "150-200",
+                "description": "Detailed explanatory reports with examples and context",
+                "target_audience": "Basic understanding users requiring detailed explanations",
+            }
+        ),
+        "intermediate": MappingProxyType(
+            {
+                "page_range": "80-100",
+                "description": "Balanced analysis with moderate complexity and context",
+                "target_audience": "Intermediate knowledge users comfortable with some advanced concepts",
+            }
+        ),
+        "advanced": MappingProxyType(
+            {
+                "page_range": "50-60",
+                "description": "Sophisticated analysis reports with minimal educational content",
+                "target_audience": "Advanced users appreciating sophisticated analysis",
+            }
+        ),
+        "executive": MappingProxyType(
+            {
+                "page_range": "10-20",
+                "description": "Expert-level executive summaries with advanced insights",
+                "target_audience": "Expert-level users preferring concise summaries",
+            }
+        ),
+    }
+)
+_EMPTY_COMPLEXITY_INFO: Final[Mapping[str, str]] = MappingProxyType({})
+
+# Serialized once so every request embeds byte-identical schema text
+QUESTIONS_SCHEMA_JSON = orjson.dumps(QUESTIONS_SCHEMA).decode()
+EVALUATION_SCHEMA_JSON = orjson.dumps(EVALUATION_SCHEMA).decode()
+
+QUESTION_GENERATION_PROMPT = """You are an expert investment assessment specialist tasked with generating contextual, progressive assessment questions for individual stock tickers.
+
+CORE RESPONSIBILITIES:
+1. Generate exactly 20 questions tailored to the specific ticker and its industry context
+2. Create progressive difficulty from Level 1 (complete novice) to Level 10 (top-tier analyst)
+3. Ensure questions are contextually relevant to the specific company/ticker
+4. Distribute questions evenly across 4 categories (5 questions each)
+
+DIFFICULTY PROGRESSION GUIDELINES:
+- Level 1-2: Basic market concepts, awareness of company existence
+- Level 3-4: Understanding of business model, basic financial metrics
+- Level 5-6: Industry knowledge, competitive positioning
+- Level 7-8: Advanced valuation concepts, detailed company analysis
+- Level 9-10: Expert-level insights, sophisticated analytical frameworks
+
+CATEGORIES (5 questions each):
+1. general_investing: Broad market knowledge, investment principles
+2. ticker_specific: Company-specific knowledge, history, products
+3. sector_expertise: Industry dynamics, competitive landscape
+4. analytical_sophistication: Valuation methods, financial analysis techniques
+
+QUESTION QUALITY STANDARDS:
+- Each question must have exactly 4 plausible multiple choice options
+- Options should include one clearly correct answer and three reasonable distractors
+- Questions should be clear, unambiguous, and professionally worded
+- Avoid trick questions; focus on knowledge assessment
+- Weight assignment: Levels 1-3 = 1.0, Levels 4-7 = 1.5, Levels 8-10 = 2.0
+CRITICAL: RANDOMIZE CORRECT ANSWER POSITIONS
+- DO NOT put all correct answers in position 0 (first choice)
+- Randomly distribute correct answers across positions 0, 1, 2, and 3
+- Make sure incorrect options are plausible but clearly wrong to experts
+- Vary the correct_answer_index to prevent pattern recognition
+
+Generate questions that effectively differentiate between novice and expert knowledge levels while remaining contextually relevant to the specific ticker."""
+
+QUESTION_GENERATION_REQUIREMENTS = """Generate exactly 20 contextual assessment questions for the ticker symbol given at the end of this message.
+
+CRITICAL REQUIREMENTS:
+1. Generate exactly 20 questions (questions 1-20)
+2. Use exactly 5 questions per category: general_investing, ticker_specific, sector_expertise, analytical_sophistication
+3. Progressive difficulty: 2 questions each for levels 1-10 (Level 1 = complete novice, Level 10 = top-tier analyst)
+4. Questions must be contextually relevant to the ticker and its industry/sector
+5. Each question must have exactly 4 multiple choice options
+6. Assign appropriate weights: Level 1-3 = 1.0, Level 4-7 = 1.5, Level 8-10 = 2.0"""
+
+# Static guidance embedded in every evaluation context; mirrors the buckets in
+# AssessmentAgent._map_percentage_to_expertise_level
+SCORING_SCALE_TEXT = """ADJUSTED SCORING SCALE (ACCOUNTING FOR 25% RANDOM GUESSING):
+- Level 1: 0-27% (Random guessing or below)
+- Level 2: 28-35% (Slightly above random)
+- Level 3: 36-43% (Basic knowledge)
+- Level 4: 44-51% (Developing understanding)
+- Level 5: 52-59% (Intermediate knowledge)
+- Level 6: 60-67% (Good understanding)
+- Level 7: 68-75% (Advanced knowledge)
+- Level 8: 76-83% (Sophisticated analysis)
+- Level 9: 84-91% (Expert level)
+- Level 10: 92-100% (Top-tier analyst)"""
+
+# Reason: keying the question bank on a digest of everything sent to the model
+# means any prompt or schema edit invalidates cached sets without a manual bump
+QUESTION_PROMPT_HASH = hashlib.blake2b(
+    (QUESTION_GENERATION_PROMPT + QUESTION_GENERATION_REQUIREMENTS + QUESTIONS_SCHEMA_JSON).encode(),
+    digest_size=8,
+).hexdigest()
+
+EXPERTISE_EVALUATION_PROMPT = """You are an expert investment assessment evaluator specializing in holistic analysis of investor expertise based on contextual assessment performance.
+
+EVALUATION MISSION:
+Analyze assessment performance to determine expertise level (1-10) and appropriate report complexity, providing clear explanations for your assessment.
+
+EXPERTISE LEVEL SCALE (ADJUSTED FOR RANDOM GUESSING):
+- Level 1: 0-27% - Random guessing or below (needs maximum educational content)
+- Level 2: 28-35% - Slightly above random (basic awareness, comprehensive education needed)
+- Level 3: 36-43% - Basic knowledge (fundamental understanding, detailed explanations needed)
+- Level 4: 44-51% - Developing understanding (good basics, requires explanatory content)
+- Level 5: 52-59% - Intermediate knowledge (solid foundation, moderate complexity acceptable)
+- Level 6: 60-67% - Good understanding (comfortable with complexity, balanced analysis)
+- Level 7: 68-75% - Advanced knowledge (sophisticated concepts, minimal education needed)
+- Level 8: 76-83% - Sophisticated analysis (expert-level concepts, advanced reports)
+- Level 9: 84-91% - Expert level (top-tier knowledge, executive summaries preferred)
+- Level 10: 92-100% - Top-tier analyst (comprehensive expertise, concise expert content)
+
+REPORT COMPLEXITY MAPPING:
+- Levels 1-2: "foundational" (250-300 page comprehensive educational reports)
+- Levels 3-4: "educational" (150-200 page detailed explanatory reports)
+- Levels 5-6: "intermediate" (80-100 page balanced analysis with context)
+- Levels 7-8: "advanced" (50-60 page sophisticated analysis reports)
+- Levels 9-10: "executive" (10-20 page expert-level executive summaries)
+
+SCORING METHODOLOGY (CRITICAL):
+- Random guessing baseline: 25% expected accuracy on multiple choice
+- Effective scoring range: 20-100% (80% range) mapped across 10 expertise levels
+- Each level represents 8% increment: Level N = 20% + ((N-1) × 8%)
+- Score calculation: (Correct answers × weights) / Total possible points × 100%
+
+HOLISTIC EVALUATION FACTORS:
+1. Adjusted score percentage accounting for random guessing baseline
+2. Performance on higher difficulty questions (levels 7-10) weighted more heavily
+3. Consistency across different knowledge areas (pattern analysis)
+4. Time taken per question (confidence and knowledge depth indicators)
+5. Category-specific performance distribution
+
+EVALUATION PRINCIPLES:
+- Account for 25% random guessing baseline in all assessments
+- Use compressed 20-100% scale for true knowledge differentiation
+- Weight advanced questions (levels 8-10) significantly higher
+- Look for knowledge patterns that distinguish real understanding from guessing
+- Be precise with level assignments using the 8% increment scale
+- Provide clear explanations referencing the adjusted scoring methodology
+
+Your evaluation should be thorough, fair, and provide valuable insights into the user's investment knowledge level."""
+
 
 class AssessmentAgent:
     """
@@ -16,22 +292,22 @@ class AssessmentAgent:
     and adapts questions specifically to the chosen ticker symbol.
     """
 
-    def __init__(self):
-        """Initialize the Assessment Agent with OpenAI client."""
-        self.client = OpenAIClient()
-        self.categories = [
-            "general_investing",
-            "ticker_specific",
-            "sector_expertise",
-            "analytical_sophistication",
-        ]
+    CATEGORIES: Final[tuple[str, ...]] = QUESTION_CATEGORIES
 
-    def generate_contextual_assessment_questions(self, ticker: str) -> list[AssessmentQuestion]:
+    @cached_property
+    def client(self) -> OpenAIClient:
+        """OpenAI client, created on first use so scoring-only callers never build one."""
+        return OpenAIClient()
+
+    def generate_contextual_assessment_questions(
+        self, ticker: str, use_cache: bool = True
+    ) -> list[AssessmentQuestion]:
         """
         Generate 20 contextual questions tailored to specific ticker.
 
         Args:
             ticker: Stock ticker symbol (e.g., "AAPL", "ASML")
+            use_cache: Serve and store question sets in the question bank cache
 
         Returns:
             List of 20 AssessmentQuestion objects with progressive difficulty
@@ -40,142 +316,74 @@ class AssessmentAgent:
             Exception: If question generation fails
         """
         try:
-            logger.info(f"Generating contextual assessment questions for ticker: {ticker}")
+            if use_cache:
+                cached_questions = self._serve_cached_questions(ticker)
+                if cached_questions is not None:
+                    return cached_questions
 
-            # Define the JSON schema for structured response
-            questions_schema = {
-                "type": "object",
-                "properties": {
-                    "questions": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "id": {"type": "integer", "minimum": 1, "maximum": 20},
-                                "difficulty_level": {
-                                    "type": "integer",
-                                    "minimum": 1,
-                                    "maximum": 10,
-                                },
-                                "category": {
-                                    "type": "string",
-                                    "enum": [
-                                        "general_investing",
-                                        "ticker_specific",
-                                        "sector_expertise",
-                                        "analytical_sophistication",
-                                    ],
-                                },
-                                "question": {"type": "string", "maxLength": 800},
-                                "options": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "minItems": 4,
-                                    "maxItems": 4,
-                                },
-                                "correct_answer_index": {
-                                    "type": "integer",
-                                    "minimum": 0,
-                                    "maximum": 3,
-                                },
-                                "weight": {"type": "number", "minimum": 1.0, "maximum": 2.0},
-                            },
-                            "required": [
-                                "id",
-                                "difficulty_level",
-                                "category",
-                                "question",
-                                "options",
-                                "correct_answer_index",
-                                "weight",
-                            ],
-                            "additionalProperties": False,
-                        },
-                        "minItems": 20,
-                        "maxItems": 20,
-                    }
-                },
-                "required": ["questions"],
-                "additionalProperties": False,
-            }
-
-            # Create the assessment prompt
-            messages = [
-                {"role": "system", "content": self._get_question_generation_prompt()},
-                {
-                    "role": "user",
-                    "content": f"""Generate exactly 20 contextual assessment questions for ticker symbol: {ticker}
-
-CRITICAL REQUIREMENTS:
-1. Generate exactly 20 questions (questions 1-20)
-2. Use exactly 5 questions per category: general_investing, ticker_specific, sector_expertise, analytical_sophistication
-3. Progressive difficulty: 2 questions each for levels 1-10 (Level 1 = complete novice, Level 10 = top-tier analyst)
-4. Questions must be contextually relevant to {ticker} and its industry/sector
-5. Each question must have exactly 4 multiple choice options
-6. Assign appropriate weights: Level 1-3 = 1.0, Level 4-7 = 1.5, Level 8-10 = 2.0
-
-Please generate the questions now.""",
-                },
-            ]
+            logger.info(f"Generating contextual assessment questions for ticker: {ticker}")
+            messages = self._build_question_messages(ticker)
 
             # Generate questions using GPT-5 (complex model)
             # Note: GPT-5 only supports default temperature (1.0)
-            logger.info(f"Sending question generation request to OpenAI for {ticker}")
-            logger.debug(f"Question generation messages: {messages}")
-
             response_data = self.client.create_structured_completion(
                 messages=messages,
-                response_schema=questions_schema,
+                response_schema=QUESTIONS_SCHEMA_JSON,
                 use_complex_model=True,  # Use GPT-5 for intelligent question generation
                 temperature=None,  # Use default temperature for GPT-5 compatibility
             )
 
-            logger.debug(f"Raw OpenAI response: {response_data}")
-
-            # Check if all correct answers are in position 0 (debugging)
-            if "questions" in response_data:
-                answer_positions = [
-                    q.get("correct_answer_index", 0) for q in response_data["questions"]
-                ]
-                logger.warning(f"Correct answer positions: {answer_positions}")
-                if all(pos == 0 for pos in answer_positions):
-                    logger.error(
-                        "AI GENERATED ALL CORRECT ANSWERS IN POSITION 0 - RANDOMIZATION FAILED!"
-                    )
+            questions = self._build_questions(response_data, ticker)
 
-            # Convert to AssessmentQuestion objects and force randomize correct answers
-            import random
-
-            questions = []
-            for q_data in response_data["questions"]:
-                # Force randomize correct answer position if AI didn't do it
-                original_correct_index = q_data["correct_answer_index"]
-                options = q_data["options"].copy()
-
-                # Generate a random position for the correct answer
-                new_correct_index = random.randint(0, 3)
-
-                # If position changed, swap the options
-                if new_correct_index != original_correct_index:
-                    # Swap correct answer to new position
-                    correct_option = options[original_correct_index]
-                    options[original_correct_index] = options[new_correct_index]
-                    options[new_correct_index] = correct_option
-                    logger.info(
-                        f"Q{q_data['id']}: Moved correct answer from position {original_correct_index} to {new_correct_index}"
-                    )
+            if use_cache:
+                self._store_cached_questions(ticker, questions)
 
-                question = AssessmentQuestion(
-                    id=q_data["id"],
-                    difficulty_level=q_data["difficulty_level"],
-                    category=q_data["category"],
-                    question=q_data["question"],
-                    options=options,  # Use potentially shuffled options
-                    correct_answer_index=new_correct_index,  # Use new position
-                    ticker_context=ticker,
-                    weight=q_data["weight"],
-                )
-                questions.append(question)
+            logger.info(f"Successfully generated {len(questions)} questions for {ticker}")
+            return questions
+
+        except Exception as e:
+            logger.error(f"Failed to generate assessment questions for {ticker}: {str(e)}")
+            raise
+
+    async def generate_contextual_assessment_questions_async(
+        self, ticker: str, use_cache: bool = True
+    ) -> list[AssessmentQuestion]:
+        """
+        Generate contextual questions without blocking the event loop.
+
+        Async counterpart of generate_contextual_assessment_questions for use from
+        FastAPI routes, backed by the AsyncOpenAI client.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "ASML")
+            use_cache: Serve and store question sets in the question bank cache
+
+        Returns:
+            List of 20 AssessmentQuestion objects with progressive difficulty
+
+        Raises:
+            Exception: If question generation fails
+        """
+        try:
+            if use_cache:
+                cached_questions = self._serve_cached_questions(ticker)
+                if cached_questions is not None:
+                    return cached_questions
+
+            logger.info(f"Generating contextual assessment questions for ticker: {ticker}")
+            messages = self._build_question_messages(ticker)
+
+            response_data = await self.client.acreate_structured_completion(
+                messages=messages,
+                response_schema=QUESTIONS_SCHEMA_JSON,
+                use_complex_model=True,
+                temperature=None,
+            )
+
+            questions = self._build_questions(response_data, ticker)
+
+            if use_cache:
+                self._store_cached_questions(ticker, questions)
 
             logger.info(f"Successfully generated {len(questions)} questions for {ticker}")
             return questions
@@ -184,6 +392,269 @@ Please generate the questions now.""",
             logger.error(f"Failed to generate assessment questions for {ticker}: {str(e)}")
             raise
 
+    async def generate_contextual_assessment_questions_batch(
+        self, tickers: list[str], use_cache: bool = True, max_concurrency: int = 4
+    ) -> dict[str, list[AssessmentQuestion]]:
+        """
+        Generate question sets for several tickers concurrently.
+
+        Duplicate tickers are generated once. Cached tickers are served from the
+        question bank, and the remaining requests run concurrently up to
+        max_concurrency, sharing the byte-identical prompt prefix.
+
+        Args:
+            tickers: Stock ticker symbols to generate questions for
+            use_cache: Serve and store question sets in the question bank cache
+            max_concurrency: Maximum number of in-flight OpenAI requests
+
+        Returns:
+            Mapping of ticker to its 20 AssessmentQuestion objects
+
+        Raises:
+            Exception: If question generation fails for any ticker
+        """
+        unique_tickers = list(dict.fromkeys(tickers))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(ticker: str) -> list[AssessmentQuestion]:
+            async with semaphore:
+                return await self.generate_contextual_assessment_questions_async(
+                    ticker, use_cache=use_cache
+                )
+
+        results = await asyncio.gather(*(generate(ticker) for ticker in unique_tickers))
+        return dict(zip(unique_tickers, results, strict=True))
+
+    async def generate_contextual_assessment_questions_stream(
+        self, ticker: str, use_cache: bool = True
+    ) -> AsyncIterator[AssessmentQuestion]:
+        """
+        Yield contextual questions one by one as the model produces them.
+
+        Each question is randomized and validated as soon as its JSON object is
+        complete, so callers can render the first questions while the rest are
+        still being generated. A complete streamed set is stored in the question
+        bank like the non-streaming variants.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "ASML")
+            use_cache: Serve and store question sets in the question bank cache
+
+        Yields:
+            AssessmentQuestion objects in generation order
+
+        Raises:
+            Exception: If question generation fails
+        """
+        if use_cache:
+            cached_questions = self._serve_cached_questions(ticker)
+            if cached_questions is not None:
+                for question in cached_questions:
+                    yield question
+                return
+
+        logger.info(f"Streaming contextual assessment questions for ticker: {ticker}")
+        item_stream = JsonArrayItemStream("questions")
+        questions: list[AssessmentQuestion] = []
+
+        try:
+            async for chunk in self.client.astream_structured_completion(
+                messages=self._build_question_messages(ticker),
+                response_schema=QUESTIONS_SCHEMA_JSON,
+                use_complex_model=True,
+                temperature=None,
+            ):
+                for q_data in item_stream.feed(chunk):
+                    self._place_correct_answer(
+                        q_data, _rng.randrange(OPTIONS_PER_QUESTION), ticker
+                    )
+                    question = AssessmentQuestion.model_validate(q_data)
+                    questions.append(question)
+                    yield question
+
+        except Exception as e:
+            logger.error(f"Failed to stream assessment questions for {ticker}: {str(e)}")
+            raise
+
+        if use_cache and len(questions) == 20:
+            self._store_cached_questions(ticker, questions)
+
+        logger.info(f"Successfully streamed {len(questions)} questions for {ticker}")
+
+    def _build_question_messages(self, ticker: str) -> list[dict[str, str]]:
+        """Create the question generation prompt messages for a ticker."""
+        messages = [
+            {"role": "system", "content": QUESTION_GENERATION_PROMPT},
+            {
+                "role": "user",
+                # Reason: the static requirements lead and the ticker comes last, so every
+                # request shares the longest possible byte-identical prefix for caching
+                "content": (
+                    f"{QUESTION_GENERATION_REQUIREMENTS}\n\n"
+                    f"Ticker symbol: {ticker}\n\n"
+                    "Please generate the questions now."
+                ),
+            },
+        ]
+
+        logger.info(f"Sending question generation request to OpenAI for {ticker}")
+        logger.debug("Question generation messages: %r", messages)
+        return messages
+
+    def _build_questions(self, response_data: dict, ticker: str) -> list[AssessmentQuestion]:
+        """
+        Randomize answer positions and validate the raw OpenAI question payload.
+
+        Args:
+            response_data: Parsed structured completion with a "questions" array
+            ticker: Ticker the questions were generated for
+
+        Returns:
+            Validated AssessmentQuestion objects
+        """
+        logger.debug("Raw OpenAI response: %r", response_data)
+
+        # Force randomize correct answers in place; response_data is owned by this call.
+        # Missing keys raise here and surface as a generation failure.
+        raw_questions = response_data["questions"]
+        # Reason: one batched RNG call instead of one per question; swapping the
+        # correct option into a uniformly drawn slot keeps every position equally likely
+        new_positions = _rng.choices(range(OPTIONS_PER_QUESTION), k=len(raw_questions))
+        # Histogram of the model's own answer positions, gathered in the same pass
+        position_counts: Counter[int] = Counter()
+        moved = 0
+        for q_data, new_correct_index in zip(raw_questions, new_positions, strict=True):
+            original_correct_index = self._place_correct_answer(q_data, new_correct_index, ticker)
+            position_counts[original_correct_index] += 1
+            moved += original_correct_index != new_correct_index
+
+        logger.debug("Correct answer position counts: %s", position_counts)
+        if raw_questions and position_counts[0] == len(raw_questions):
+            logger.error("AI GENERATED ALL CORRECT ANSWERS IN POSITION 0 - RANDOMIZATION FAILED!")
+        logger.debug("Moved correct answer for %d/%d questions", moved, len(raw_questions))
+
+        # Validate the raw array directly in one pydantic-core call
+        return _QUESTION_LIST_ADAPTER.validate_python(raw_questions)
+
+    @staticmethod
+    def _place_correct_answer(q_data: dict, new_correct_index: int, ticker: str) -> int:
+        """
+        Swap a raw question's correct option into a new slot, in place.
+
+        Args:
+            q_data: Raw question payload from the model
+            new_correct_index: Slot the correct option should end up in
+            ticker: Ticker the question was generated for
+
+        Returns:
+            The correct answer's original position
+        """
+        options = q_data["options"]
+        original_correct_index = q_data["correct_answer_index"]
+        options[original_correct_index], options[new_correct_index] = (
+            options[new_correct_index],
+            options[original_correct_index],
+        )
+        q_data["correct_answer_index"] = new_correct_index
+        q_data["ticker_context"] = ticker
+        return original_correct_index
+
+    @cached_property
+    def _question_bank(self) -> dict[str, tuple[float, list[AssessmentQuestion]]]:
+        """In-memory question sets keyed like the cache files, with their creation time."""
+        return {}
+
+    def _question_cache_key(self, ticker: str) -> str:
+        """Build the question bank key from the ticker and the prompt digest."""
+        return f"{ticker.upper()}_{QUESTION_PROMPT_HASH}"
+
+    def _questions_cache_path(self, ticker: str) -> str:
+        """Get the on-disk cache file path for a ticker's question set."""
+        tmp_path = get_settings().tmp_path
+        return os.path.join(tmp_path, f"assessment_q_{self._question_cache_key(ticker)}.json")
+
+    def _serve_cached_questions(self, ticker: str) -> list[AssessmentQuestion] | None:
+        """
+        Serve a cached question set with freshly drawn answer positions.
+
+        The question bank is shared across users, so answer positions are
+        re-randomized on every hit rather than replayed from the cache.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Questions ready to serve, or None on a cache miss
+        """
+        cached_questions = self._load_cached_questions(ticker)
+        if cached_questions is None:
+            return None
+
+        logger.info(f"Serving cached assessment questions for ticker: {ticker}")
+        return self._build_questions(
+            {"questions": [q.model_dump() for q in cached_questions]}, ticker
+        )
+
+    def _load_cached_questions(self, ticker: str) -> list[AssessmentQuestion] | None:
+        """
+        Load a previously generated question set from memory or the on-disk cache.
+
+        Entries older than the configured question cache TTL count as misses.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Cached questions, or None on a cache miss or unreadable cache file
+        """
+        key = self._question_cache_key(ticker)
+        ttl_seconds = get_settings().question_cache_ttl_seconds
+        now = time.time()
+
+        entry = self._question_bank.get(key)
+        if entry is not None and now - entry[0] < ttl_seconds:
+            return entry[1]
+
+        cache_path = self._questions_cache_path(ticker)
+        try:
+            created_at = os.path.getmtime(cache_path)
+        except OSError:
+            return None
+        if now - created_at >= ttl_seconds:
+            return None
+
+        try:
+            with open(cache_path, "rb") as f:
+                questions = _QUESTION_LIST_ADAPTER.validate_json(f.read())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable question cache {cache_path}: {str(e)}")
+            return None
+
+        self._question_bank[key] = (created_at, questions)
+        return questions
+
+    def _store_cached_questions(self, ticker: str, questions: list[AssessmentQuestion]) -> None:
+        """
+        Store a generated question set in memory and atomically on disk.
+
+        Args:
+            ticker: Stock ticker symbol
+            questions: Validated questions to cache
+        """
+        self._question_bank[self._question_cache_key(ticker)] = (time.time(), questions)
+
+        cache_path = self._questions_cache_path(ticker)
+        tmp_file = f"{cache_path}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                f.write(_QUESTION_LIST_ADAPTER.dump_json(questions))
+            os.replace(tmp_file, cache_path)
+        except Exception as e:
+            # Reason: caching is best-effort, a failed write must not fail generation
+            logger.warning(f"Failed to cache assessment questions for {ticker}: {str(e)}")
+
     def evaluate_user_expertise(
         self, questions: list[AssessmentQuestion], responses: list[AssessmentResponse], ticker: str
     ) -> AssessmentResult:
@@ -203,75 +674,136 @@ Please generate the questions now.""",
         """
         try:
             logger.info(f"Evaluating user expertise for ticker: {ticker}")
-
-            # Calculate basic scores by category and overall percentage
-            score_breakdown = self._calculate_category_scores(questions, responses)
-            percentage_score = self._calculate_score_percentage(questions, responses)
-            suggested_level = self._map_percentage_to_expertise_level(percentage_score)
-
-            # Create evaluation context for AI assessment
-            evaluation_context = self._create_evaluation_context(
-                questions, responses, score_breakdown, ticker, percentage_score, suggested_level
+            messages, score_breakdown = self._build_evaluation_messages(
+                questions, responses, ticker
             )
 
-            # Define schema for AI evaluation response
-            evaluation_schema = {
-                "type": "object",
-                "properties": {
-                    "expertise_level": {"type": "integer", "minimum": 1, "maximum": 10},
-                    "explanation": {"type": "string", "minLength": 100, "maxLength": 1000},
-                    "confidence_score": {"type": "number", "minimum": 0.0, "maximum": 1.0},
-                },
-                "required": [
-                    "expertise_level",
-                    "explanation",
-                    "confidence_score",
-                ],
-                "additionalProperties": False,
-            }
-
-            messages = [
-                {"role": "system", "content": self._get_expertise_evaluation_prompt()},
-                {"role": "user", "content": evaluation_context},
-            ]
-
             # Use GPT-5 for holistic expertise evaluation
             # Note: GPT-5 only supports default temperature (1.0)
             evaluation_data = self.client.create_structured_completion(
                 messages=messages,
-                response_schema=evaluation_schema,
+                response_schema=EVALUATION_SCHEMA_JSON,
                 use_complex_model=True,  # Use GPT-5 for intelligent evaluation
                 temperature=None,  # Use default temperature for GPT-5 compatibility
             )
 
-            # Map expertise level to appropriate report complexity
-            complexity = self._determine_report_complexity(evaluation_data["expertise_level"])
+            return self._build_assessment_result(evaluation_data, ticker, score_breakdown)
+
+        except Exception as e:
+            logger.error(f"Failed to evaluate expertise for {ticker}: {str(e)}")
+            raise
 
-            result = AssessmentResult(
-                session_id="",  # Will be set by calling code
-                expertise_level=evaluation_data["expertise_level"],
-                report_complexity=complexity,
-                explanation=evaluation_data["explanation"],
-                ticker_context=ticker,
-                score_breakdown=score_breakdown,
+    async def evaluate_user_expertise_async(
+        self, questions: list[AssessmentQuestion], responses: list[AssessmentResponse], ticker: str
+    ) -> AssessmentResult:
+        """
+        Evaluate user expertise without blocking the event loop.
+
+        Async counterpart of evaluate_user_expertise for use from FastAPI routes.
+
+        Args:
+            questions: List of assessment questions that were asked
+            responses: List of user responses to evaluate
+            ticker: Ticker symbol for context
+
+        Returns:
+            AssessmentResult with expertise level (1-10) and explanation
+
+        Raises:
+            Exception: If evaluation fails
+        """
+        try:
+            logger.info(f"Evaluating user expertise for ticker: {ticker}")
+            messages, score_breakdown = self._build_evaluation_messages(
+                questions, responses, ticker
             )
 
-            logger.info(f"Evaluated expertise level: {result.expertise_level}/10 for {ticker}")
-            return result
+            evaluation_data = await self.client.acreate_structured_completion(
+                messages=messages,
+                response_schema=EVALUATION_SCHEMA_JSON,
+                use_complex_model=True,
+                temperature=None,
+            )
+
+            return self._build_assessment_result(evaluation_data, ticker, score_breakdown)
 
         except Exception as e:
             logger.error(f"Failed to evaluate expertise for {ticker}: {str(e)}")
             raise
 
-    def _calculate_category_scores(
-        self, questions: list[AssessmentQuestion], responses: list[AssessmentResponse]
-    ) -> dict:
-        """Calculate scores by category for breakdown analysis."""
-        category_scores = dict.fromkeys(self.categories, 0.0)
+    def _build_evaluation_messages(
+        self, questions: list[AssessmentQuestion], responses: list[AssessmentResponse], ticker: str
+    ) -> tuple[list[dict[str, str]], dict[str, float]]:
+        """
+        Score the responses locally and build the evaluation prompt messages.
 
+        Args:
+            questions: List of assessment questions that were asked
+            responses: List of user responses to evaluate
+            ticker: Ticker symbol for context
+
+        Returns:
+            Tuple of (prompt messages, score breakdown by category)
+        """
+        # Index responses once and share the lookup across all scoring passes
         response_dict = {r.question_id: r for r in responses}
 
+        # Calculate basic scores by category and overall percentage in one pass
+        score_breakdown, percentage_score = self._score_responses(questions, response_dict)
+        suggested_level = self._map_percentage_to_expertise_level(percentage_score)
+
+        # Create evaluation context for AI assessment
+        evaluation_context = self._create_evaluation_context(
+            questions, response_dict, score_breakdown, ticker, percentage_score, suggested_level
+        )
+
+        messages = [
+            {"role": "system", "content": EXPERTISE_EVALUATION_PROMPT},
+            {"role": "user", "content": evaluation_context},
+        ]
+        return messages, score_breakdown
+
+    def _build_assessment_result(
+        self, evaluation_data: dict, ticker: str, score_breakdown: dict[str, float]
+    ) -> AssessmentResult:
+        """Turn the model's evaluation payload into an AssessmentResult."""
+        # Map expertise level to appropriate report complexity
+        complexity = self._determine_report_complexity(evaluation_data["expertise_level"])
+
+        result = AssessmentResult(
+            session_id="",  # Will be set by calling code
+            expertise_level=evaluation_data["expertise_level"],
+            report_complexity=complexity,
+            explanation=evaluation_data["explanation"],
+            ticker_context=ticker,
+            score_breakdown=score_breakdown,
+        )
+
+        logger.info(f"Evaluated expertise level: {result.expertise_level}/10 for {ticker}")
+        return result
+
+    def _score_responses(
+        self,
+        questions: list[AssessmentQuestion],
+        response_dict: dict[int, AssessmentResponse],
+    ) -> tuple[dict[str, float], float]:
+        """
+        Score all responses in a single pass over the questions.
+
+        Args:
+            questions: List of assessment questions
+            response_dict: User responses keyed by question id
+
+        Returns:
+            Tuple of (points earned per category, percentage score 0-100)
+        """
+        # Reason: integer-indexed list slots avoid hashing the category string per answer
+        category_scores = [0.0] * len(self.CATEGORIES)
+        earned_points = 0.0
+        total_possible_points = 0.0
+
         for question in questions:
+            total_possible_points += question.weight
             response = response_dict.get(question.id)
             if response:
                 # Award points based on correctness and weight
@@ -280,9 +812,24 @@ Please generate the questions now.""",
                 else:
                     points = response.partial_credit * question.weight
 
-                category_scores[question.category] += points
+                earned_points += points
+                category_scores[_CATEGORY_INDEX[question.category]] += points
 
-        return category_scores
+        percentage = (
+            (earned_points / total_possible_points) * 100.0 if total_possible_points > 0 else 0.0
+        )
+
+        # Report every category, including those without any answered questions
+        breakdown = dict(zip(self.CATEGORIES, category_scores, strict=True))
+        return breakdown, percentage
+
+    def _calculate_category_scores(
+        self,
+        questions: list[AssessmentQuestion],
+        response_dict: dict[int, AssessmentResponse],
+    ) -> dict:
+        """Calculate scores by category for breakdown analysis."""
+        return self._score_responses(questions, response_dict)[0]
 
     def _calculate_max_possible_score(self, questions: list[AssessmentQuestion]) -> float:
         """Calculate the maximum possible score from all questions."""
@@ -291,57 +838,45 @@ Please generate the questions now.""",
     def _create_evaluation_context(
         self,
         questions: list[AssessmentQuestion],
-        responses: list[AssessmentResponse],
+        response_dict: dict[int, AssessmentResponse],
         score_breakdown: dict,
         ticker: str,
         percentage_score: float,
         suggested_level: int,
     ) -> str:
         """Create detailed context for AI evaluation."""
-        response_dict = {r.question_id: r for r in responses}
+        # Reason: the per-question data goes to the model as JSON, which orjson builds
+        # far faster than string formatting and the model parses more reliably than prose
+        payload = orjson.dumps(
+            {
+                "score_breakdown": {
+                    category: round(score, 2) for category, score in score_breakdown.items()
+                },
+                "responses": [
+                    {
+                        "question_id": question.id,
+                        "difficulty_level": question.difficulty_level,
+                        "category": question.category,
+                        "correct": response.selected_option == response.correct_option,
+                        "weight": question.weight,
+                        "time_taken_seconds": round(response.time_taken, 1),
+                    }
+                    for question in questions
+                    if (response := response_dict.get(question.id))
+                ],
+            },
+        ).decode()
 
-        context_parts = [
-            f"ASSESSMENT EVALUATION FOR TICKER: {ticker}",
-            f"Total Questions: {len(questions)}",
-            f"Total Responses: {len(responses)}",
-            f"Overall Score: {percentage_score:.1f}%",
-            f"Baseline-Adjusted Suggested Level: {suggested_level}/10",
-            "",
-            "ADJUSTED SCORING SCALE (ACCOUNTING FOR 25% RANDOM GUESSING):",
-            "- Level 1: 0-27% (Random guessing or below)",
-            "- Level 2: 28-35% (Slightly above random)",
-            "- Level 3: 36-43% (Basic knowledge)",
-            "- Level 4: 44-51% (Developing understanding)",
-            "- Level 5: 52-59% (Intermediate knowledge)",
-            "- Level 6: 60-67% (Good understanding)",
-            "- Level 7: 68-75% (Advanced knowledge)",
-            "- Level 8: 76-83% (Sophisticated analysis)",
-            "- Level 9: 84-91% (Expert level)",
-            "- Level 10: 92-100% (Top-tier analyst)",
-            "",
-            "SCORE BREAKDOWN BY CATEGORY:",
-        ]
+        return f"""ASSESSMENT EVALUATION FOR TICKER: {ticker}
+Total Questions: {len(questions)}
+Total Responses: {len(response_dict)}
+Overall Score: {percentage_score:.1f}%
+Baseline-Adjusted Suggested Level: {suggested_level}/10
 
-        for category, score in score_breakdown.items():
-            context_parts.append(f"- {category}: {score:.2f} points")
+{SCORING_SCALE_TEXT}
 
-        context_parts.extend(
-            [
-                "",
-                "DETAILED RESPONSE ANALYSIS:",
-            ]
-        )
-
-        for question in questions:
-            response = response_dict.get(question.id)
-            if response:
-                correct = "✓" if response.selected_option == response.correct_option else "✗"
-                context_parts.append(
-                    f"Q{question.id} (Level {question.difficulty_level}, {question.category}): {correct} "
-                    f"Weight: {question.weight}, Time: {response.time_taken:.1f}s"
-                )
-
-        return "\n".join(context_parts)
+SCORE BREAKDOWN AND RESPONSE DETAILS (JSON):
+{payload}"""
 
     def _determine_report_complexity(self, expertise_level: int) -> str:
         """
@@ -353,18 +888,10 @@ Please generate the questions now.""",
         Returns:
             Report complexity type for appropriate report length
         """
-        if expertise_level <= 2:
-            return "foundational"  # 250-300 pages
-        elif expertise_level <= 4:
-            return "educational"  # 150-200 pages
-        elif expertise_level <= 6:
-            return "intermediate"  # 80-100 pages
-        elif expertise_level <= 8:
-            return "advanced"  # 50-60 pages
-        else:  # 9-10
-            return "executive"  # 10-20 pages
+        # Clamp so out-of-range levels keep mapping to the nearest tier
+        return _COMPLEXITY_BY_LEVEL[min(max(expertise_level, 1), 10) - 1]
 
-    def get_report_complexity_info(self, complexity: str) -> dict:
+    def get_report_complexity_info(self, complexity: str) -> Mapping[str, str]:
         """
         Get detailed information about report complexity levels.
 
@@ -372,64 +899,26 @@ Please generate the questions now.""",
             complexity: Report complexity type
 
         Returns:
-            Dictionary with page count and description
+            Read-only mapping with page count and description (empty if unknown)
         """
-        complexity_mapping = {
-            "foundational": {
-                "page_range": "250-300",
-                "description": "Comprehensive educational reports with maximum detail and fundamentals",
-                "target_audience": "Complete novices needing extensive education",
-            },
-            "educational": {
-                "page_range": "150-200",
-                "description": "Detailed explanatory reports with examples and context",
-                "target_audience": "Basic understanding users requiring detailed explanations",
-            },
-            "intermediate": {
-                "page_range": "80-100",
-                "description": "Balanced analysis with moderate complexity and context",
-                "target_audience": "Intermediate knowledge users comfortable with some advanced concepts",
-            },
-            "advanced": {
-                "page_range": "50-60",
-                "description": "Sophisticated analysis reports with minimal educational content",
-                "target_audience": "Advanced users appreciating sophisticated analysis",
-            },
-            "executive": {
-                "page_range": "10-20",
-                "description": "Expert-level executive summaries with advanced insights",
-                "target_audience": "Expert-level users preferring concise summaries",
-            },
-        }
-        return complexity_mapping.get(complexity, {})
+        return _COMPLEXITY_INFO.get(complexity, _EMPTY_COMPLEXITY_INFO)
 
     def _calculate_score_percentage(
-        self, questions: list[AssessmentQuestion], responses: list[AssessmentResponse]
+        self,
+        questions: list[AssessmentQuestion],
+        response_dict: dict[int, AssessmentResponse],
     ) -> float:
         """
         Calculate the percentage score from weighted responses.
 
         Args:
             questions: List of assessment questions
-            responses: List of user responses
+            response_dict: User responses keyed by question id
 
         Returns:
             Percentage score (0-100)
         """
-        total_possible_points = sum(q.weight for q in questions)
-        earned_points = 0.0
-
-        response_dict = {r.question_id: r for r in responses}
-
-        for question in questions:
-            response = response_dict.get(question.id)
-            if response:
-                if response.selected_option == response.correct_option:
-                    earned_points += question.weight
-                else:
-                    earned_points += response.partial_credit * question.weight
-
-        return (earned_points / total_possible_points) * 100.0 if total_possible_points > 0 else 0.0
+        return self._score_responses(questions, response_dict)[1]
 
     def _map_percentage_to_expertise_level(self, percentage: float) -> int:
         """
@@ -444,109 +933,14 @@ Please generate the questions now.""",
         Returns:
             Expertise level (1-10)
         """
-        if percentage < 28:  # 0-27%
-            return 1
-        elif percentage < 36:  # 28-35%
-            return 2
-        elif percentage < 44:  # 36-43%
-            return 3
-        elif percentage < 52:  # 44-51%
-            return 4
-        elif percentage < 60:  # 52-59%
-            return 5
-        elif percentage < 68:  # 60-67%
-            return 6
-        elif percentage < 76:  # 68-75%
-            return 7
-        elif percentage < 84:  # 76-83%
-            return 8
-        elif percentage < 92:  # 84-91%
-            return 9
-        else:  # 92-100%
-            return 10
+        # Reason: uniform 8% buckets from 20% reduce the ladder to one floor division;
+        # below 28% clamps to level 1 and 92%+ to level 10
+        return max(1, min(10, int((percentage - 20) // 8) + 1))
 
     def _get_question_generation_prompt(self) -> str:
         """Get the system prompt for question generation."""
-        return """You are an expert investment assessment specialist tasked with generating contextual, progressive assessment questions for individual stock tickers.
-
-CORE RESPONSIBILITIES:
-1. Generate exactly 20 questions tailored to the specific ticker and its industry context
-2. Create progressive difficulty from Level 1 (complete novice) to Level 10 (top-tier analyst)
-3. Ensure questions are contextually relevant to the specific company/ticker
-4. Distribute questions evenly across 4 categories (5 questions each)
-
-DIFFICULTY PROGRESSION GUIDELINES:
-- Level 1-2: Basic market concepts, awareness of company existence
-- Level 3-4: Understanding of business model, basic financial metrics
-- Level 5-6: Industry knowledge, competitive positioning
-- Level 7-8: Advanced valuation concepts, detailed company analysis
-- Level 9-10: Expert-level insights, sophisticated analytical frameworks
-
-CATEGORIES (5 questions each):
-1. general_investing: Broad market knowledge, investment principles
-2. ticker_specific: Company-specific knowledge, history, products
-3. sector_expertise: Industry dynamics, competitive landscape
-4. analytical_sophistication: Valuation methods, financial analysis techniques
-
-QUESTION QUALITY STANDARDS:
-- Each question must have exactly 4 plausible multiple choice options
-- Options should include one clearly correct answer and three reasonable distractors
-- Questions should be clear, unambiguous, and professionally worded
-- Avoid trick questions; focus on knowledge assessment
-- Weight assignment: Levels 1-3 = 1.0, Levels 4-7 = 1.5, Levels 8-10 = 2.0
-CRITICAL: RANDOMIZE CORRECT ANSWER POSITIONS
-- DO NOT put all correct answers in position 0 (first choice)
-- Randomly distribute correct answers across positions 0, 1, 2, and 3
-- Make sure incorrect options are plausible but clearly wrong to experts
-- Vary the correct_answer_index to prevent pattern recognition
-
-Generate questions that effectively differentiate between novice and expert knowledge levels while remaining contextually relevant to the specific ticker."""
+        return QUESTION_GENERATION_PROMPT
 
     def _get_expertise_evaluation_prompt(self) -> str:
         """Get the system prompt for holistic expertise evaluation."""
-        return """You are an expert investment assessment evaluator specializing in holistic analysis of investor expertise based on contextual assessment performance.
-
-EVALUATION MISSION:
-Analyze assessment performance to determine expertise level (1-10) and appropriate report complexity, providing clear explanations for your assessment.
-
-EXPERTISE LEVEL SCALE (ADJUSTED FOR RANDOM GUESSING):
-- Level 1: 0-27% - Random guessing or below (needs maximum educational content)
-- Level 2: 28-35% - Slightly above random (basic awareness, comprehensive education needed)
-- Level 3: 36-43% - Basic knowledge (fundamental understanding, detailed explanations needed)
-- Level 4: 44-51% - Developing understanding (good basics, requires explanatory content)
-- Level 5: 52-59% - Intermediate knowledge (solid foundation, moderate complexity acceptable)
-- Level 6: 60-67% - Good understanding (comfortable with complexity, balanced analysis)
-- Level 7: 68-75% - Advanced knowledge (sophisticated concepts, minimal education needed)
-- Level 8: 76-83% - Sophisticated analysis (expert-level concepts, advanced reports)
-- Level 9: 84-91% - Expert level (top-tier knowledge, executive summaries preferred)
-- Level 10: 92-100% - Top-tier analyst (comprehensive expertise, concise expert content)
-
-REPORT COMPLEXITY MAPPING:
-- Levels 1-2: "foundational" (250-300 page comprehensive educational reports)
-- Levels 3-4: "educational" (150-200 page detailed explanatory reports)
-- Levels 5-6: "intermediate" (80-100 page balanced analysis with context)
-- Levels 7-8: "advanced" (50-60 page sophisticated analysis reports)
-- Levels 9-10: "executive" (10-20 page expert-level executive summaries)
-
-SCORING METHODOLOGY (CRITICAL):
-- Random guessing baseline: 25% expected accuracy on multiple choice
-- Effective scoring range: 20-100% (80% range) mapped across 10 expertise levels
-- Each level represents 8% increment: Level N = 20% + ((N-1) × 8%)
-- Score calculation: (Correct answers × weights) / Total possible points × 100%
-
-HOLISTIC EVALUATION FACTORS:
-1. Adjusted score percentage accounting for random guessing baseline
-2. Performance on higher difficulty questions (levels 7-10) weighted more heavily
-3. Consistency across different knowledge areas (pattern analysis)
-4. Time taken per question (confidence and knowledge depth indicators)
-5. Category-specific performance distribution
-
-EVALUATION PRINCIPLES:
-- Account for 25% random guessing baseline in all assessments
-- Use compressed 20-100% scale for true knowledge differentiation
-- Weight advanced questions (levels 8-10) significantly higher
-- Look for knowledge patterns that distinguish real understanding from guessing
-- Be precise with level assignments using the 8% increment scale
-- Provide clear explanations referencing the adjusted scoring methodology
-
-Your evaluation should be thorough, fair, and provide valuable insights into the user's investment knowledge level."""
+        return EXPERTISE_EVALUATION_PROMPT
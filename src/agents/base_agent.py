@@ -1,14 +1,52 @@
 """Base agent implementation with research database access."""
 
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Any
 
-from ..models.collaboration import AgentResult
+from ..models.collaboration import AgentResult, HandoffData
 from ..services.research_database import get_research_database
 
 logger = logging.getLogger(__name__)
 
+# Emit routine per-file INFO logs only when STOCKIQ_VERBOSE=1
+_VERBOSE = os.getenv("STOCKIQ_VERBOSE", "0") == "1"
+
+# Map agent names to research database directory types
+_AGENT_TYPE_MAP = {
+    "valuation_agent": "valuation",
+    "strategic_agent": "strategic",
+    "historian_agent": "historical",
+    "synthesis_agent": "synthesis",
+}
+
+# Research context cache size for read_research_context
+CONTEXT_CACHE_MAX_ENTRIES = 64
+
+# Agent types whose summaries are passed on as context, with their prompt labels
+_CONTEXT_LABELS = (("valuation", "VALUATION"), ("strategic", "STRATEGIC"))
+
+# Keys every research context must carry
+_REQUIRED_CONTEXT_KEYS = frozenset(("session_id", "ticker", "requesting_agent"))
+
+# Research depth indexed directly by expertise level (1-10); index 0 is unused
+_DEPTH_BY_LEVEL = (
+    "foundational",  # 0
+    "foundational",  # 1-2: maximum educational content
+    "foundational",
+    "educational",  # 3-4: detailed explanations
+    "educational",
+    "intermediate",  # 5-6: balanced analysis
+    "intermediate",
+    "advanced",  # 7-8: sophisticated analysis
+    "advanced",
+    "executive",  # 9-10: expert summaries
+    "executive",
+)
+
 
 class BaseAgent(ABC):
     """Base class for all research agents with standard interface."""
@@ -21,8 +59,15 @@ class BaseAgent(ABC):
             agent_name: Unique name for this agent
         """
         self.agent_name = agent_name
+        self._agent_type = self._compute_agent_type()
         self.research_db = get_research_database()
         self.logger = logging.getLogger(f"agent.{agent_name}")
+        self._context_cache: OrderedDict[
+            tuple[str, str, str], tuple[tuple[Any, ...], dict[str, Any]]
+        ] = OrderedDict()
+        # Reason: context may be read from worker threads (asyncio.to_thread)
+        self._context_cache_lock = threading.Lock()
+        self._pending_cross_references: list[tuple[str, str, str, str, str]] = []
 
     @abstractmethod
     async def conduct_research(
@@ -50,6 +95,11 @@ class BaseAgent(ABC):
         """
         Read available research context from previous agents.
 
+        Results are cached per session, ticker and agent type against the
+        database's context stamp (paths, mtimes and sizes of the context files),
+        so files written by any agent are picked up on the next read. The
+        returned dict is shared with the cache and should be treated as read-only.
+
         Args:
             session_id: Session identifier
             ticker: Stock ticker symbol
@@ -57,18 +107,33 @@ class BaseAgent(ABC):
         Returns:
             Dictionary with context from previous research
         """
+        key = (session_id, ticker, self._agent_type)
         try:
-            # Determine agent type from agent name
-            agent_type = self._get_agent_type()
-            context = self.research_db.get_agent_context(session_id, ticker, agent_type)
-
-            self.logger.info(
-                f"Retrieved context for {self.agent_name}: {len(context.get('previous_research', {}))} previous agents"
-            )
+            stamp = self.research_db.get_context_stamp(session_id, ticker, self._agent_type)
+            with self._context_cache_lock:
+                cached = self._context_cache.get(key)
+                if cached is not None and cached[0] == stamp:
+                    self._context_cache.move_to_end(key)
+                    return cached[1]
+
+            context = self.research_db.get_agent_context(session_id, ticker, self._agent_type)
+
+            with self._context_cache_lock:
+                self._context_cache[key] = (stamp, context)
+                self._context_cache.move_to_end(key)
+                if len(self._context_cache) > CONTEXT_CACHE_MAX_ENTRIES:
+                    self._context_cache.popitem(last=False)
+
+            if _VERBOSE:
+                self.logger.info(
+                    "Retrieved context for %s: %d previous agents",
+                    self.agent_name,
+                    len(context.get("previous_research", {})),
+                )
             return context
 
         except Exception as e:
-            self.logger.error(f"Error reading research context: {str(e)}")
+            self.logger.error("Error reading research context: %s", e)
             return {"error": str(e), "previous_research": {}}
 
     def write_research_file(
@@ -101,37 +166,40 @@ class BaseAgent(ABC):
                 {
                     "author": self.agent_name,
                     "title": filename.replace(".md", "").replace("_", " ").title(),
-                    "topic": self._get_agent_type(),
+                    "topic": self._agent_type,
                 }
             )
 
             # Write file to research database
-            agent_type = self._get_agent_type()
-            file_path = self.research_db.write_research_file(
+            self.research_db.write_research_file(
                 session_id=session_id,
                 ticker=ticker,
-                agent_type=agent_type,
+                agent_type=self._agent_type,
                 filename=filename,
                 content=content,
                 metadata=metadata,
             )
 
             # Return relative path from session directory
-            sessions_path = self.research_db.sessions_path / session_id / ticker
-            relative_path = str(file_path.relative_to(sessions_path))
+            # Reason: the database always writes to <session>/<ticker>/<agent_type>/<filename>,
+            # so the relative path is known without rebuilding and walking Path objects
+            relative_path = os.path.join(self._agent_type, filename)
 
-            self.logger.info(f"Wrote research file: {relative_path}")
+            if _VERBOSE:
+                self.logger.info("Wrote research file: %s", relative_path)
             return relative_path
 
         except Exception as e:
-            self.logger.error(f"Error writing research file: {str(e)}")
+            self.logger.error("Error writing research file: %s", e)
             raise
 
     def add_cross_reference(
         self, session_id: str, ticker: str, source_file: str, target_file: str, relationship: str
     ) -> None:
         """
-        Add a cross-reference between research files.
+        Queue a cross-reference between research files.
+
+        References are buffered and written by flush_cross_references.
 
         Args:
             session_id: Session identifier
@@ -140,15 +208,31 @@ class BaseAgent(ABC):
             target_file: Target file path
             relationship: Description of relationship
         """
-        try:
-            self.research_db.add_cross_reference(
-                session_id, ticker, source_file, target_file, relationship
-            )
+        self._pending_cross_references.append(
+            (session_id, ticker, source_file, target_file, relationship)
+        )
+        if _VERBOSE:
             self.logger.info(
-                f"Added cross-reference: {source_file} -> {target_file} ({relationship})"
+                "Added cross-reference: %s -> %s (%s)", source_file, target_file, relationship
+            )
+
+    def flush_cross_references(self) -> None:
+        """Write queued cross-references, one database call per session and ticker."""
+        if not self._pending_cross_references:
+            return
+
+        pending, self._pending_cross_references = self._pending_cross_references, []
+        batches: dict[tuple[str, str], list[tuple[str, str, str]]] = {}
+        for session_id, ticker, source_file, target_file, relationship in pending:
+            batches.setdefault((session_id, ticker), []).append(
+                (source_file, target_file, relationship)
             )
-        except Exception as e:
-            self.logger.error(f"Error adding cross-reference: {str(e)}")
+
+        for (session_id, ticker), references in batches.items():
+            try:
+                self.research_db.add_cross_references(session_id, ticker, references)
+            except Exception as e:
+                self.logger.error("Error adding cross-references: %s", e)
 
     def format_handoff_data(
         self,
@@ -158,7 +242,7 @@ class BaseAgent(ABC):
         summary: str,
         confidence_metrics: dict[str, Any] | None = None,
         token_usage: int = 0,
-    ) -> dict[str, Any]:
+    ) -> HandoffData:
         """
         Format data for handoff to next agent.
 
@@ -171,35 +255,62 @@ class BaseAgent(ABC):
             token_usage: Tokens consumed during research
 
         Returns:
-            Formatted handoff data dictionary
+            Formatted handoff data
         """
         if confidence_metrics is None:
             confidence_metrics = {"confidence": 0.5, "completeness": 0.5}
 
-        return {
-            "research_files": research_files,
-            "context_summary": summary,
-            "cross_references": [],  # Can be populated by subclasses
-            "confidence_metrics": confidence_metrics,
-            "token_usage": token_usage,
-        }
+        return HandoffData(
+            research_files=research_files,
+            context_summary=summary,
+            cross_references=[],  # Can be populated by subclasses
+            confidence_metrics=confidence_metrics,
+            token_usage=token_usage,
+        )
 
-    def _get_agent_type(self) -> str:
+    def format_context_summary(
+        self,
+        context: dict[str, Any] | None,
+        default: str = "No previous agent context provided.",
+    ) -> str:
+        """
+        Format summaries from previous agents for inclusion in a prompt.
+
+        Args:
+            context: Mapping of agent type to that agent's result data
+            default: Text to use when no agent summary is available
+
+        Returns:
+            Labelled summary sections joined by blank lines, or default
+        """
+        if not context:
+            return default
+
+        sections = []
+        for agent_type, label in _CONTEXT_LABELS:
+            agent_context = context.get(agent_type)
+            if agent_context and (summary := agent_context.get("summary")) is not None:
+                sections.append(f"{label} CONTEXT:\n{summary}")
+
+        return "\n\n".join(sections) if sections else default
+
+    def _compute_agent_type(self) -> str:
         """
         Determine agent type from agent name.
 
         Returns:
             Agent type string for directory structure
         """
-        # Map agent names to directory types
-        type_mapping = {
-            "valuation_agent": "valuation",
-            "strategic_agent": "strategic",
-            "historian_agent": "historical",
-            "synthesis_agent": "synthesis",
-        }
+        return _AGENT_TYPE_MAP.get(self.agent_name, self.agent_name.replace("_agent", ""))
+
+    def _get_agent_type(self) -> str:
+        """
+        Get the agent type computed at initialization.
 
-        return type_mapping.get(self.agent_name, self.agent_name.replace("_agent", ""))
+        Returns:
+            Agent type string for directory structure
+        """
+        return self._agent_type
 
     def validate_research_context(self, context: dict[str, Any]) -> bool:
         """
@@ -211,8 +322,7 @@ class BaseAgent(ABC):
         Returns:
             True if context is valid, False otherwise
         """
-        required_keys = ["session_id", "ticker", "requesting_agent"]
-        return all(key in context for key in required_keys)
+        return _REQUIRED_CONTEXT_KEYS.issubset(context)
 
     def get_expertise_adjusted_depth(self, expertise_level: int) -> str:
         """
@@ -224,28 +334,26 @@ class BaseAgent(ABC):
         Returns:
             Research depth string
         """
-        if expertise_level <= 2:
-            return "foundational"  # Maximum educational content
-        elif expertise_level <= 4:
-            return "educational"  # Detailed explanations
-        elif expertise_level <= 6:
-            return "intermediate"  # Balanced analysis
-        elif expertise_level <= 8:
-            return "advanced"  # Sophisticated analysis
-        else:
-            return "executive"  # Expert summaries
+        return _DEPTH_BY_LEVEL[max(1, min(10, expertise_level))]
 
     def log_research_start(self, session_id: str, ticker: str, expertise_level: int) -> None:
         """Log the start of research process."""
         depth = self.get_expertise_adjusted_depth(expertise_level)
         self.logger.info(
-            f"Starting {self.agent_name} research for {ticker} "
-            f"(Session: {session_id}, Expertise: {expertise_level}, Depth: {depth})"
+            "Starting %s research for %s (Session: %s, Expertise: %d, Depth: %s)",
+            self.agent_name,
+            ticker,
+            session_id,
+            expertise_level,
+            depth,
         )
 
     def log_research_complete(self, session_id: str, ticker: str, files_created: list[str]) -> None:
         """Log the completion of research process."""
         self.logger.info(
-            f"Completed {self.agent_name} research for {ticker} "
-            f"(Session: {session_id}, Files: {len(files_created)})"
+            "Completed %s research for %s (Session: %s, Files: %d)",
+            self.agent_name,
+            ticker,
+            session_id,
+            len(files_created),
         )
@@ -1,8 +1,9 @@
 """Company Historian Agent using 2-Step GPT-5 Workflow."""
 
+import asyncio
 import logging
 import os
-from datetime import UTC, datetime
+import time
 from typing import Any
 
 from ..models.collaboration import AgentResult
@@ -11,82 +12,59 @@ from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
-
-class HistorianAgent(BaseAgent):
-    """Company Historian Agent using 2-step GPT-5 workflow for historical analysis."""
-
-    def __init__(self):
-        """Initialize HistorianAgent with GPT-5 client."""
-        super().__init__("historian_agent")
-        self.openai_client = OpenAIClient()
-
-    async def conduct_research(
-        self,
-        session_id: str,
-        ticker: str,
-        expertise_level: int,
-        context: dict[str, Any] | None = None,
-    ) -> AgentResult:
-        """
-        Conduct historical analysis using clean 2-step workflow.
-
-        Args:
-            session_id: Unique session identifier
-            ticker: Stock ticker symbol
-            expertise_level: User expertise level (1-10)
-            context: Valuation and strategic context from previous agents
-
-        Returns:
-            AgentResult with historical research files created
-        """
-        start_time = datetime.now(UTC)
-        self.log_research_start(session_id, ticker, expertise_level)
-
-        try:
-            # Step 1: Research with GPT-5 web search → temp_history.md
-            logger.info(f"🔍 Step 1: Researching historical data for {ticker}")
-            temp_md = await self._run_research_phase(session_id, ticker, expertise_level)
-
-            # Step 2: Historical analysis → company_history.md
-            logger.info(f"📊 Step 2: Creating historical analysis for {ticker}")
-            history_md = await self._run_analysis_phase(
-                session_id, ticker, expertise_level, temp_md, context
-            )
-
-            # Write files to research database
-            files_created = await self._write_research_files(
-                session_id, ticker, temp_md, history_md
-            )
-
-            # Create execution summary
-            execution_time = (datetime.now(UTC) - start_time).total_seconds()
-            summary = self._create_execution_summary(
-                ticker, execution_time, len(temp_md), len(history_md)
-            )
-
-            logger.info(f"✅ Historical analysis completed for {ticker} in {execution_time:.1f}s")
-
-            return AgentResult(
-                agent_name=self.agent_name,
-                success=True,
-                research_files_created=files_created,
-                summary=summary,
-                error_message=None,
-                token_usage=0,  # GPT-5 handles token tracking
-                execution_time_seconds=execution_time,
-                confidence_score=0.8,  # High confidence with real data
-            )
-
-        except Exception as e:
-            logger.error(f"❌ Historical analysis failed for {ticker}: {str(e)}")
-            return self._create_error_result(session_id, ticker, str(e), start_time)
-
-    async def _run_research_phase(self, session_id: str, ticker: str, expertise_level: int) -> str:
-        """Step 1: GPT-5 web search for historical company data → temp_history.md."""
-        try:
-            depth_config = self._get_expertise_depth_config(expertise_level)
-
-            research_prompt = f"""
+# Emit routine per-phase INFO logs only when STOCKIQ_VERBOSE=1
+_VERBOSE = os.getenv("STOCKIQ_VERBOSE", "0") == "1"
+
+# Batch runs log progress for one ticker in this many
+BATCH_PROGRESS_LOG_EVERY = 10
+
+# Output token ceilings for the two GPT-5 steps of a single ticker
+RESEARCH_MAX_OUTPUT_TOKENS = 32000
+ANALYSIS_MAX_OUTPUT_TOKENS = 16000
+
+# GPT-5-mini tokens-per-minute limit shared by concurrent batch runs
+OPENAI_TPM_LIMIT = 200_000
+
+# Analysis depth configurations, two expertise levels per depth
+_DEPTH_FOUNDATIONAL = {
+    "depth_name": "Foundational",
+    "pages": "250-300",
+    "detail": "comprehensive with educational explanations",
+}
+_DEPTH_EDUCATIONAL = {
+    "depth_name": "Educational",
+    "pages": "150-200",
+    "detail": "detailed with historical context",
+}
+_DEPTH_INTERMEDIATE = {
+    "depth_name": "Intermediate",
+    "pages": "80-100",
+    "detail": "focused historical analysis",
+}
+_DEPTH_ADVANCED = {
+    "depth_name": "Advanced",
+    "pages": "50-60",
+    "detail": "executive-level historical insights",
+}
+_DEPTH_EXECUTIVE = {
+    "depth_name": "Executive",
+    "pages": "10-20",
+    "detail": "historical summary with key implications",
+}
+
+# Indexed directly by expertise level (1-10); index 0 is unused
+_DEPTH_BY_LEVEL = (
+    (_DEPTH_INTERMEDIATE,)
+    + (_DEPTH_FOUNDATIONAL,) * 2
+    + (_DEPTH_EDUCATIONAL,) * 2
+    + (_DEPTH_INTERMEDIATE,) * 2
+    + (_DEPTH_ADVANCED,) * 2
+    + (_DEPTH_EXECUTIVE,) * 2
+)
+
+
+# Step 1 web search prompt; formatted with ticker and depth_name
+_RESEARCH_PROMPT_TEMPLATE = """
 You are a company historian researcher. Using web search for {ticker}:
 
 ## PRIORITY HISTORICAL DATA TO EXTRACT:
@@ -109,56 +87,13 @@ DATA SOURCES TO PREFER:
 CRITICAL: Include inline citations for EVERY historical fact.
 Format: [Source: publication/document, date]
 
-Analysis depth: {depth_config["depth_name"]} level
+Analysis depth: {depth_name} level
 
 Target output: 3000-4000 words of dense historical facts with dates and citations.
 """
 
-            # GPT-5-MINI with web search - using 200k TPM limit, 32k context
-            temp_md = self.openai_client.respond_with_web_search(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a company historian researcher. Search for comprehensive historical data with proper citations.",
-                    },
-                    {"role": "user", "content": research_prompt},
-                ],
-                reasoning_effort="low",  # Low to save tokens for output
-                verbosity="medium",  # Medium verbosity
-                max_output_tokens=32000,  # 32k context for comprehensive data
-            )
-
-            logger.info(f"✅ Research phase completed: {len(temp_md)} characters with real data")
-            return temp_md
-
-        except Exception as e:
-            logger.error(f"Research phase failed for {ticker}: {str(e)}")
-            return f"# Historical Research Failed for {ticker}\n\nError: {str(e)}\n\nUnable to retrieve historical data."
-
-    async def _run_analysis_phase(
-        self,
-        session_id: str,
-        ticker: str,
-        expertise_level: int,
-        temp_md: str,
-        context: dict[str, Any] | None = None,
-    ) -> str:
-        """Step 2: GPT-5 historical analysis using temp_history.md → company_history.md."""
-        try:
-            depth_config = self._get_expertise_depth_config(expertise_level)
-
-            # Format context from previous agents if available
-            context_summary = "No previous agent context provided."
-            if context:
-                context_sections = []
-                if "valuation" in context and "summary" in context["valuation"]:
-                    context_sections.append(f"VALUATION CONTEXT:\n{context['valuation']['summary']}")
-                if "strategic" in context and "summary" in context["strategic"]:
-                    context_sections.append(f"STRATEGIC CONTEXT:\n{context['strategic']['summary']}")
-                if context_sections:
-                    context_summary = "\n\n".join(context_sections)
-
-            analysis_prompt = f"""
+# Step 2 analysis prompt; formatted with ticker, temp_md, context_summary and depth_name
+_ANALYSIS_PROMPT_TEMPLATE = """
 You are an elite company historian creating institutional-grade historical analysis.
 
 Using the research in temp_history.md, create a comprehensive historical narrative that:
@@ -322,13 +257,266 @@ Using the research in temp_history.md, create a comprehensive historical narrati
 [List all sources from research data]
 ```
 
-Report complexity: {depth_config["depth_name"]} level
+Report complexity: {depth_name} level
 Include specific dates, numbers, and citations throughout.
 Output: Comprehensive historical analysis (2500-3000 words)
 """
 
+
+# Prompt templates with the depth name already filled in, one per depth
+_RESEARCH_PROMPT_BY_DEPTH = {
+    config["depth_name"]: _RESEARCH_PROMPT_TEMPLATE.replace("{depth_name}", config["depth_name"])
+    for config in _DEPTH_BY_LEVEL
+}
+_ANALYSIS_PROMPT_BY_DEPTH = {
+    config["depth_name"]: _ANALYSIS_PROMPT_TEMPLATE.replace("{depth_name}", config["depth_name"])
+    for config in _DEPTH_BY_LEVEL
+}
+
+
+# Execution summary; formatted with ticker, research_chars, history_chars and execution_time
+_SUMMARY_TEMPLATE = """
+Historical Analysis Complete for {ticker}:
+
+✅ Step 1: Historical research completed ({research_chars:,} characters with real data)
+✅ Step 2: Company history analysis completed ({history_chars:,} characters)
+✅ Files: temp_history.md (raw research) + company_history.md (complete analysis)
+✅ Framework: Chronological evolution with crisis management and leadership analysis
+✅ Data: Real historical data with citations (founding to present)
+
+Analysis completed in {execution_time:.1f} seconds using GPT-5 with web search.
+Ready for final synthesis agent with complete historical context.
+"""
+
+
+class _LogThrottle:
+    """Count-based sampler that lets one in every n events through."""
+
+    def __init__(self, every: int):
+        self.every = every
+        self.count = 0
+
+    def should_log(self) -> bool:
+        """Record an event and report whether it should be logged."""
+        self.count += 1
+        return (self.count - 1) % self.every == 0
+
+
+class HistorianAgent(BaseAgent):
+    """Company Historian Agent using 2-step GPT-5 workflow for historical analysis."""
+
+    def __init__(self):
+        """Initialize HistorianAgent with GPT-5 client."""
+        super().__init__("historian_agent")
+        self.openai_client = OpenAIClient()
+        # Sampler for per-ticker progress logs; None logs every ticker
+        self._progress_throttle: _LogThrottle | None = None
+
+    async def conduct_research(
+        self,
+        session_id: str,
+        ticker: str,
+        expertise_level: int,
+        context: dict[str, Any] | None = None,
+    ) -> AgentResult:
+        """
+        Conduct historical analysis using clean 2-step workflow.
+
+        Args:
+            session_id: Unique session identifier
+            ticker: Stock ticker symbol
+            expertise_level: User expertise level (1-10)
+            context: Valuation and strategic context from previous agents
+
+        Returns:
+            AgentResult with historical research files created
+        """
+        start_time = time.perf_counter()
+        # Reason: sampled per ticker so a ticker's progress logs appear together or not at all
+        log_progress = self._progress_throttle is None or self._progress_throttle.should_log()
+        if log_progress:
+            self.log_research_start(session_id, ticker, expertise_level)
+
+        try:
+            # Step 1: Research with GPT-5 web search → temp_history.md
+            if _VERBOSE and log_progress:
+                logger.info("🔍 Step 1: Researching historical data for %s", ticker)
+            temp_md = await self._run_research_phase(session_id, ticker, expertise_level)
+
+            # Reason: persist the raw research while the step-2 GPT-5 call is in flight
+            # instead of after it, taking the temp file write off the critical path
+            temp_write = asyncio.create_task(
+                asyncio.to_thread(
+                    self.write_research_file, session_id, ticker, "temp_history.md", temp_md
+                )
+            )
+
+            # Step 2: Historical analysis → company_history.md
+            if _VERBOSE and log_progress:
+                logger.info("📊 Step 2: Creating historical analysis for %s", ticker)
+            history_md = await self._run_analysis_phase(
+                session_id, ticker, expertise_level, temp_md, context
+            )
+
+            # Write files to research database
+            files_created = await self._write_research_files(
+                session_id, ticker, temp_md, history_md, temp_write=temp_write
+            )
+            if self._pending_cross_references:
+                await asyncio.to_thread(self.flush_cross_references)
+
+            # Create execution summary
+            execution_time = time.perf_counter() - start_time
+            summary = self._create_execution_summary(
+                ticker, execution_time, len(temp_md), len(history_md)
+            )
+
+            if log_progress:
+                logger.info(
+                    "✅ Historical analysis completed for %s in %.1fs", ticker, execution_time
+                )
+
+            return AgentResult(
+                agent_name=self.agent_name,
+                success=True,
+                research_files_created=files_created,
+                summary=summary,
+                error_message=None,
+                token_usage=0,  # GPT-5 handles token tracking
+                execution_time_seconds=execution_time,
+                confidence_score=0.8,  # High confidence with real data
+            )
+
+        except Exception as e:
+            logger.error("❌ Historical analysis failed for %s: %s", ticker, e)
+            return self._create_error_result(session_id, ticker, str(e), start_time)
+
+    @classmethod
+    async def conduct_research_batch(
+        cls,
+        session_id: str,
+        tickers: list[str],
+        expertise_level: int,
+        context: dict[str, Any] | None = None,
+        max_concurrency: int | None = None,
+    ) -> dict[str, AgentResult]:
+        """
+        Conduct historical analysis for several tickers concurrently.
+
+        Duplicate tickers are researched once. At most max_concurrency tickers run
+        at a time, and a ticker only starts when its worst-case output tokens fit
+        under the OpenAI TPM limit alongside the tickers already in flight.
+        Per-ticker progress is logged for one ticker in BATCH_PROGRESS_LOG_EVERY;
+        errors are always logged.
+
+        Args:
+            session_id: Unique session identifier
+            tickers: Stock ticker symbols to research
+            expertise_level: User expertise level (1-10)
+            context: Valuation and strategic context shared by all tickers
+            max_concurrency: Maximum tickers in flight (default: HISTORIAN_CONCURRENCY or 4)
+
+        Returns:
+            Mapping of ticker to its AgentResult
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("HISTORIAN_CONCURRENCY", "4"))
+
+        agent = cls()
+        agent._progress_throttle = _LogThrottle(BATCH_PROGRESS_LOG_EVERY)
+        unique_tickers = list(dict.fromkeys(tickers))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        ticker_tokens = RESEARCH_MAX_OUTPUT_TOKENS + ANALYSIS_MAX_OUTPUT_TOKENS
+        token_budget = asyncio.Condition()
+        tokens_in_flight = 0
+
+        async def research(ticker: str) -> AgentResult:
+            nonlocal tokens_in_flight
+            async with semaphore:
+                # Reason: a run always fits when nothing else is in flight, so an
+                # oversized reservation cannot deadlock the batch
+                async with token_budget:
+                    await token_budget.wait_for(
+                        lambda: tokens_in_flight == 0
+                        or tokens_in_flight + ticker_tokens <= OPENAI_TPM_LIMIT
+                    )
+                    tokens_in_flight += ticker_tokens
+                try:
+                    return await agent.conduct_research(
+                        session_id, ticker, expertise_level, context
+                    )
+                finally:
+                    async with token_budget:
+                        tokens_in_flight -= ticker_tokens
+                        token_budget.notify_all()
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(research(ticker) for ticker in unique_tickers))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Historical batch completed: %d/%d tickers succeeded in %.1fs (concurrency %d)",
+                sum(result.success for result in results),
+                len(results),
+                time.perf_counter() - start_time,
+                max_concurrency,
+            )
+        return dict(zip(unique_tickers, results, strict=True))
+
+    async def _run_research_phase(self, session_id: str, ticker: str, expertise_level: int) -> str:
+        """Step 1: GPT-5 web search for historical company data → temp_history.md."""
+        try:
+            depth_config = self._get_expertise_depth_config(expertise_level)
+
+            research_prompt = _RESEARCH_PROMPT_BY_DEPTH[depth_config["depth_name"]].format(
+                ticker=ticker
+            )
+
+            # GPT-5-MINI with web search - using 200k TPM limit, 32k context
+            # Run the blocking SDK call in a worker thread so the event loop stays free
+            temp_md = await asyncio.to_thread(
+                self.openai_client.respond_with_web_search,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a company historian researcher. Search for comprehensive historical data with proper citations.",
+                    },
+                    {"role": "user", "content": research_prompt},
+                ],
+                reasoning_effort="low",  # Low to save tokens for output
+                verbosity="medium",  # Medium verbosity
+                max_output_tokens=RESEARCH_MAX_OUTPUT_TOKENS,  # 32k context for comprehensive data
+            )
+
+            if _VERBOSE:
+                logger.info("✅ Research phase completed: %d characters with real data", len(temp_md))
+            return temp_md
+
+        except Exception as e:
+            logger.error("Research phase failed for %s: %s", ticker, e)
+            return f"# Historical Research Failed for {ticker}\n\nError: {str(e)}\n\nUnable to retrieve historical data."
+
+    async def _run_analysis_phase(
+        self,
+        session_id: str,
+        ticker: str,
+        expertise_level: int,
+        temp_md: str,
+        context: dict[str, Any] | None = None,
+    ) -> str:
+        """Step 2: GPT-5 historical analysis using temp_history.md → company_history.md."""
+        try:
+            depth_config = self._get_expertise_depth_config(expertise_level)
+
+            # Format context from previous agents if available
+            context_summary = self.format_context_summary(context)
+
+            analysis_prompt = _ANALYSIS_PROMPT_BY_DEPTH[depth_config["depth_name"]].format(
+                ticker=ticker, temp_md=temp_md, context_summary=context_summary
+            )
+
             # GPT-5 for historical analysis - focused output
-            history_md = self.openai_client.create_completion(
+            history_md = await asyncio.to_thread(
+                self.openai_client.create_completion,
                 messages=[
                     {
                         "role": "system",
@@ -336,114 +524,91 @@ Output: Comprehensive historical analysis (2500-3000 words)
                     },
                     {"role": "user", "content": analysis_prompt},
                 ],
-                max_tokens=16000,  # 16k context for analysis
+                max_tokens=ANALYSIS_MAX_OUTPUT_TOKENS,  # 16k context for analysis
                 use_complex_model=True,  # Use GPT-5 for complex analysis
             )
 
-            logger.info(f"✅ Historical analysis phase completed: {len(history_md)} characters")
+            if _VERBOSE:
+                logger.info("✅ Historical analysis phase completed: %d characters", len(history_md))
             return history_md
 
         except Exception as e:
-            logger.error(f"Historical analysis phase failed for {ticker}: {str(e)}")
+            logger.error("Historical analysis phase failed for %s: %s", ticker, e)
             return f"# Historical Analysis Failed for {ticker}\n\nError: {str(e)}\n\nUnable to complete historical analysis."
 
     def _get_expertise_depth_config(self, expertise_level: int) -> dict:
         """Map expertise level to analysis depth configuration."""
-        depth_map = {
-            (1, 2): {
-                "depth_name": "Foundational",
-                "pages": "250-300",
-                "detail": "comprehensive with educational explanations",
-            },
-            (3, 4): {
-                "depth_name": "Educational",
-                "pages": "150-200",
-                "detail": "detailed with historical context",
-            },
-            (5, 6): {
-                "depth_name": "Intermediate",
-                "pages": "80-100",
-                "detail": "focused historical analysis",
-            },
-            (7, 8): {
-                "depth_name": "Advanced",
-                "pages": "50-60",
-                "detail": "executive-level historical insights",
-            },
-            (9, 10): {
-                "depth_name": "Executive",
-                "pages": "10-20",
-                "detail": "historical summary with key implications",
-            },
-        }
-
-        for level_range, config in depth_map.items():
-            if level_range[0] <= expertise_level <= level_range[1]:
-                return config
-
-        return {
-            "depth_name": "Intermediate",
-            "pages": "80-100",
-            "detail": "focused historical analysis",
-        }
+        return _DEPTH_BY_LEVEL[max(1, min(10, expertise_level))]
 
     async def _write_research_files(
-        self, session_id: str, ticker: str, temp_md: str, history_md: str
+        self,
+        session_id: str,
+        ticker: str,
+        temp_md: str,
+        history_md: str,
+        temp_write: asyncio.Task | None = None,
     ) -> list[str]:
-        """Write research files to database following Story 2.1 pattern."""
+        """
+        Write research files to database following Story 2.1 pattern.
+
+        Files go through BaseAgent.write_research_file so they carry metadata
+        headers and are recorded in the session file index.
+
+        Args:
+            session_id: Unique session identifier
+            ticker: Stock ticker symbol
+            temp_md: Raw research with citations
+            history_md: Complete historical analysis
+            temp_write: Already-running write of temp_md, awaited instead of rewriting
+
+        Returns:
+            Paths of the written files relative to the session directory
+        """
         try:
-            research_dir = f"research_database/sessions/{session_id}/{ticker}/historical"
             files_created = []
 
             # Write temp_history.md (raw research with citations)
-            temp_path = f"{research_dir}/temp_history.md"
-            await self._write_research_file(temp_path, temp_md)
-            files_created.append(temp_path)
+            if temp_write is None:
+                temp_write = asyncio.to_thread(
+                    self.write_research_file, session_id, ticker, "temp_history.md", temp_md
+                )
+            files_created.append(await temp_write)
 
             # Write company_history.md (complete analysis)
-            history_path = f"{research_dir}/company_history.md"
-            await self._write_research_file(history_path, history_md)
-            files_created.append(history_path)
+            # Reason: written after temp_history.md, never alongside it, because both
+            # writes update the same session meta files
+            files_created.append(
+                await asyncio.to_thread(
+                    self.write_research_file, session_id, ticker, "company_history.md", history_md
+                )
+            )
 
-            logger.info(f"✅ Created {len(files_created)} historical research files for {ticker}")
+            if _VERBOSE:
+                logger.info(
+                    "✅ Created %d historical research files for %s", len(files_created), ticker
+                )
             return files_created
 
         except Exception as e:
-            logger.error(f"Failed to write historical research files for {ticker}: {str(e)}")
+            logger.error("Failed to write historical research files for %s: %s", ticker, e)
             return []
 
-    async def _write_research_file(self, file_path: str, content: str) -> None:
-        """Write content to research database file."""
-
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Write content to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
     def _create_execution_summary(
         self, ticker: str, execution_time: float, research_chars: int, history_chars: int
     ) -> str:
         """Create execution summary for agent result."""
-        return f"""
-Historical Analysis Complete for {ticker}:
-
-✅ Step 1: Historical research completed ({research_chars:,} characters with real data)
-✅ Step 2: Company history analysis completed ({history_chars:,} characters)
-✅ Files: temp_history.md (raw research) + company_history.md (complete analysis)
-✅ Framework: Chronological evolution with crisis management and leadership analysis
-✅ Data: Real historical data with citations (founding to present)
-
-Analysis completed in {execution_time:.1f} seconds using GPT-5 with web search.
-Ready for final synthesis agent with complete historical context.
-"""
+        return _SUMMARY_TEMPLATE.format(
+            ticker=ticker,
+            execution_time=execution_time,
+            research_chars=research_chars,
+            history_chars=history_chars,
+        )
 
     def _create_error_result(
-        self, session_id: str, ticker: str, error_message: str, start_time: datetime
+        self, session_id: str, ticker: str, error_message: str, start_time: float
     ) -> AgentResult:
-        """Create error result for failed analysis."""
-        execution_time = (datetime.now(UTC) - start_time).total_seconds()
+        """Create error result for failed analysis (start_time from time.perf_counter())."""
+        execution_time = time.perf_counter() - start_time
 
         return AgentResult(
             agent_name=self.agent_name,
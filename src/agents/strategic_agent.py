@@ -1,9 +1,16 @@
 """Strategic Analyst Agent using 2-Step GPT-5 Workflow."""
 
+import asyncio
+import hashlib
 import logging
 import os
-from datetime import UTC, datetime
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Any, Final
+
+from config.settings import get_settings
 
 from ..models.collaboration import AgentResult
 from ..utils.openai_client import OpenAIClient
@@ -11,164 +18,171 @@ from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Independent Step 1 research areas, each searched by its own concurrent request
+RESEARCH_TOPICS = (
+    ("Competitive positioning", "Market share, competitive advantages, moats"),
+    ("Industry dynamics", "Market size, growth trends, key drivers"),
+    ("Strategic risks", "Regulatory, technological, competitive threats"),
+    ("Management quality", "Leadership track record, strategic decisions"),
+    ("ESG factors", "Material ESG considerations affecting investment thesis"),
+    ("Strategic opportunities", "Growth catalysts, expansion opportunities"),
+    ("Market dynamics", "Pricing power, customer retention, switching costs"),
+)
+
+# GPT-5-MINI tokens-per-minute limit shared by the concurrent Step 1 topic searches
+OPENAI_TPM_LIMIT = 200_000
+
+# Report depth configurations, shared read-only across requests. Token ceilings
+# shrink with the report length: research_max_tokens caps each Step 1 topic
+# request and analysis_max_tokens the Step 2 report. Web search does not support
+# minimal reasoning, so analysis_reasoning_effort only applies to Step 2.
+_DEPTH_FOUNDATIONAL: Final[Mapping[str, Any]] = MappingProxyType(
+    {
+        "depth_name": "Foundational",
+        "pages": "250-300",
+        "detail": "comprehensive with educational explanations",
+        "research_max_tokens": 12000,
+        "analysis_max_tokens": 16000,
+        "analysis_reasoning_effort": "minimal",
+    }
+)
+_DEPTH_EDUCATIONAL: Final[Mapping[str, Any]] = MappingProxyType(
+    {
+        "depth_name": "Educational",
+        "pages": "150-200",
+        "detail": "detailed with strategic context",
+        "research_max_tokens": 12000,
+        "analysis_max_tokens": 16000,
+        "analysis_reasoning_effort": "minimal",
+    }
+)
+_DEPTH_INTERMEDIATE: Final[Mapping[str, Any]] = MappingProxyType(
+    {
+        "depth_name": "Intermediate",
+        "pages": "80-100",
+        "detail": "focused strategic analysis",
+        "research_max_tokens": 10000,
+        "analysis_max_tokens": 16000,
+        "analysis_reasoning_effort": "low",
+    }
+)
+_DEPTH_ADVANCED: Final[Mapping[str, Any]] = MappingProxyType(
+    {
+        "depth_name": "Advanced",
+        "pages": "50-60",
+        "detail": "executive-level strategic insights",
+        "research_max_tokens": 8000,
+        "analysis_max_tokens": 12000,
+        "analysis_reasoning_effort": "low",
+    }
+)
+_DEPTH_EXECUTIVE: Final[Mapping[str, Any]] = MappingProxyType(
+    {
+        "depth_name": "Executive",
+        "pages": "10-20",
+        "detail": "strategic summary with key implications",
+        "research_max_tokens": 6000,
+        "analysis_max_tokens": 8000,
+        "analysis_reasoning_effort": "low",
+    }
+)
+
+# Expanded once from the level ranges so lookups are a single dict access;
+# levels outside 1-10 fall back to Intermediate
+_DEPTH_BY_LEVEL: Final[Mapping[int, Mapping[str, Any]]] = MappingProxyType(
+    {
+        level: config
+        for (low, high), config in (
+            ((1, 2), _DEPTH_FOUNDATIONAL),
+            ((3, 4), _DEPTH_EDUCATIONAL),
+            ((5, 6), _DEPTH_INTERMEDIATE),
+            ((7, 8), _DEPTH_ADVANCED),
+            ((9, 10), _DEPTH_EXECUTIVE),
+        )
+        for level in range(low, high + 1)
+    }
+)
 
-class StrategicAgent(BaseAgent):
-    """Strategic Analyst Agent using 2-step GPT-5 workflow for competitive analysis."""
-
-    def __init__(self):
-        """Initialize StrategicAgent with GPT-5 client."""
-        super().__init__("strategic_agent")
-        self.openai_client = OpenAIClient()
-
-    async def conduct_research(
-        self,
-        session_id: str,
-        ticker: str,
-        expertise_level: int,
-        context: dict[str, Any] | None = None,
-    ) -> AgentResult:
-        """
-        Conduct strategic analysis using clean 2-step workflow.
-
-        Args:
-            session_id: Unique session identifier
-            ticker: Stock ticker symbol
-            expertise_level: User expertise level (1-10)
-            context: Valuation context from previous agents
 
-        Returns:
-            AgentResult with strategic research files created
-        """
-        start_time = datetime.now(UTC)
-        self.log_research_start(session_id, ticker, expertise_level)
+# Porter's Five Forces + moat framework shared by every Step 2 analysis
+STRATEGIC_FRAMEWORK: Final[str] = """
+# Strategic Analysis Framework (Porter's Five Forces + Moat Analysis)
 
-        try:
-            # Step 1: Research with GPT-5 web search → temp_competition.md
-            logger.info(f"🔍 Step 1: Researching competitive data for {ticker}")
-            temp_md = await self._run_research_phase(session_id, ticker, expertise_level)
+## 1. Competitive Moat Analysis
+**Four Types of Economic Moats:**
 
-            # Step 2: Strategic analysis → strategic_analysis.md
-            logger.info(f"📊 Step 2: Creating strategic analysis for {ticker}")
-            strategic_md = await self._run_analysis_phase(
-                session_id, ticker, expertise_level, temp_md, context
-            )
+### Network Effects
+- Value increases with more users/participants
+- Creates switching costs and barriers to entry
+- Examples: Payment networks, social platforms, marketplaces
 
-            # Write files to research database
-            files_created = await self._write_research_files(
-                session_id, ticker, temp_md, strategic_md
-            )
+### Switching Costs
+- High costs (financial, operational, emotional) to change providers
+- Lock-in through integration, data, contracts, learning curves
+- Creates predictable revenue streams
 
-            # Create execution summary
-            execution_time = (datetime.now(UTC) - start_time).total_seconds()
-            summary = self._create_execution_summary(
-                ticker, execution_time, len(temp_md), len(strategic_md)
-            )
+### Cost Advantages
+- Structural cost advantages competitors cannot easily replicate
+- Sources: Scale, location, process patents, preferential access
+- Enables pricing flexibility and margin expansion
 
-            logger.info(f"✅ Strategic analysis completed for {ticker} in {execution_time:.1f}s")
+### Intangible Assets
+- Brands, patents, regulatory licenses, data assets
+- Create pricing power and barrier to competition
+- Must be defensible and economically valuable
 
-            return AgentResult(
-                agent_name=self.agent_name,
-                success=True,
-                research_files_created=files_created,
-                summary=summary,
-                error_message=None,
-                token_usage=0,  # GPT-5 handles token tracking
-                execution_time_seconds=execution_time,
-                confidence_score=0.8,  # High confidence with real data
-            )
+## 2. Porter's Five Forces Analysis
 
-        except Exception as e:
-            logger.error(f"❌ Strategic analysis failed for {ticker}: {str(e)}")
-            return self._create_error_result(session_id, ticker, str(e), start_time)
+### Threat of New Entrants
+- Barriers to entry (capital, regulation, network effects)
+- Economies of scale requirements
+- Brand loyalty and switching costs
 
-    async def _run_research_phase(self, session_id: str, ticker: str, expertise_level: int) -> str:
-        """Step 1: GPT-5 web search for competitive and market data → temp_competition.md."""
-        try:
-            depth_config = self._get_expertise_depth_config(expertise_level)
+### Bargaining Power of Suppliers
+- Supplier concentration vs industry concentration
+- Availability of substitute inputs
+- Cost of switching suppliers
 
-            research_prompt = f"""
-You are a strategic research analyst. Using web search for {ticker}:
+### Bargaining Power of Customers
+- Customer concentration and size
+- Price sensitivity and switching costs
+- Availability of alternatives
 
-## PRIORITY DATA TO EXTRACT:
-1. **Competitive positioning**: Market share, competitive advantages, moats
-2. **Industry dynamics**: Market size, growth trends, key drivers
-3. **Strategic risks**: Regulatory, technological, competitive threats
-4. **Management quality**: Leadership track record, strategic decisions
-5. **ESG factors**: Material ESG considerations affecting investment thesis
-6. **Strategic opportunities**: Growth catalysts, expansion opportunities
-7. **Market dynamics**: Pricing power, customer retention, switching costs
+### Threat of Substitutes
+- Substitute products/services performance
+- Relative price-performance of substitutes
+- Customer propensity to substitute
 
-## DATA SOURCES TO PREFER:
-- Company 10-K, 10-Q filings (competitive sections)
-- Industry reports (McKinsey, BCG, industry associations)
-- Recent management presentations and strategy updates
-- Competitor filings and press releases
-- Regulatory filings and government reports
-- ESG reports and sustainability disclosures
+### Competitive Rivalry
+- Number and strength of competitors
+- Industry growth rate and capacity utilization
+- Differentiation vs commodity competition
 
-## OUTPUT FORMAT:
-Return comprehensive **markdown** with:
-- Structured sections for each analysis area
-- **Inline citations** after each statement: [Source: document name, date]
-- Comparative analysis with key competitors
-- Quantitative data where available (market share percentages, etc.)
-- Focus on qualitative factors that impact long-term returns
+## 3. Strategic Risk Assessment Matrix
+**Risk Categories:**
+- **Regulatory**: Policy changes, new regulations, enforcement
+- **Technology**: Disruption, obsolescence, innovation cycles
+- **Market**: Demand shifts, economic cycles, demographic changes
+- **Operational**: Key person risk, supply chain, operational execution
+- **Financial**: Capital requirements, debt capacity, cash flow volatility
 
-Analysis depth: {depth_config["depth_name"]} level
+## 4. Management Quality Evaluation
+**Assessment Criteria:**
+- **Track Record**: Historical strategic execution and results
+- **Capital Allocation**: ROI on investments, M&A success, shareholder returns
+- **Communication**: Transparency, consistency, stakeholder management
+- **Vision**: Strategic clarity, market understanding, adaptation capability
 
-CRITICAL: Use real web search. Get actual current competitive data with proper citations.
-No generic statements - only specific, sourced insights about competitive positioning.
+**Key Principle**: Focus on strategic factors that directly impact long-term cash flows and competitive positioning.
+Quantify qualitative factors where possible and link to investment implications.
 """
 
-            # GPT-5-MINI with web search - using 200k TPM limit, increased to 64k context
-            temp_md = self.openai_client.respond_with_web_search(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a strategic research analyst. Search for comprehensive competitive and market data with proper citations.",
-                    },
-                    {"role": "user", "content": research_prompt},
-                ],
-                reasoning_effort="low",  # Low reasoning effort
-                verbosity="medium",  # Medium verbosity
-                max_output_tokens=32000,  # 32k context for comprehensive data
-            )
-
-            logger.info(f"✅ Research phase completed: {len(temp_md)} characters with real data")
-            return temp_md
-
-        except Exception as e:
-            logger.error(f"Research phase failed for {ticker}: {str(e)}")
-            return f"# Strategic Research Failed for {ticker}\n\nError: {str(e)}\n\nUnable to retrieve competitive data."
-
-    async def _run_analysis_phase(
-        self,
-        session_id: str,
-        ticker: str,
-        expertise_level: int,
-        temp_md: str,
-        valuation_context: dict[str, Any] | None = None,
-    ) -> str:
-        """Step 2: GPT-5 strategic analysis using temp_competition.md → strategic_analysis.md."""
-        try:
-            strategic_framework = self._get_strategic_framework()
-            depth_config = self._get_expertise_depth_config(expertise_level)
-
-            # Format valuation context if available
-            valuation_summary = "No valuation context provided."
-            if valuation_context and "summary" in valuation_context:
-                valuation_summary = f"VALUATION CONTEXT:\n{valuation_context['summary']}"
-
-            analysis_prompt = f"""
-Use the competitive research data below to create comprehensive strategic analysis for {ticker}.
+# Static Step 2 instructions; kept byte-identical across tickers so OpenAI can
+# reuse the cached prefix
+ANALYSIS_SYSTEM_PROMPT: Final[str] = f"""You are an elite strategic analyst. Focus on investment-relevant strategic factors with proper sourcing.
 
 ## STRATEGIC ANALYSIS FRAMEWORK:
-{strategic_framework}
-
-## COMPETITIVE RESEARCH DATA:
-{temp_md}
-
-## {valuation_summary}
+{STRATEGIC_FRAMEWORK}
 
 ## YOUR TASK - Create complete strategic analysis:
 
@@ -212,7 +226,7 @@ Use the competitive research data below to create comprehensive strategic analys
 
 ## OUTPUT FORMAT (Markdown):
 ```markdown
-# {ticker} Strategic Analysis
+# [TICKER] Strategic Analysis
 
 ## Executive Summary
 - **Strategic Position**: STRONG/MODERATE/WEAK
@@ -307,23 +321,391 @@ Use the competitive research data below to create comprehensive strategic analys
 [List all sources from research data]
 ```
 
-Report complexity: {depth_config["depth_name"]} level
 Focus on investment-relevant strategic factors. Link analysis to long-term return potential.
 """
 
-            # GPT-5 for strategic analysis - focused output
-            strategic_md = self.openai_client.create_completion(
+# Step 1 per-topic web search prompt; formatted with ticker, title, focus and depth_name
+_RESEARCH_PROMPT_TEMPLATE: Final[str] = """
+You are a strategic research analyst. Using web search for {ticker}:
+
+## PRIORITY DATA TO EXTRACT:
+**{title}**: {focus}
+
+## DATA SOURCES TO PREFER:
+- Company 10-K, 10-Q filings (competitive sections)
+- Industry reports (McKinsey, BCG, industry associations)
+- Recent management presentations and strategy updates
+- Competitor filings and press releases
+- Regulatory filings and government reports
+- ESG reports and sustainability disclosures
+
+## OUTPUT FORMAT:
+Return focused **markdown** for this area only, starting with the heading "## {title}":
+- **Inline citations** after each statement: [Source: document name, date]
+- Comparative analysis with key competitors
+- Quantitative data where available (market share percentages, etc.)
+- Focus on qualitative factors that impact long-term returns
+
+Analysis depth: {depth_name} level
+
+CRITICAL: Use real web search. Get actual current competitive data with proper citations.
+No generic statements - only specific, sourced insights about competitive positioning.
+"""
+
+_RESEARCH_SYSTEM_PROMPT: Final[str] = (
+    "You are a strategic research analyst. Search for comprehensive competitive and market "
+    "data with proper citations."
+)
+
+# Step 2 user prompt; formatted with ticker, temp_md, valuation_summary and depth_name
+_ANALYSIS_PROMPT_TEMPLATE: Final[str] = """
+Use the competitive research data below to create comprehensive strategic analysis for {ticker}.
+Replace [TICKER] in the output format with {ticker}.
+
+## COMPETITIVE RESEARCH DATA:
+{temp_md}
+
+## {valuation_summary}
+
+Report complexity: {depth_name} level
+"""
+
+# Heading that opens the Step 1 failure report; Step 2 is skipped when research starts with it
+_RESEARCH_FAILED_HEADING: Final[str] = "# Strategic Research Failed for "
+
+# Research longer than this is condensed by the simple model before Step 2
+RESEARCH_COMPRESSION_THRESHOLD_CHARS = 30000
+RESEARCH_COMPRESSION_MAX_OUTPUT_TOKENS = 8000
+
+_COMPRESSION_SYSTEM_PROMPT: Final[str] = """
+You condense strategic research notes for a senior analyst.
+Rewrite the research below as a dense summary that:
+- Keeps every "## " section heading, in the original order
+- Keeps every figure, percentage, date and competitor name
+- Keeps each inline citation [Source: document name, date] next to the fact it supports
+- Drops repetition, filler and generic statements
+Return markdown only."""
+
+# Reason: keying cached responses on a digest of the static prompts means any prompt
+# edit invalidates earlier responses without a manual version bump
+STRATEGIC_PROMPT_HASH: Final[str] = hashlib.blake2b(
+    (
+        _RESEARCH_SYSTEM_PROMPT
+        + _RESEARCH_PROMPT_TEMPLATE
+        + repr(RESEARCH_TOPICS)
+        + ANALYSIS_SYSTEM_PROMPT
+        + _ANALYSIS_PROMPT_TEMPLATE
+        + _COMPRESSION_SYSTEM_PROMPT
+    ).encode(),
+    digest_size=8,
+).hexdigest()
+
+# Routing keys for Step 2 requests sharing ANALYSIS_SYSTEM_PROMPT, one per report depth.
+# Reason: the ticker is left out so every ticker at a depth lands on the same cache,
+# and the prompt digest rotates the keys whenever the prompts change
+ANALYSIS_PROMPT_CACHE_KEYS: Final[Mapping[str, str]] = MappingProxyType(
+    {
+        config["depth_name"]: f"strategic-{STRATEGIC_PROMPT_HASH}-{config['depth_name'].lower()}"
+        for config in _DEPTH_BY_LEVEL.values()
+    }
+)
+
+# Execution summary; formatted with ticker, research_chars, strategic_chars and execution_time
+_SUMMARY_TEMPLATE = """
+Strategic Analysis Complete for {ticker}:
+
+✅ Step 1: Competitive research completed ({research_chars:,} characters with real data)
+✅ Step 2: Strategic analysis completed ({strategic_chars:,} characters)
+✅ Files: temp_competition.md (raw research) + strategic_analysis.md (complete analysis)
+✅ Framework: Porter's Five Forces + Economic Moat Analysis
+✅ Data: Real competitive data with citations (no generic insights)
+
+Analysis completed in {execution_time:.1f} seconds using GPT-5 with web search.
+Ready for next agent handoff with strategic context.
+"""
+
+
+class StrategicAgent(BaseAgent):
+    """Strategic Analyst Agent using 2-step GPT-5 workflow for competitive analysis."""
+
+    def __init__(self):
+        """Initialize StrategicAgent with GPT-5 client."""
+        super().__init__("strategic_agent")
+        self.openai_client = OpenAIClient()
+        self._response_cache: dict[str, tuple[float, str]] = {}
+        self._response_cache_ttl = get_settings().strategic_cache_ttl_seconds
+        self._created_dirs: set[str] = set()
+        self._topic_token_budget = asyncio.Condition()
+        self._topic_tokens_in_flight = 0
+
+    async def conduct_research(
+        self,
+        session_id: str,
+        ticker: str,
+        expertise_level: int,
+        context: dict[str, Any] | None = None,
+    ) -> AgentResult:
+        """
+        Conduct strategic analysis using clean 2-step workflow.
+
+        Args:
+            session_id: Unique session identifier
+            ticker: Stock ticker symbol
+            expertise_level: User expertise level (1-10)
+            context: Valuation context from previous agents
+
+        Returns:
+            AgentResult with strategic research files created
+        """
+        start_time = time.perf_counter()
+        self.log_research_start(session_id, ticker, expertise_level)
+
+        try:
+            # Step 1: Research with GPT-5 web search → temp_competition.md
+            logger.info(f"🔍 Step 1: Researching competitive data for {ticker}")
+            temp_md = await self._run_research_phase(session_id, ticker, expertise_level)
+
+            # Reason: Step 2 on a failure report only burns a GPT-5 call, so keep the
+            # report as the sole file and fail fast
+            if temp_md.startswith(_RESEARCH_FAILED_HEADING):
+                logger.warning(f"Skipping strategic analysis for {ticker}: research phase failed")
+                files_created = await self._write_research_files(session_id, ticker, temp_md)
+                return self._create_error_result(
+                    session_id,
+                    ticker,
+                    "Strategic research phase failed",
+                    start_time,
+                    research_files=files_created,
+                )
+
+            # Step 2: Strategic analysis → strategic_analysis.md
+            logger.info(f"📊 Step 2: Creating strategic analysis for {ticker}")
+            strategic_md = await self._run_analysis_phase(
+                session_id, ticker, expertise_level, temp_md, context
+            )
+
+            # Write files to research database
+            files_created = await self._write_research_files(
+                session_id, ticker, temp_md, strategic_md
+            )
+
+            # Create execution summary
+            execution_time = time.perf_counter() - start_time
+            research_chars = len(temp_md)
+            strategic_chars = len(strategic_md)
+            summary = self._create_execution_summary(
+                ticker, execution_time, research_chars, strategic_chars
+            )
+
+            logger.info(
+                f"✅ Strategic analysis completed for {ticker} in {execution_time:.1f}s "
+                f"({research_chars + strategic_chars} characters)"
+            )
+
+            return AgentResult(
+                agent_name=self.agent_name,
+                success=True,
+                research_files_created=files_created,
+                summary=summary,
+                error_message=None,
+                token_usage=0,  # GPT-5 handles token tracking
+                execution_time_seconds=execution_time,
+                confidence_score=0.8,  # High confidence with real data
+            )
+
+        except Exception as e:
+            logger.error(f"❌ Strategic analysis failed for {ticker}: {str(e)}")
+            return self._create_error_result(session_id, ticker, str(e), start_time)
+
+    async def conduct_research_batch(
+        self,
+        session_id: str,
+        tickers: list[str],
+        expertise_level: int,
+        context: dict[str, Any] | None = None,
+        max_concurrency: int = 10,
+    ) -> dict[str, AgentResult]:
+        """
+        Conduct strategic analysis for several tickers concurrently.
+
+        Duplicate tickers are analysed once and at most max_concurrency tickers
+        run at a time. Each ticker fans out one web search per research topic, and
+        a topic search only starts when its output tokens fit under the OpenAI TPM
+        limit alongside the searches already in flight. A ticker whose run raises
+        gets an error result instead of failing the batch.
+
+        Args:
+            session_id: Unique session identifier
+            tickers: Stock ticker symbols to analyse
+            expertise_level: User expertise level (1-10)
+            context: Valuation context shared by all tickers
+            max_concurrency: Maximum tickers in flight
+
+        Returns:
+            Mapping of ticker to its AgentResult
+        """
+        unique_tickers = list(dict.fromkeys(tickers))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def research(ticker: str) -> AgentResult:
+            async with semaphore:
+                return await self.conduct_research(session_id, ticker, expertise_level, context)
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(
+            *(research(ticker) for ticker in unique_tickers), return_exceptions=True
+        )
+        batch_results = {
+            ticker: (
+                self._create_error_result(session_id, ticker, str(result), start_time)
+                if isinstance(result, Exception)
+                else result
+            )
+            for ticker, result in zip(unique_tickers, results, strict=True)
+        }
+
+        succeeded = sum(result.success for result in batch_results.values())
+        logger.info(
+            f"Strategic batch completed: {succeeded}/{len(batch_results)} tickers succeeded"
+        )
+        return batch_results
+
+    async def _run_research_phase(self, session_id: str, ticker: str, expertise_level: int) -> str:
+        """Step 1: GPT-5 web search for competitive and market data → temp_competition.md."""
+        try:
+            cache_key = self._response_cache_key("research", ticker, str(expertise_level))
+            cached_md = self._get_cached_response(cache_key)
+            if cached_md is not None:
+                logger.info(f"Serving cached strategic research for {ticker}")
+                return cached_md
+
+            depth_config = self._get_expertise_depth_config(expertise_level)
+
+            # Reason: the priority areas are independent, so researching them concurrently
+            # bounds Step 1 latency by the slowest topic instead of one long generation
+            results = await asyncio.gather(
+                *(
+                    self._research_topic(ticker, title, focus, depth_config)
+                    for title, focus in RESEARCH_TOPICS
+                ),
+                return_exceptions=True,
+            )
+
+            errors = [result for result in results if isinstance(result, Exception)]
+            if len(errors) == len(results):
+                raise errors[0]
+
+            sections = []
+            for (title, _), result in zip(RESEARCH_TOPICS, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"Research topic '{title}' failed for {ticker}: {str(result)}")
+                    sections.append(f"## {title}\n\n[Research unavailable: {str(result)}]")
+                else:
+                    sections.append(result)
+            temp_md = "\n\n".join(sections)
+            if not errors:
+                self._store_cached_response(cache_key, temp_md)
+
+            logger.info(f"✅ Research phase completed: {len(temp_md)} characters with real data")
+            return temp_md
+
+        except Exception as e:
+            logger.error(f"Research phase failed for {ticker}: {str(e)}")
+            return f"{_RESEARCH_FAILED_HEADING}{ticker}\n\nError: {str(e)}\n\nUnable to retrieve competitive data."
+
+    async def _research_topic(
+        self, ticker: str, title: str, focus: str, depth_config: Mapping[str, Any]
+    ) -> str:
+        """Research a single priority area with GPT-5 web search."""
+        research_prompt = _RESEARCH_PROMPT_TEMPLATE.format(
+            ticker=ticker, title=title, focus=focus, depth_name=depth_config["depth_name"]
+        )
+
+        # GPT-5-MINI with web search - using 200k TPM limit, run in a worker thread
+        # so the topic searches overlap
+        async with self._reserve_topic_tokens(depth_config["research_max_tokens"]):
+            return await asyncio.to_thread(
+                self.openai_client.respond_with_web_search,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an elite strategic analyst. Focus on investment-relevant strategic factors with proper sourcing.",
+                        "content": _RESEARCH_SYSTEM_PROMPT,
                     },
+                    {"role": "user", "content": research_prompt},
+                ],
+                reasoning_effort="low",  # Low reasoning effort
+                verbosity="medium",  # Medium verbosity
+                max_output_tokens=depth_config["research_max_tokens"],  # Per-topic cap by depth
+            )
+
+    @asynccontextmanager
+    async def _reserve_topic_tokens(self, tokens: int) -> AsyncIterator[None]:
+        """Hold a topic search's worst-case output tokens against the shared TPM budget."""
+        # Reason: a search always fits when nothing else is in flight, so an
+        # oversized reservation cannot deadlock the batch
+        async with self._topic_token_budget:
+            await self._topic_token_budget.wait_for(
+                lambda: self._topic_tokens_in_flight == 0
+                or self._topic_tokens_in_flight + tokens <= OPENAI_TPM_LIMIT
+            )
+            self._topic_tokens_in_flight += tokens
+        try:
+            yield
+        finally:
+            async with self._topic_token_budget:
+                self._topic_tokens_in_flight -= tokens
+                self._topic_token_budget.notify_all()
+
+    async def _run_analysis_phase(
+        self,
+        session_id: str,
+        ticker: str,
+        expertise_level: int,
+        temp_md: str,
+        valuation_context: dict[str, Any] | None = None,
+    ) -> str:
+        """Step 2: GPT-5 strategic analysis using temp_competition.md → strategic_analysis.md."""
+        try:
+            depth_config = self._get_expertise_depth_config(expertise_level)
+
+            # Format valuation context if available
+            valuation_summary = self.format_context_summary(
+                {"valuation": valuation_context}, default="No valuation context provided."
+            )
+
+            cache_key = self._response_cache_key(
+                "analysis", ticker, str(expertise_level), temp_md, valuation_summary
+            )
+            cached_md = self._get_cached_response(cache_key)
+            if cached_md is not None:
+                logger.info(f"Serving cached strategic analysis for {ticker}")
+                return cached_md
+
+            # Reason: the static framework, task and output format live in the system
+            # message so every ticker shares the same long prompt prefix for OpenAI caching
+            analysis_prompt = _ANALYSIS_PROMPT_TEMPLATE.format(
+                ticker=ticker,
+                temp_md=await self._compress_research(ticker, temp_md),
+                valuation_summary=valuation_summary,
+                depth_name=depth_config["depth_name"],
+            )
+
+            # GPT-5 for strategic analysis - focused output; the sync client runs in a
+            # worker thread so batched tickers overlap their Step 2 calls
+            strategic_md = await asyncio.to_thread(
+                self.openai_client.create_completion,
+                messages=[
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                     {"role": "user", "content": analysis_prompt},
                 ],
-                max_tokens=16000,  # 16k tokens as requested (increased from 12k)
+                max_tokens=depth_config["analysis_max_tokens"],  # Shorter reports need fewer tokens
                 use_complex_model=True,  # Use GPT-5 for complex analysis
+                prompt_cache_key=ANALYSIS_PROMPT_CACHE_KEYS[depth_config["depth_name"]],
+                reasoning_effort=depth_config["analysis_reasoning_effort"],
             )
 
+            self._store_cached_response(cache_key, strategic_md)
+
             logger.info(f"✅ Strategic analysis phase completed: {len(strategic_md)} characters")
             return strategic_md
 
@@ -331,137 +713,101 @@ Focus on investment-relevant strategic factors. Link analysis to long-term retur
             logger.error(f"Strategic analysis phase failed for {ticker}: {str(e)}")
             return f"# Strategic Analysis Failed for {ticker}\n\nError: {str(e)}\n\nUnable to complete strategic analysis."
 
-    def _get_strategic_framework(self) -> str:
-        """Get strategic analysis framework for GPT-5."""
-        return """
-# Strategic Analysis Framework (Porter's Five Forces + Moat Analysis)
-
-## 1. Competitive Moat Analysis
-**Four Types of Economic Moats:**
-
-### Network Effects
-- Value increases with more users/participants
-- Creates switching costs and barriers to entry
-- Examples: Payment networks, social platforms, marketplaces
-
-### Switching Costs
-- High costs (financial, operational, emotional) to change providers
-- Lock-in through integration, data, contracts, learning curves
-- Creates predictable revenue streams
-
-### Cost Advantages
-- Structural cost advantages competitors cannot easily replicate
-- Sources: Scale, location, process patents, preferential access
-- Enables pricing flexibility and margin expansion
-
-### Intangible Assets
-- Brands, patents, regulatory licenses, data assets
-- Create pricing power and barrier to competition
-- Must be defensible and economically valuable
-
-## 2. Porter's Five Forces Analysis
-
-### Threat of New Entrants
-- Barriers to entry (capital, regulation, network effects)
-- Economies of scale requirements
-- Brand loyalty and switching costs
-
-### Bargaining Power of Suppliers
-- Supplier concentration vs industry concentration
-- Availability of substitute inputs
-- Cost of switching suppliers
+    async def _compress_research(self, ticker: str, temp_md: str) -> str:
+        """
+        Condense long Step 1 research before it is embedded in the Step 2 prompt.
 
-### Bargaining Power of Customers
-- Customer concentration and size
-- Price sensitivity and switching costs
-- Availability of alternatives
+        A cheap simple-model pass shrinks the input of the expensive GPT-5 call.
+        Research under the threshold, or a failed compression, is passed through
+        unchanged; temp_competition.md always keeps the full research.
 
-### Threat of Substitutes
-- Substitute products/services performance
-- Relative price-performance of substitutes
-- Customer propensity to substitute
+        Args:
+            ticker: Stock ticker symbol
+            temp_md: Step 1 research markdown
 
-### Competitive Rivalry
-- Number and strength of competitors
-- Industry growth rate and capacity utilization
-- Differentiation vs commodity competition
+        Returns:
+            Research markdown to embed in the analysis prompt
+        """
+        research_chars = len(temp_md)
+        if research_chars <= RESEARCH_COMPRESSION_THRESHOLD_CHARS:
+            return temp_md
 
-## 3. Strategic Risk Assessment Matrix
-**Risk Categories:**
-- **Regulatory**: Policy changes, new regulations, enforcement
-- **Technology**: Disruption, obsolescence, innovation cycles
-- **Market**: Demand shifts, economic cycles, demographic changes
-- **Operational**: Key person risk, supply chain, operational execution
-- **Financial**: Capital requirements, debt capacity, cash flow volatility
+        try:
+            compressed_md = await asyncio.to_thread(
+                self.openai_client.create_completion,
+                messages=[
+                    {"role": "system", "content": _COMPRESSION_SYSTEM_PROMPT},
+                    {"role": "user", "content": temp_md},
+                ],
+                max_tokens=RESEARCH_COMPRESSION_MAX_OUTPUT_TOKENS,
+                use_complex_model=False,
+                reasoning_effort="minimal",
+            )
+        except Exception as e:
+            logger.warning(
+                f"Research compression failed for {ticker}, using full research: {str(e)}"
+            )
+            return temp_md
 
-## 4. Management Quality Evaluation
-**Assessment Criteria:**
-- **Track Record**: Historical strategic execution and results
-- **Capital Allocation**: ROI on investments, M&A success, shareholder returns
-- **Communication**: Transparency, consistency, stakeholder management
-- **Vision**: Strategic clarity, market understanding, adaptation capability
+        logger.info(
+            f"Compressed strategic research for {ticker}: "
+            f"{research_chars} → {len(compressed_md)} characters"
+        )
+        return compressed_md
+
+    def _response_cache_key(self, *parts: str) -> str:
+        """Build a response cache key from the request inputs and the prompt digest."""
+        payload = "|".join((*parts, STRATEGIC_PROMPT_HASH))
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _get_cached_response(self, cache_key: str) -> str | None:
+        """Return a cached model response, or None if missing or older than the TTL."""
+        entry = self._response_cache.get(cache_key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= self._response_cache_ttl:
+            del self._response_cache[cache_key]
+            return None
+        return entry[1]
+
+    def _store_cached_response(self, cache_key: str, response: str) -> None:
+        """Cache a successful model response with its creation time."""
+        self._response_cache[cache_key] = (time.time(), response)
 
-**Key Principle**: Focus on strategic factors that directly impact long-term cash flows and competitive positioning.
-Quantify qualitative factors where possible and link to investment implications.
-"""
+    def _get_strategic_framework(self) -> str:
+        """Get strategic analysis framework for GPT-5."""
+        return STRATEGIC_FRAMEWORK
 
-    def _get_expertise_depth_config(self, expertise_level: int) -> dict:
+    def _get_expertise_depth_config(self, expertise_level: int) -> Mapping[str, Any]:
         """Map expertise level to analysis depth configuration."""
-        depth_map = {
-            (1, 2): {
-                "depth_name": "Foundational",
-                "pages": "250-300",
-                "detail": "comprehensive with educational explanations",
-            },
-            (3, 4): {
-                "depth_name": "Educational",
-                "pages": "150-200",
-                "detail": "detailed with strategic context",
-            },
-            (5, 6): {
-                "depth_name": "Intermediate",
-                "pages": "80-100",
-                "detail": "focused strategic analysis",
-            },
-            (7, 8): {
-                "depth_name": "Advanced",
-                "pages": "50-60",
-                "detail": "executive-level strategic insights",
-            },
-            (9, 10): {
-                "depth_name": "Executive",
-                "pages": "10-20",
-                "detail": "strategic summary with key implications",
-            },
-        }
-
-        for level_range, config in depth_map.items():
-            if level_range[0] <= expertise_level <= level_range[1]:
-                return config
-
-        return {
-            "depth_name": "Intermediate",
-            "pages": "80-100",
-            "detail": "focused strategic analysis",
-        }
+        return _DEPTH_BY_LEVEL.get(expertise_level, _DEPTH_INTERMEDIATE)
 
     async def _write_research_files(
-        self, session_id: str, ticker: str, temp_md: str, strategic_md: str
+        self, session_id: str, ticker: str, temp_md: str, strategic_md: str | None = None
     ) -> list[str]:
-        """Write research files to database following Story 2.1 pattern."""
+        """
+        Write research files to database following Story 2.1 pattern.
+
+        Only temp_competition.md is written when strategic_md is None.
+        """
         try:
             research_dir = f"research_database/sessions/{session_id}/{ticker}/strategic"
-            files_created = []
-
-            # Write temp_competition.md (raw research with citations)
-            temp_path = f"{research_dir}/temp_competition.md"
-            await self._write_research_file(temp_path, temp_md)
-            files_created.append(temp_path)
 
-            # Write strategic_analysis.md (complete analysis)
-            strategic_path = f"{research_dir}/strategic_analysis.md"
-            await self._write_research_file(strategic_path, strategic_md)
-            files_created.append(strategic_path)
+            # Reason: create the shared directory once before the concurrent writes and
+            # remember it, so repeat writes skip the per-component stat chain
+            if research_dir not in self._created_dirs:
+                await asyncio.to_thread(os.makedirs, research_dir, exist_ok=True)
+                self._created_dirs.add(research_dir)
+
+            # temp_competition.md (raw research with citations) and
+            # strategic_analysis.md (complete analysis) are independent, so write both at once
+            files = {f"{research_dir}/temp_competition.md": temp_md}
+            if strategic_md is not None:
+                files[f"{research_dir}/strategic_analysis.md"] = strategic_md
+            await asyncio.gather(
+                *(self._write_research_file(path, content) for path, content in files.items())
+            )
+            files_created = list(files)
 
             logger.info(f"✅ Created {len(files_created)} strategic research files for {ticker}")
             return files_created
@@ -471,12 +817,12 @@ Quantify qualitative factors where possible and link to investment implications.
             return []
 
     async def _write_research_file(self, file_path: str, content: str) -> None:
-        """Write content to research database file."""
-
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        """Write content to research database file without blocking the event loop."""
+        await asyncio.to_thread(self._write_research_file_sync, file_path, content)
 
-        # Write content to file
+    @staticmethod
+    def _write_research_file_sync(file_path: str, content: str) -> None:
+        """Write content to research database file; the directory must already exist."""
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(content)
 
@@ -484,29 +830,28 @@ Quantify qualitative factors where possible and link to investment implications.
         self, ticker: str, execution_time: float, research_chars: int, strategic_chars: int
     ) -> str:
         """Create execution summary for agent result."""
-        return f"""
-Strategic Analysis Complete for {ticker}:
-
-✅ Step 1: Competitive research completed ({research_chars:,} characters with real data)
-✅ Step 2: Strategic analysis completed ({strategic_chars:,} characters)
-✅ Files: temp_competition.md (raw research) + strategic_analysis.md (complete analysis)
-✅ Framework: Porter's Five Forces + Economic Moat Analysis
-✅ Data: Real competitive data with citations (no generic insights)
-
-Analysis completed in {execution_time:.1f} seconds using GPT-5 with web search.
-Ready for next agent handoff with strategic context.
-"""
+        return _SUMMARY_TEMPLATE.format(
+            ticker=ticker,
+            execution_time=execution_time,
+            research_chars=research_chars,
+            strategic_chars=strategic_chars,
+        )
 
     def _create_error_result(
-        self, session_id: str, ticker: str, error_message: str, start_time: datetime
+        self,
+        session_id: str,
+        ticker: str,
+        error_message: str,
+        start_time: float,
+        research_files: list[str] | None = None,
     ) -> AgentResult:
-        """Create error result for failed analysis."""
-        execution_time = (datetime.now(UTC) - start_time).total_seconds()
+        """Create error result for failed analysis (start_time from time.perf_counter())."""
+        execution_time = time.perf_counter() - start_time
 
         return AgentResult(
             agent_name=self.agent_name,
             success=False,
-            research_files_created=[],
+            research_files_created=research_files or [],
             summary=f"Strategic analysis failed for {ticker}: {error_message}",
             error_message=error_message,
             token_usage=0,
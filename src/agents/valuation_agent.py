@@ -1,9 +1,20 @@
 """Clean Valuation Expert Agent using 2-Step GPT-5 Workflow."""
 
+import asyncio
+import functools
+import glob
+import hashlib
 import logging
 import os
-from datetime import UTC, datetime
-from typing import Any
+import re
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from types import MappingProxyType
+from typing import Any, Final
+
+import orjson
+
+from config.settings import get_settings
 
 from ..models.collaboration import AgentResult
 from ..utils.openai_client import OpenAIClient
@@ -11,139 +22,108 @@ from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Output token ceiling for the Step 1 web search, live or batched
+RESEARCH_MAX_OUTPUT_TOKENS = 32000
 
-class ValuationAgent(BaseAgent):
-    """Clean Valuation Expert Agent using 2-step GPT-5 workflow with real data."""
-
-    def __init__(self):
-        """Initialize ValuationAgent with GPT-5 client."""
-        super().__init__("valuation_agent")
-        self.openai_client = OpenAIClient()
-
-    async def conduct_research(
-        self,
-        session_id: str,
-        ticker: str,
-        expertise_level: int,
-        context: dict[str, Any] | None = None,
-    ) -> AgentResult:
-        """
-        Conduct Owner-Returns valuation analysis using clean 2-step workflow.
-
-        Args:
-            session_id: Unique session identifier
-            ticker: Stock ticker symbol
-            expertise_level: User expertise level (1-10)
-            context: Previous research context from other agents
-
-        Returns:
-            AgentResult with valuation research files created
-        """
-        start_time = datetime.now(UTC)
-        self.log_research_start(session_id, ticker, expertise_level)
-
-        try:
-            # Step 1: Research with GPT-5 web search → temp.md
-            logger.info(f"🔍 Step 1: Researching financial data for {ticker}")
-            temp_md = await self._run_research_phase(session_id, ticker, expertise_level)
-
-            # Step 2: Valuation analysis → valuation.md
-            logger.info(f"🧮 Step 2: Creating valuation analysis for {ticker}")
-            valuation_md = await self._run_valuation_phase(session_id, ticker, expertise_level, temp_md)
+# Step 1 research is cached here across sessions; it quotes a current price, so the
+# default TTL is one day
+RESEARCH_CACHE_DIR = "research_database/.cache/valuation"
 
-            # Write files to research database
-            files_created = await self._write_research_files(session_id, ticker, temp_md, valuation_md)
+# Owner-Returns framework shared by every Step 2 valuation
+OWNER_RETURNS_FORMULAS: Final[str] = """
+# Owner-Returns FCF/Share Framework (Buffett, Ackman, Terry Smith methodology)
 
-            # Create execution summary
-            execution_time = (datetime.now(UTC) - start_time).total_seconds()
-            summary = self._create_execution_summary(ticker, execution_time, len(temp_md), len(valuation_md))
+## Core IRR Decomposition Formula:
+**Total IRR = Starting Yield + FCF Growth + Multiple Reversion - Dilution ± Leverage**
 
-            logger.info(f"✅ Owner-Returns analysis completed for {ticker} in {execution_time:.1f}s")
+### 1. Starting Yield
+```
+Starting Yield = Current FCF per Share / Current Stock Price
+```
+This provides immediate cash return and margin of safety anchor.
 
-            return AgentResult(
-                agent_name=self.agent_name,
-                success=True,
-                research_files_created=files_created,
-                summary=summary,
-                error_message=None,
-                token_usage=0,  # GPT-5 handles token tracking
-                execution_time_seconds=execution_time,
-                confidence_score=0.8,  # High confidence with real data
-            )
+### 2. FCF Growth Component
+```  
+FCF Growth = (Terminal FCF per Share / Current FCF per Share)^(1/10) - 1
+```
+Conservative approach: Model 10-year growth with fade to industry median ROIC.
 
-        except Exception as e:
-            logger.error(f"❌ Valuation analysis failed for {ticker}: {str(e)}")
-            return self._create_error_result(session_id, ticker, str(e), start_time)
+### 3. Multiple Reversion
+```
+Multiple Reversion = (Terminal Multiple / Current Multiple)^(1/10) - 1
+Current Multiple = Current Price / Current FCF per Share
+Terminal Multiple = Conservative estimate (10-15× FCF for quality businesses)
+```
 
-    async def _run_research_phase(self, session_id: str, ticker: str, expertise_level: int) -> str:
-        """Step 1: GPT-5 web search for real financial data → temp.md."""
-        try:
-            depth_config = self._get_expertise_depth_config(expertise_level)
-            
-            research_prompt = f"""
-You are an equity research assistant. Using web search for {ticker}:
+### 4. Dilution Impact
+```
+Annual Dilution Rate = (New Shares - Buybacks) / Total Shares Outstanding
+Dilution Drag = -Annual Dilution Rate (negative if net buybacks)
+```
 
-## PRIORITY DATA TO EXTRACT:
-1. **Most recent 10-K/annual** and **latest quarterly report**
-2. **Financial metrics**: Revenue, CFO, CapEx, FCF, shares outstanding (diluted)
-3. **Current stock price** with date/time of quote  
-4. **Share changes**: Buybacks, dilution percentage, net share change
-5. **Balance sheet**: Net debt/cash, total debt, cash position
-6. **Management guidance** if available in recent calls
+## Price Ladder Calculations:
 
-## DATA SOURCES TO PREFER:
-- sec.gov filings (10-K, 10-Q, 8-K)
-- Company investor relations pages
-- Exchange data (NYSE, NASDAQ)
-- Recent earnings call transcripts
+### Buffett Floor (Quality Business Threshold)
+```
+Buffett Floor ≈ Pre-tax Earnings per Share × 10
+(Use FCF × 1.2 as pre-tax earnings approximation if needed)
+```
 
-## OUTPUT FORMAT:
-Return concise **markdown** with:
-- Bullet lists for each metric with actual numbers
-- **Inline citations** after each figure: [Source: document name, date]
-- If multiple sources show different figures, explain discrepancy
-- Focus on FCF/share data and trends (last 3-5 years)
+### IRR-Based Target Prices
+```
+10% IRR Price = Current FCF per Share / 0.10
+15% IRR Price = Current FCF per Share / 0.15
+```
 
-Analysis depth: {depth_config['depth_name']} level
+## Conservative Stress Testing Framework:
+- Reduce FCF growth by 200-300 basis points
+- Reduce terminal multiple by 2-4 turns
+- Increase dilution by 50 basis points
+- Model combined adverse scenarios
 
-CRITICAL: Use real web search. Get actual current financial data with proper citations.
-No estimates or placeholders - only real data with sources.
+**Key Principle**: Focus on FCF/share (not revenue or earnings) to avoid accounting manipulation.
+Show all calculations explicitly with actual numbers from research data.
 """
 
-            # GPT-5-MINI with web search - using 200k TPM limit for lots of data
-            temp_md = self.openai_client.respond_with_web_search(
-                messages=[
-                    {"role": "system", "content": "You are a financial data researcher. Search for primary source financial data with proper citations."},
-                    {"role": "user", "content": research_prompt}
-                ],
-                reasoning_effort="low",  # Low reasoning effort
-                verbosity="medium",  # Medium verbosity
-                max_output_tokens=32000  # 32k context for comprehensive data
-            )
-
-            logger.info(f"✅ Research phase completed: {len(temp_md)} characters with real data")
-            return temp_md
-
-        except Exception as e:
-            logger.error(f"Research phase failed for {ticker}: {str(e)}")
-            return f"# Research Failed for {ticker}\n\nError: {str(e)}\n\nUnable to retrieve financial data."
-
-    async def _run_valuation_phase(self, session_id: str, ticker: str, expertise_level: int, temp_md: str) -> str:
-        """Step 2: GPT-5 valuation analysis using temp.md → valuation.md."""
-        try:
-            owner_returns_formulas = self._get_owner_returns_formulas()
-            depth_config = self._get_expertise_depth_config(expertise_level)
-
-            valuation_prompt = f"""
-Use the research data below to compute Owner-Returns valuation for {ticker}.
-
-## OWNER-RETURNS METHODOLOGY:
-{owner_returns_formulas}
-
-## RESEARCH DATA:
-{temp_md}
-
-## YOUR TASK - Create complete valuation analysis:
+# Report depth configurations, shared read-only across requests
+_DEPTH_FOUNDATIONAL: Final[Mapping[str, str]] = MappingProxyType(
+    {"depth_name": "Foundational", "pages": "250-300", "detail": "comprehensive"}
+)
+_DEPTH_EDUCATIONAL: Final[Mapping[str, str]] = MappingProxyType(
+    {"depth_name": "Educational", "pages": "150-200", "detail": "detailed"}
+)
+_DEPTH_INTERMEDIATE: Final[Mapping[str, str]] = MappingProxyType(
+    {"depth_name": "Intermediate", "pages": "80-100", "detail": "focused"}
+)
+_DEPTH_ADVANCED: Final[Mapping[str, str]] = MappingProxyType(
+    {"depth_name": "Advanced", "pages": "50-60", "detail": "executive"}
+)
+_DEPTH_EXECUTIVE: Final[Mapping[str, str]] = MappingProxyType(
+    {"depth_name": "Executive", "pages": "10-20", "detail": "summary"}
+)
+
+# Indexed directly by expertise level (1-10); index 0 is unused
+_DEPTH_BY_LEVEL = (
+    (_DEPTH_INTERMEDIATE,)
+    + (_DEPTH_FOUNDATIONAL,) * 2
+    + (_DEPTH_EDUCATIONAL,) * 2
+    + (_DEPTH_INTERMEDIATE,) * 2
+    + (_DEPTH_ADVANCED,) * 2
+    + (_DEPTH_EXECUTIVE,) * 2
+)
+
+_CITATION_RE = re.compile(r"\[Source: ([^\]]+)\]")
+
+# Output token ceiling for one Step 2 valuation report
+VALUATION_MAX_OUTPUT_TOKENS = 16000
+
+# Most tickers valued in one Step 2 call; larger prompt batches start to hurt accuracy
+VALUATION_PROMPT_BATCH_SIZE = 4
+
+_VALUATION_SYSTEM_PROMPT = "You are an elite valuation expert. Be conservative, show all math step-by-step, cite sources from research."
+
+# Step 2 calculation steps and report layout; formatted with ticker
+_VALUATION_TASK_TEMPLATE = """## YOUR TASK - Create complete valuation analysis:
 
 **Calculate step-by-step:**
 1. **Current FCF Yield**: FCF_per_share / Current_Price
@@ -211,116 +191,809 @@ For current price to be justified:
 ## Data Sources & Citations
 [List all sources from research data]
 ```
+"""
+
+_RESEARCH_SYSTEM_PROMPT = "You are a financial data researcher. Search for primary source financial data with proper citations."
+
+# Step 1 web search prompt, formatted with ticker and depth_name
+_RESEARCH_PROMPT_TEMPLATE: Final[str] = """
+You are an equity research assistant. Using web search for {ticker}:
+
+## PRIORITY DATA TO EXTRACT:
+1. **Most recent 10-K/annual** and **latest quarterly report**
+2. **Financial metrics**: Revenue, CFO, CapEx, FCF, shares outstanding (diluted)
+3. **Current stock price** with date/time of quote  
+4. **Share changes**: Buybacks, dilution percentage, net share change
+5. **Balance sheet**: Net debt/cash, total debt, cash position
+6. **Management guidance** if available in recent calls
+
+## DATA SOURCES TO PREFER:
+- sec.gov filings (10-K, 10-Q, 8-K)
+- Company investor relations pages
+- Exchange data (NYSE, NASDAQ)
+- Recent earnings call transcripts
+
+## OUTPUT FORMAT:
+Return JSON matching the research_payload schema:
+- Actual numbers only; use null when a figure cannot be found
+- Money amounts and share counts in millions; per-share figures and price in currency units
+- fcf_per_share_history: FCF/share for the last 3-5 fiscal years, oldest first
+- One citation per figure: the field it supports, the document name and its date
+- If multiple sources show different figures, explain the discrepancy in notes
+
+Analysis depth: {depth_name} level
+
+CRITICAL: Use real web search. Get actual current financial data with proper citations.
+No estimates or placeholders - only real data with sources.
+"""
 
-Report complexity: {depth_config['depth_name']} level
+_NULLABLE_NUMBER = {"type": ["number", "null"]}
+
+# Structured Step 1 output; only the figures Step 2 needs, each with a citation
+RESEARCH_SCHEMA: Final[dict[str, Any]] = {
+    "type": "object",
+    "properties": {
+        "currency": {"type": "string"},
+        "price": _NULLABLE_NUMBER,
+        "price_date": {"type": "string"},
+        "fcf_per_share": _NULLABLE_NUMBER,
+        "fcf_per_share_history": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"period": {"type": "string"}, "value": {"type": "number"}},
+                "required": ["period", "value"],
+                "additionalProperties": False,
+            },
+        },
+        "shares_out": _NULLABLE_NUMBER,
+        "net_share_change_pct": _NULLABLE_NUMBER,
+        "net_debt": _NULLABLE_NUMBER,
+        "growth_guidance": {"type": "string"},
+        "citations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "figure": {"type": "string"},
+                    "source": {"type": "string"},
+                    "date": {"type": "string"},
+                },
+                "required": ["figure", "source", "date"],
+                "additionalProperties": False,
+            },
+        },
+        "notes": {"type": "string"},
+    },
+    "required": [
+        "currency",
+        "price",
+        "price_date",
+        "fcf_per_share",
+        "fcf_per_share_history",
+        "shares_out",
+        "net_share_change_pct",
+        "net_debt",
+        "growth_guidance",
+        "citations",
+        "notes",
+    ],
+    "additionalProperties": False,
+}
+
+_RESEARCH_TEXT_FORMAT: Final[dict[str, Any]] = {
+    "type": "json_schema",
+    "name": "research_payload",
+    "schema": RESEARCH_SCHEMA,
+    "strict": True,
+}
+
+# Step 2 prompt, formatted with ticker, temp_md, task and depth_name. The formulas
+# are static, so they are joined in once here rather than on every call.
+_VALUATION_PROMPT_TEMPLATE: Final[str] = (
+    """
+Use the research data below to compute Owner-Returns valuation for {ticker}.
+
+## OWNER-RETURNS METHODOLOGY:
+"""
+    + OWNER_RETURNS_FORMULAS
+    + """
+
+## RESEARCH DATA:
+{temp_md}
+
+{task}
+Report complexity: {depth_name} level
 Be conservative with assumptions. Show all calculations step-by-step with the actual numbers from research.
 """
+)
 
-            # GPT-5 for calculations and analysis - focused output
-            valuation_md = self.openai_client.create_completion(
-                messages=[
-                    {"role": "system", "content": "You are an elite valuation expert. Be conservative, show all math step-by-step, cite sources from research."},
-                    {"role": "user", "content": valuation_prompt}
-                ],
-                max_tokens=16000,  # 16k tokens as requested
-                use_complex_model=True  # Use GPT-5 for complex analysis
-            )
+# Grouped Step 2 prompt, formatted with tickers, depth_name and research_blocks
+_BATCHED_VALUATION_PROMPT_TEMPLATE: Final[str] = (
+    """
+Use the research data below to compute Owner-Returns valuation for each ticker: {tickers}.
 
-            logger.info(f"✅ Valuation phase completed: {len(valuation_md)} characters")
-            return valuation_md
+## OWNER-RETURNS METHODOLOGY:
+"""
+    + OWNER_RETURNS_FORMULAS
+    + "\n"
+    + _VALUATION_TASK_TEMPLATE.format(ticker="[TICKER]")
+    + """
+Write one complete, independent report per ticker, replacing [TICKER] with its symbol.
+Use only that ticker's research data for its report.
+Report complexity: {depth_name} level
+Be conservative with assumptions. Show all calculations step-by-step with the actual numbers from research.
+
+{research_blocks}
+"""
+)
+
+
+class ValuationAgent(BaseAgent):
+    """Clean Valuation Expert Agent using 2-step GPT-5 workflow with real data."""
+
+    def __init__(self, write_async: bool = False):
+        """
+        Initialize ValuationAgent with GPT-5 client.
+
+        Args:
+            write_async: Persist research files in a background task instead of
+                before returning. Callers that opt in must await
+                wait_for_pending_writes() to be sure the files are on disk.
+        """
+        super().__init__("valuation_agent")
+        self.openai_client = OpenAIClient()
+        self._research_cache_ttl = get_settings().valuation_research_cache_ttl_seconds
+        self._write_async = write_async
+        self._pending_writes: set[asyncio.Task] = set()
+        # Background write failures per session, reported by wait_for_pending_writes
+        self._failed_writes: dict[str, list[str]] = {}
+        # Identical Step 1/Step 2 requests in flight, shared by concurrent callers
+        self._inflight: dict[tuple[Any, ...], asyncio.Future[str]] = {}
+
+    async def conduct_research(
+        self,
+        session_id: str,
+        ticker: str,
+        expertise_level: int,
+        context: dict[str, Any] | None = None,
+    ) -> AgentResult:
+        """
+        Conduct Owner-Returns valuation analysis using clean 2-step workflow.
+
+        Args:
+            session_id: Unique session identifier
+            ticker: Stock ticker symbol
+            expertise_level: User expertise level (1-10)
+            context: Previous research context from other agents
+
+        Returns:
+            AgentResult with valuation research files created
+        """
+        start_time = time.perf_counter()
+        self.log_research_start(session_id, ticker, expertise_level)
+
+        try:
+            # Step 1: Research with GPT-5 web search → temp.md
+            logger.info(f"🔍 Step 1: Researching financial data for {ticker}")
+            research = await self._run_research_phase(session_id, ticker, expertise_level)
+
+            return await self._complete_research(
+                session_id, ticker, expertise_level, research, start_time
+            )
 
         except Exception as e:
-            logger.error(f"Valuation phase failed for {ticker}: {str(e)}")
-            return f"# Valuation Analysis Failed for {ticker}\n\nError: {str(e)}\n\nUnable to complete valuation."
+            logger.error(f"❌ Valuation analysis failed for {ticker}: {str(e)}")
+            return self._create_error_result(session_id, ticker, str(e), start_time)
 
-    def _get_owner_returns_formulas(self) -> str:
-        """Get Owner-Returns calculation formulas for GPT-5."""
-        return """
-# Owner-Returns FCF/Share Framework (Buffett, Ackman, Terry Smith methodology)
+    async def _complete_research(
+        self,
+        session_id: str,
+        ticker: str,
+        expertise_level: int,
+        research: str,
+        start_time: float,
+        valuation_md: str | None = None,
+    ) -> AgentResult:
+        """
+        Run Step 2 on finished Step 1 research, write the files and build the result.
 
-## Core IRR Decomposition Formula:
-**Total IRR = Starting Yield + FCF Growth + Multiple Reversion - Dilution ± Leverage**
+        research is the raw Step 1 output. A structured payload is rendered into
+        temp.md for Step 2 and also kept verbatim as temp.json for audit. Step 2 is
+        skipped when valuation_md was already produced by a batched call.
+        start_time comes from time.perf_counter().
+        """
+        temp_md = self._render_research(research)
+        research_json = research if self._parse_research_payload(research) is not None else None
 
-### 1. Starting Yield
-```
-Starting Yield = Current FCF per Share / Current Stock Price
-```
-This provides immediate cash return and margin of safety anchor.
+        if valuation_md is None:
+            # Step 2: Valuation analysis → valuation.md
+            logger.info(f"🧮 Step 2: Creating valuation analysis for {ticker}")
+            valuation_md = await self._run_valuation_phase(session_id, ticker, expertise_level, temp_md)
 
-### 2. FCF Growth Component
-```  
-FCF Growth = (Terminal FCF per Share / Current FCF per Share)^(1/10) - 1
-```
-Conservative approach: Model 10-year growth with fade to industry median ROIC.
+        # Write files to research database
+        if self._write_async:
+            # Reason: Step 2 already has temp_md in memory, so disk I/O can trail the result
+            write_task = asyncio.create_task(
+                self._write_research_files(
+                    session_id, ticker, temp_md, valuation_md, research_json
+                )
+            )
+            files_created = self._research_file_paths(
+                session_id, ticker, structured=research_json is not None
+            )
+            self._pending_writes.add(write_task)
+            write_task.add_done_callback(
+                functools.partial(self._finish_background_write, session_id, files_created)
+            )
+        else:
+            files_created = await self._write_research_files(
+                session_id, ticker, temp_md, valuation_md, research_json
+            )
+            if not files_created:
+                return self._create_error_result(
+                    session_id, ticker, "Failed to write research files", start_time
+                )
 
-### 3. Multiple Reversion
-```
-Multiple Reversion = (Terminal Multiple / Current Multiple)^(1/10) - 1
-Current Multiple = Current Price / Current FCF per Share
-Terminal Multiple = Conservative estimate (10-15× FCF for quality businesses)
-```
+        # Create execution summary
+        execution_time = time.perf_counter() - start_time
+        summary = self._create_execution_summary(ticker, execution_time, len(temp_md), len(valuation_md))
 
-### 4. Dilution Impact
-```
-Annual Dilution Rate = (New Shares - Buybacks) / Total Shares Outstanding
-Dilution Drag = -Annual Dilution Rate (negative if net buybacks)
-```
+        logger.info(f"✅ Owner-Returns analysis completed for {ticker} in {execution_time:.1f}s")
 
-## Price Ladder Calculations:
+        return AgentResult(
+            agent_name=self.agent_name,
+            success=True,
+            research_files_created=files_created,
+            summary=summary,
+            error_message=None,
+            token_usage=0,  # GPT-5 handles token tracking
+            execution_time_seconds=execution_time,
+            confidence_score=0.8,  # High confidence with real data
+        )
 
-### Buffett Floor (Quality Business Threshold)
-```
-Buffett Floor ≈ Pre-tax Earnings per Share × 10
-(Use FCF × 1.2 as pre-tax earnings approximation if needed)
-```
+    async def conduct_research_batch(
+        self,
+        session_id: str,
+        tickers: list[str],
+        expertise_level: int,
+        context: dict[str, Any] | None = None,
+        max_concurrency: int = 8,
+    ) -> dict[str, AgentResult]:
+        """
+        Conduct Owner-Returns valuation for several tickers concurrently.
 
-### IRR-Based Target Prices
-```
-10% IRR Price = Current FCF per Share / 0.10
-15% IRR Price = Current FCF per Share / 0.15
-```
+        Duplicate tickers are analysed once and at most max_concurrency tickers
+        run at a time to stay within OpenAI rate limits. A ticker whose run raises
+        gets an error result instead of failing the batch.
 
-## Conservative Stress Testing Framework:
-- Reduce FCF growth by 200-300 basis points
-- Reduce terminal multiple by 2-4 turns
-- Increase dilution by 50 basis points
-- Model combined adverse scenarios
+        Args:
+            session_id: Unique session identifier
+            tickers: Stock ticker symbols to analyse
+            expertise_level: User expertise level (1-10)
+            context: Previous research context shared by all tickers
+            max_concurrency: Maximum tickers in flight
 
-**Key Principle**: Focus on FCF/share (not revenue or earnings) to avoid accounting manipulation.
-Show all calculations explicitly with actual numbers from research data.
-"""
+        Returns:
+            Mapping of ticker to its AgentResult
+        """
+        unique_tickers = list(dict.fromkeys(tickers))
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-    def _get_expertise_depth_config(self, expertise_level: int) -> dict:
-        """Map expertise level to analysis depth configuration."""
-        depth_map = {
-            (1, 2): {"depth_name": "Foundational", "pages": "250-300", "detail": "comprehensive"},
-            (3, 4): {"depth_name": "Educational", "pages": "150-200", "detail": "detailed"},
-            (5, 6): {"depth_name": "Intermediate", "pages": "80-100", "detail": "focused"},
-            (7, 8): {"depth_name": "Advanced", "pages": "50-60", "detail": "executive"},
-            (9, 10): {"depth_name": "Executive", "pages": "10-20", "detail": "summary"}
+        async def research(ticker: str) -> AgentResult:
+            async with semaphore:
+                return await self.conduct_research(session_id, ticker, expertise_level, context)
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(
+            *(research(ticker) for ticker in unique_tickers), return_exceptions=True
+        )
+        batch_results = {
+            ticker: (
+                self._create_error_result(session_id, ticker, str(result), start_time)
+                if isinstance(result, Exception)
+                else result
+            )
+            for ticker, result in zip(unique_tickers, results, strict=True)
         }
 
-        for level_range, config in depth_map.items():
-            if level_range[0] <= expertise_level <= level_range[1]:
-                return config
+        succeeded = sum(result.success for result in batch_results.values())
+        logger.info(
+            f"Valuation batch completed: {succeeded}/{len(batch_results)} tickers succeeded"
+        )
+        return batch_results
 
-        return {"depth_name": "Intermediate", "pages": "80-100", "detail": "focused"}
+    async def submit_batch(self, session_id: str, tickers: list[str], expertise_level: int) -> str:
+        """
+        Submit Step 1 research for several tickers as one OpenAI Batch API job.
 
-    async def _write_research_files(self, session_id: str, ticker: str, temp_md: str, valuation_md: str) -> list[str]:
-        """Write research files to database following Story 2.1 pattern."""
+        Batch jobs cost about half as much as live requests, which suits non-urgent
+        runs such as overnight watchlist scans. The batch is recorded per session, so
+        resubmitting the same tickers and level while it is pending returns the
+        existing batch instead of paying for a duplicate one.
+
+        Args:
+            session_id: Unique session identifier
+            tickers: Stock ticker symbols to research
+            expertise_level: User expertise level (1-10)
+
+        Returns:
+            ID of the submitted (or still pending, identical) batch
+
+        Raises:
+            RuntimeError: If the session has a pending batch for other tickers or level
+        """
+        unique_tickers = list(dict.fromkeys(tickers))
+        record_path = self._batch_record_path(session_id)
+        record = await asyncio.to_thread(self._read_batch_record, record_path)
+        if record is not None and not record.get("completed"):
+            if record["tickers"] != unique_tickers or record["expertise_level"] != expertise_level:
+                raise RuntimeError(
+                    f"Session {session_id} already has pending valuation batch "
+                    f"{record['batch_id']} for other tickers or expertise level"
+                )
+            logger.info(f"Reusing valuation batch {record['batch_id']} for session {session_id}")
+            return record["batch_id"]
+
+        requests = [
+            (
+                f"{session_id}:{ticker}:research",
+                self.openai_client.build_web_search_request(
+                    messages=self._build_research_messages(ticker, expertise_level),
+                    reasoning_effort="low",
+                    verbosity="medium",
+                    max_output_tokens=RESEARCH_MAX_OUTPUT_TOKENS,
+                    text_format=_RESEARCH_TEXT_FORMAT,
+                ),
+            )
+            for ticker in unique_tickers
+        ]
+        batch_id = await asyncio.to_thread(self.openai_client.submit_batch, requests)
+
+        record = {"batch_id": batch_id, "tickers": unique_tickers, "expertise_level": expertise_level}
+        await self._write_research_file(record_path, orjson.dumps(record).decode())
+        return batch_id
+
+    async def poll_batch(
+        self,
+        session_id: str,
+        batch_id: str,
+        poll_interval: float = 30.0,
+        max_poll_interval: float = 600.0,
+        max_concurrency: int = 8,
+        max_wait_seconds: float = 86400.0,
+    ) -> dict[str, AgentResult]:
+        """
+        Wait for a research batch, then run Step 2 for every ticker in it.
+
+        Polling backs off exponentially from poll_interval up to max_poll_interval
+        and gives up after max_wait_seconds, leaving the record pending so the
+        caller can poll again or fall back to conduct_research.
+        Tickers and expertise level come from the session's batch record, which is
+        marked completed once the results are built. Tickers whose research request
+        failed inside the batch get an error result.
+
+        Args:
+            session_id: Session the batch was submitted for
+            batch_id: ID returned by submit_batch
+            poll_interval: Initial delay between status checks in seconds
+            max_poll_interval: Upper bound for the delay between status checks
+            max_concurrency: Maximum Step 2 valuations in flight
+            max_wait_seconds: Deadline for the batch output (default: the 24h
+                completion window)
+
+        Returns:
+            Mapping of ticker to its AgentResult
+
+        Raises:
+            ValueError: If batch_id is not the batch recorded for the session
+            TimeoutError: If the batch output is not ready within max_wait_seconds
+        """
+        record_path = self._batch_record_path(session_id)
+        record = await asyncio.to_thread(self._read_batch_record, record_path)
+        if record is None or record["batch_id"] != batch_id:
+            raise ValueError(f"No valuation batch {batch_id} recorded for session {session_id}")
+        tickers = record["tickers"]
+        expertise_level = record["expertise_level"]
+
+        delay = poll_interval
+        deadline = time.monotonic() + max_wait_seconds
+        while True:
+            outputs = await asyncio.to_thread(self.openai_client.retrieve_batch_output, batch_id)
+            if outputs is not None:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Valuation batch {batch_id} not completed after {max_wait_seconds:.0f}s"
+                )
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_poll_interval)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        start_time = time.perf_counter()
+        research = {
+            ticker: outputs[f"{session_id}:{ticker}:research"]
+            for ticker in tickers
+            if outputs.get(f"{session_id}:{ticker}:research")
+        }
+
+        # All research arrives together, so Step 2 shares one prompt across small groups
+        async def value_group(group: list[str]) -> dict[str, str]:
+            async with semaphore:
+                return await self._run_valuation_phase_batched(
+                    session_id,
+                    group,
+                    expertise_level,
+                    [self._render_research(research[ticker]) for ticker in group],
+                )
+
+        ready = list(research)
+        valuations: dict[str, str] = {}
+        for group_reports in await asyncio.gather(
+            *(
+                value_group(ready[i : i + VALUATION_PROMPT_BATCH_SIZE])
+                for i in range(0, len(ready), VALUATION_PROMPT_BATCH_SIZE)
+            )
+        ):
+            valuations.update(group_reports)
+
+        async def complete(ticker: str) -> AgentResult:
+            if ticker not in research:
+                return self._create_error_result(
+                    session_id, ticker, "No research output in batch", start_time
+                )
+            return await self._complete_research(
+                session_id,
+                ticker,
+                expertise_level,
+                research[ticker],
+                start_time,
+                valuation_md=valuations[ticker],
+            )
+
+        results = await asyncio.gather(
+            *(complete(ticker) for ticker in tickers), return_exceptions=True
+        )
+
+        # Reason: a consumed batch must not be reused by the next submit for this session
+        await self._write_research_file(
+            record_path, orjson.dumps({**record, "completed": True}).decode()
+        )
+        return {
+            ticker: (
+                self._create_error_result(session_id, ticker, str(result), start_time)
+                if isinstance(result, Exception)
+                else result
+            )
+            for ticker, result in zip(tickers, results, strict=True)
+        }
+
+    @staticmethod
+    def _batch_record_path(session_id: str) -> str:
+        """Get the file that records a session's submitted valuation batch."""
+        return f"research_database/sessions/{session_id}/valuation_batch.json"
+
+    @staticmethod
+    def _read_batch_record(record_path: str) -> dict[str, Any] | None:
+        """Read a persisted batch record, or None if the session has none."""
+        try:
+            with open(record_path, "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+    async def _run_research_phase(self, session_id: str, ticker: str, expertise_level: int) -> str:
+        """
+        Step 1: GPT-5 web search for real financial data.
+
+        Returns the raw output, normally a research_payload JSON document; pass it
+        through _render_research to get the temp.md view Step 2 reads.
+        """
+        try:
+            messages = self._build_research_messages(ticker, expertise_level)
+            cache_path = self._research_cache_path(ticker, messages)
+            cached_md = await asyncio.to_thread(self._load_cached_research, cache_path)
+            if cached_md is not None:
+                logger.info(f"Serving cached valuation research for {ticker}")
+                return cached_md
+
+            research = await self._coalesce(
+                ("research", ticker, expertise_level),
+                lambda: self._fetch_research(messages, cache_path),
+            )
+
+            logger.info(f"✅ Research phase completed: {len(research)} characters with real data")
+            return research
+
+        except Exception as e:
+            logger.error(f"Research phase failed for {ticker}: {str(e)}")
+            return f"# Research Failed for {ticker}\n\nError: {str(e)}\n\nUnable to retrieve financial data."
+
+    @staticmethod
+    def _parse_research_payload(research: str) -> dict[str, Any] | None:
+        """Decode a structured Step 1 payload, or None if research is not one."""
+        try:
+            payload = orjson.loads(research)
+        except orjson.JSONDecodeError:
+            return None
+        return payload if isinstance(payload, dict) and "citations" in payload else None
+
+    @classmethod
+    def _render_research(cls, research: str) -> str:
+        """
+        Render a structured Step 1 payload as the compact temp.md Step 2 reads.
+
+        Figures become a YAML block and citations keep the [Source: ...] form used
+        in reports. Output that is not a research payload (e.g. prose from a model
+        that ignored the schema) is returned unchanged.
+        """
+        payload = cls._parse_research_payload(research)
+        if payload is None:
+            return research
+
+        def scalar(value: Any) -> str:
+            # Reason: JSON scalars are valid YAML, and quoting keeps colons/newlines safe
+            return orjson.dumps(value).decode()
+
+        lines = ["```yaml"]
+        for key in RESEARCH_SCHEMA["properties"]:
+            if key in ("fcf_per_share_history", "citations") or key not in payload:
+                continue
+            lines.append(f"{key}: {scalar(payload[key])}")
+            if key == "fcf_per_share":
+                lines.append("fcf_per_share_history:")
+                lines.extend(
+                    f"  {scalar(item.get('period'))}: {scalar(item.get('value'))}"
+                    for item in payload.get("fcf_per_share_history") or []
+                )
+        lines.extend(("```", "", "Sources:"))
+        lines.extend(
+            f"- {citation.get('figure')}: [Source: {citation.get('source')}, {citation.get('date')}]"
+            for citation in payload["citations"]
+        )
+        return "\n".join(lines) + "\n"
+
+    async def _fetch_research(self, messages: list[dict[str, str]], cache_path: str) -> str:
+        """Run the Step 1 web search and store the result in the research cache."""
+        # GPT-5-MINI with web search - using 200k TPM limit for lots of data; the sync
+        # client runs in a worker thread so concurrent tickers overlap their requests
+        temp_md = await asyncio.to_thread(
+            self.openai_client.respond_with_web_search,
+            messages=messages,
+            reasoning_effort="low",  # Low reasoning effort
+            verbosity="medium",  # Medium verbosity
+            max_output_tokens=RESEARCH_MAX_OUTPUT_TOKENS,  # 32k context for comprehensive data
+            text_format=_RESEARCH_TEXT_FORMAT,
+        )
+        if temp_md:
+            await asyncio.to_thread(self._store_cached_research, cache_path, temp_md)
+        return temp_md
+
+    async def _coalesce(
+        self, key: tuple[Any, ...], fetch: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Share one in-flight request between concurrent callers with the same key.
+
+        Args:
+            key: Identifies the request, e.g. ("research", ticker, expertise_level)
+            fetch: Starts the request; only called when none is in flight for key
+
+        Returns:
+            The request's result, or raises its exception, for every caller
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Reason: one caller being cancelled must not cancel the request for the others
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def _research_cache_path(ticker: str, messages: list[dict[str, str]]) -> str:
+        """
+        Get the cache file for a ticker's Step 1 research.
+
+        Reason: keying on a digest of the exact messages sent means a different depth
+        or any prompt edit misses the cache without a manual version bump.
+        """
+        digest = hashlib.blake2b(orjson.dumps(messages), digest_size=8).hexdigest()
+        return os.path.join(RESEARCH_CACHE_DIR, f"{ticker.upper()}_{digest}.md")
+
+    def _load_cached_research(self, cache_path: str) -> str | None:
+        """Read cached research, or None if missing, unreadable or older than the TTL."""
         try:
-            research_dir = f"research_database/sessions/{session_id}/{ticker}/valuation"
-            files_created = []
+            if time.time() - os.path.getmtime(cache_path) >= self._research_cache_ttl:
+                return None
+            with open(cache_path, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _store_cached_research(cache_path: str, temp_md: str) -> None:
+        """Atomically write research to the cache; failures only log a warning."""
+        tmp_file = f"{cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(temp_md)
+            os.replace(tmp_file, cache_path)
+        except Exception as e:
+            # Reason: caching is best-effort, a failed write must not fail the research
+            logger.warning(f"Failed to cache valuation research at {cache_path}: {str(e)}")
 
-            # Write temp.md (raw research with citations)
-            temp_path = f"{research_dir}/temp.md"
-            await self._write_research_file(temp_path, temp_md)
-            files_created.append(temp_path)
+    @staticmethod
+    def cache_clear() -> int:
+        """
+        Delete all cached valuation research.
 
-            # Write valuation.md (complete analysis)
-            val_path = f"{research_dir}/valuation.md"
-            await self._write_research_file(val_path, valuation_md)
-            files_created.append(val_path)
+        Returns:
+            Number of cache files removed
+        """
+        removed = 0
+        for cache_path in glob.glob(os.path.join(RESEARCH_CACHE_DIR, "*.md")):
+            try:
+                os.remove(cache_path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _build_research_messages(self, ticker: str, expertise_level: int) -> list[dict[str, str]]:
+        """Build the Step 1 web search messages for a ticker."""
+        depth_config = self._get_expertise_depth_config(expertise_level)
+
+        research_prompt = _RESEARCH_PROMPT_TEMPLATE.format(
+            ticker=ticker, depth_name=depth_config["depth_name"]
+        )
+
+        return [
+            {"role": "system", "content": _RESEARCH_SYSTEM_PROMPT},
+            {"role": "user", "content": research_prompt}
+        ]
+
+    async def _run_valuation_phase(self, session_id: str, ticker: str, expertise_level: int, temp_md: str) -> str:
+        """Step 2: GPT-5 valuation analysis using temp.md → valuation.md."""
+        try:
+            depth_config = self._get_expertise_depth_config(expertise_level)
+            valuation_prompt = _VALUATION_PROMPT_TEMPLATE.format(
+                ticker=ticker,
+                temp_md=temp_md,
+                task=_VALUATION_TASK_TEMPLATE.format(ticker=ticker),
+                depth_name=depth_config["depth_name"],
+            )
+
+            # GPT-5 for calculations and analysis - focused output
+            valuation_md = await self._coalesce(
+                ("valuation", ticker, expertise_level, hash(temp_md)),
+                lambda: asyncio.to_thread(
+                    self.openai_client.create_completion,
+                    messages=[
+                        {"role": "system", "content": _VALUATION_SYSTEM_PROMPT},
+                        {"role": "user", "content": valuation_prompt}
+                    ],
+                    max_tokens=VALUATION_MAX_OUTPUT_TOKENS,  # 16k tokens as requested
+                    use_complex_model=True  # Use GPT-5 for complex analysis
+                ),
+            )
+
+            logger.info(f"✅ Valuation phase completed: {len(valuation_md)} characters")
+            return valuation_md
+
+        except Exception as e:
+            logger.error(f"Valuation phase failed for {ticker}: {str(e)}")
+            return f"# Valuation Analysis Failed for {ticker}\n\nError: {str(e)}\n\nUnable to complete valuation."
+
+    async def _run_valuation_phase_batched(
+        self, session_id: str, tickers: list[str], expertise_level: int, temp_mds: list[str]
+    ) -> dict[str, str]:
+        """
+        Step 2 for several tickers in one GPT-5 call that sends the framework once.
+
+        The Owner-Returns formulas and report layout are shared, so input tokens grow
+        by one research block per ticker instead of one full prompt. Tickers missing
+        from the JSON response, or a response that fails to parse, fall back to the
+        single-ticker path.
+
+        Args:
+            session_id: Unique session identifier
+            tickers: At most VALUATION_PROMPT_BATCH_SIZE ticker symbols
+            expertise_level: User expertise level (1-10)
+            temp_mds: Step 1 research for each ticker, in the same order
+
+        Returns:
+            Mapping of ticker to its valuation markdown
+        """
+        reports: dict[str, str] = {}
+        if len(tickers) > 1:
+            depth_config = self._get_expertise_depth_config(expertise_level)
+            research_blocks = "\n\n".join(
+                f"### TICKER {i}: {ticker}\n## RESEARCH DATA:\n{temp_md}"
+                for i, (ticker, temp_md) in enumerate(zip(tickers, temp_mds, strict=True), 1)
+            )
+            valuation_prompt = _BATCHED_VALUATION_PROMPT_TEMPLATE.format(
+                tickers=", ".join(tickers),
+                depth_name=depth_config["depth_name"],
+                research_blocks=research_blocks,
+            )
+            response_schema = {
+                "type": "object",
+                "properties": {ticker: {"type": "string"} for ticker in tickers},
+                "required": tickers,
+            }
+
+            try:
+                response = await asyncio.to_thread(
+                    self.openai_client.create_structured_completion,
+                    messages=[
+                        {"role": "system", "content": _VALUATION_SYSTEM_PROMPT},
+                        {"role": "user", "content": valuation_prompt}
+                    ],
+                    response_schema=response_schema,
+                    max_tokens=VALUATION_MAX_OUTPUT_TOKENS * len(tickers),
+                    use_complex_model=True
+                )
+                reports = {
+                    ticker: report
+                    for ticker, report in response.items()
+                    if ticker in tickers and isinstance(report, str) and report.strip()
+                }
+            except Exception as e:
+                logger.warning(f"Batched valuation failed for {', '.join(tickers)}: {str(e)}")
+
+        missing = [
+            (ticker, temp_md)
+            for ticker, temp_md in zip(tickers, temp_mds, strict=True)
+            if ticker not in reports
+        ]
+        if missing:
+            fallback = await asyncio.gather(
+                *(
+                    self._run_valuation_phase(session_id, ticker, expertise_level, temp_md)
+                    for ticker, temp_md in missing
+                )
+            )
+            reports.update(zip((ticker for ticker, _ in missing), fallback, strict=True))
+
+        logger.info(f"✅ Valuation phase completed for {len(reports)} tickers")
+        return reports
+
+    def _get_owner_returns_formulas(self) -> str:
+        """Get Owner-Returns calculation formulas for GPT-5."""
+        return OWNER_RETURNS_FORMULAS
+
+    def _get_expertise_depth_config(self, expertise_level: int) -> Mapping[str, str]:
+        """Map expertise level to analysis depth configuration."""
+        return _DEPTH_BY_LEVEL[max(1, min(10, expertise_level))]
+
+    async def _write_research_files(
+        self,
+        session_id: str,
+        ticker: str,
+        temp_md: str,
+        valuation_md: str,
+        research_json: str | None = None,
+    ) -> list[str]:
+        """Write research files to database following Story 2.1 pattern."""
+        try:
+            # temp.md (research with citations), valuation.md (complete analysis) and
+            # temp.json (raw structured payload, when there is one) are independent,
+            # so write them all at once
+            contents = [temp_md, valuation_md]
+            if research_json is not None:
+                contents.append(research_json)
+            files_created = self._research_file_paths(
+                session_id, ticker, structured=research_json is not None
+            )
+            await asyncio.gather(
+                *(
+                    self._write_research_file(path, content)
+                    for path, content in zip(files_created, contents, strict=True)
+                )
+            )
 
             logger.info(f"✅ Created {len(files_created)} research files for {ticker}")
             return files_created
@@ -329,9 +1002,45 @@ Show all calculations explicitly with actual numbers from research data.
             logger.error(f"Failed to write research files for {ticker}: {str(e)}")
             return []
 
+    @staticmethod
+    def _research_file_paths(session_id: str, ticker: str, structured: bool = False) -> list[str]:
+        """Return the temp.md and valuation.md paths, plus temp.json for structured research."""
+        research_dir = f"research_database/sessions/{session_id}/{ticker}/valuation"
+        paths = [f"{research_dir}/temp.md", f"{research_dir}/valuation.md"]
+        if structured:
+            paths.append(f"{research_dir}/temp.json")
+        return paths
+
+    def _finish_background_write(
+        self, session_id: str, files: list[str], task: asyncio.Task
+    ) -> None:
+        """Untrack a finished background write and record its files if it failed."""
+        self._pending_writes.discard(task)
+        if task.cancelled() or task.exception() is not None or not task.result():
+            logger.error(f"Background write failed for research files: {', '.join(files)}")
+            self._failed_writes.setdefault(session_id, []).extend(files)
+
+    async def wait_for_pending_writes(self, session_id: str) -> list[str]:
+        """
+        Wait until all background research file writes have finished.
+
+        Args:
+            session_id: Session whose write failures should be reported
+
+        Returns:
+            Research file paths of the session that could not be written
+        """
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+        return self._failed_writes.pop(session_id, [])
+
     async def _write_research_file(self, file_path: str, content: str) -> None:
+        """Write content to research database file without blocking the event loop."""
+        await asyncio.to_thread(self._write_research_file_sync, file_path, content)
+
+    @staticmethod
+    def _write_research_file_sync(file_path: str, content: str) -> None:
         """Write content to research database file."""
-        import os
 
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -356,10 +1065,10 @@ Ready for Strategic Agent handoff with real market data.
 """
 
     def _create_error_result(
-        self, session_id: str, ticker: str, error_message: str, start_time: datetime
+        self, session_id: str, ticker: str, error_message: str, start_time: float
     ) -> AgentResult:
-        """Create error result for failed analysis."""
-        execution_time = (datetime.now(UTC) - start_time).total_seconds()
+        """Create error result for failed analysis (start_time from time.perf_counter())."""
+        execution_time = time.perf_counter() - start_time
 
         return AgentResult(
             agent_name=self.agent_name,
@@ -385,7 +1094,9 @@ Ready for Strategic Agent handoff with real market data.
     async def conduct_owner_returns_research(self, ticker: str, expertise_level: int) -> dict[str, Any]:
         """Compatibility method for existing tests."""
         try:
-            temp_md = await self._run_research_phase("compat_session", ticker, expertise_level)
+            temp_md = self._render_research(
+                await self._run_research_phase("compat_session", ticker, expertise_level)
+            )
             valuation_md = await self._run_valuation_phase("compat_session", ticker, expertise_level, temp_md)
             
             return {
@@ -409,9 +1120,4 @@ Ready for Strategic Agent handoff with real market data.
 
     def _extract_citations_from_response(self, content: str) -> list[str]:
         """Extract citations from content for compatibility."""
-        import re
-        citations = []
-        citation_pattern = r'\[Source: ([^\]]+)\]'
-        matches = re.findall(citation_pattern, content)
-        citations.extend(matches)
-        return citations[:10]  # Limit to top 10
\ No newline at end of file
+        return _CITATION_RE.findall(content)[:10]  # Limit to top 10
\ No newline at end of file
@@ -3,10 +3,19 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
-from typing import Literal
+from typing import Final, Literal, get_args
 
 from pydantic import BaseModel, ConfigDict, Field
 
+# Single source of truth for assessment question categories
+QuestionCategory = Literal[
+    "general_investing",
+    "ticker_specific",
+    "sector_expertise",
+    "analytical_sophistication",
+]
+QUESTION_CATEGORIES: Final[tuple[str, ...]] = get_args(QuestionCategory)
+
 
 class UserSession(BaseModel):
     """User session model for assessment and analysis."""
@@ -48,13 +57,13 @@ class UserSession(BaseModel):
 class AssessmentQuestion(BaseModel):
     """Model for assessment questions."""
 
+    # Reason: question sets are shared through the question bank cache, so
+    # instances must not be mutated after validation
+    model_config = ConfigDict(frozen=True)
+
     id: int = Field(..., description="Question number (1-20)")
     difficulty_level: int = Field(..., ge=1, le=10, description="Target expertise level (1-10)")
-    category: str = Field(
-        ...,
-        pattern="^(general_investing|ticker_specific|sector_expertise|analytical_sophistication)$",
-        description="Question category",
-    )
+    category: QuestionCategory = Field(..., description="Question category")
     question: str = Field(..., max_length=800, description="Contextually generated question text")
     options: list[str] = Field(
         ..., min_length=3, max_length=5, description="Multiple choice options"
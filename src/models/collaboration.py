@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+@dataclass(frozen=True, slots=True)
+class HandoffData:
+    """Lightweight handoff payload produced by an agent for the next agent."""
+
+    research_files: list[str]
+    context_summary: str
+    cross_references: list[str] = field(default_factory=list)
+    confidence_metrics: dict[str, Any] = field(default_factory=dict)
+    token_usage: int = 0
 
 
 class AgentHandoff(BaseModel):
     """Model for structured data transfer between agents."""
 
+    model_config = ConfigDict(frozen=True)
+
     source_agent: str = Field(..., description="Agent providing the data")
     target_agent: str = Field(..., description="Agent receiving the data")
     research_files: list[str] = Field(..., description="List of research file paths")
@@ -63,6 +77,8 @@ class ResearchStatus(BaseModel):
 class AgentResult(BaseModel):
     """Model for agent execution results."""
 
+    model_config = ConfigDict(frozen=True)
+
     agent_name: str = Field(..., description="Name of the agent")
     success: bool = Field(..., description="Whether agent completed successfully")
     research_files_created: list[str] = Field(
@@ -1,10 +1,12 @@
 """Assessment router for ticker validation and assessment flow."""
 
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.agents.assessment_agent import AssessmentAgent
@@ -176,7 +178,7 @@ async def get_assessment_questions(session_id: str) -> QuestionsResponse:
         ticker = session["ticker_symbol"]
 
         # Generate contextual questions using the assessment agent
-        questions = assessment_agent.generate_contextual_assessment_questions(ticker)
+        questions = await assessment_agent.generate_contextual_assessment_questions_async(ticker)
 
         logger.info(f"Generated {len(questions)} questions for session {session_id}")
 
@@ -198,6 +200,59 @@ async def get_assessment_questions(session_id: str) -> QuestionsResponse:
         ) from e
 
 
+@router.get("/questions/stream", status_code=status.HTTP_200_OK)
+@rate_limit_openai(lambda session_id: f"questions_{session_id}")
+async def stream_assessment_questions(session_id: str) -> StreamingResponse:
+    """
+    Stream contextual assessment questions as server-sent events.
+
+    Each question is sent as a "question" event as soon as it is generated, so
+    the frontend can render the first questions while the rest are produced.
+    The stream ends with a "done" event, or an "error" event if generation fails.
+
+    Args:
+        session_id: Unique session identifier
+
+    Returns:
+        StreamingResponse emitting text/event-stream frames
+
+    Raises:
+        HTTPException: If the session ID is invalid or the session is not found
+    """
+    if not is_valid_session_id(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid session ID format"
+        )
+
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Session {session_id} not found"
+        )
+
+    ticker = session["ticker_symbol"]
+    logger.info(f"Streaming assessment questions for session: {session_id}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        count = 0
+        try:
+            async for question in assessment_agent.generate_contextual_assessment_questions_stream(
+                ticker
+            ):
+                count += 1
+                yield f"event: question\ndata: {question.model_dump_json()}\n\n"
+        except Exception as e:
+            # Reason: headers are already sent, so failures are reported in-band
+            logger.error(f"Error streaming questions for session {session_id}: {str(e)}")
+            yield 'event: error\ndata: {"detail": "Failed to generate assessment questions"}\n\n'
+            return
+
+        logger.info(f"Streamed {count} questions for session {session_id}")
+        yield f'event: done\ndata: {{"total_questions": {count}}}\n\n'
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/submit", response_model=AssessmentResultResponse, status_code=status.HTTP_200_OK)
 @rate_limit_openai(lambda submission: f"submit_{submission.session_id}")
 async def submit_assessment(submission: AssessmentSubmission) -> AssessmentResultResponse:
@@ -231,10 +286,10 @@ async def submit_assessment(submission: AssessmentSubmission) -> AssessmentResul
         ticker = session["ticker_symbol"]
 
         # Generate questions again for evaluation context
-        questions = assessment_agent.generate_contextual_assessment_questions(ticker)
+        questions = await assessment_agent.generate_contextual_assessment_questions_async(ticker)
 
         # Evaluate user expertise
-        result = assessment_agent.evaluate_user_expertise(
+        result = await assessment_agent.evaluate_user_expertise_async(
             questions=questions, responses=submission.responses, ticker=ticker
         )
 
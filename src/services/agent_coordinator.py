@@ -2,12 +2,15 @@
 
 import asyncio
 import logging
+from dataclasses import asdict
 from typing import Any
 
+import orjson
+
 from ..agents.historian_agent import HistorianAgent
 from ..agents.strategic_agent import StrategicAgent
 from ..agents.valuation_agent import ValuationAgent
-from ..models.collaboration import AgentHandoff, AgentResult, ResearchStatus
+from ..models.collaboration import AgentHandoff, AgentResult, HandoffData, ResearchStatus
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +30,9 @@ class AgentCoordinator:
 
         # Initialize agent instances
         self.agents = {
-            "valuation_agent": ValuationAgent(),
+            # Reason: the workflow awaits pending writes before completing, so Step 2
+            # results can be handed off while their files are still being written
+            "valuation_agent": ValuationAgent(write_async=True),
             "strategic_agent": StrategicAgent(),
             "historian_agent": HistorianAgent(),
             "synthesis_agent": None,  # Placeholder for future implementation
@@ -195,7 +200,11 @@ class AgentCoordinator:
         return True
 
     async def coordinate_agent_handoff(
-        self, session_id: str, source_agent: str, target_agent: str, data: dict[str, Any]
+        self,
+        session_id: str,
+        source_agent: str,
+        target_agent: str,
+        data: HandoffData | dict[str, Any],
     ) -> bool:
         """
         Coordinate handoff between agents with data validation.
@@ -204,12 +213,15 @@ class AgentCoordinator:
             session_id: Session identifier
             source_agent: Agent providing the data
             target_agent: Agent receiving the data
-            data: Handoff data dictionary
+            data: Handoff data from BaseAgent.format_handoff_data, or an equivalent dictionary
 
         Returns:
             True if handoff successful, False otherwise
         """
         try:
+            if isinstance(data, HandoffData):
+                data = asdict(data)
+
             # Create AgentHandoff object
             handoff = AgentHandoff(
                 source_agent=source_agent,
@@ -244,10 +256,13 @@ class AgentCoordinator:
                 completed_agents = len(status.agents_completed)
                 status.progress_percentage = (completed_agents / total_agents) * 100
 
-            # Serialize handoff to JSON for logging/debugging
-            handoff_json = handoff.model_dump_json(indent=2)
             logger.info(f"Agent handoff completed: {source_agent} -> {target_agent}")
-            logger.debug(f"Handoff data: {handoff_json}")
+            # Reason: only pay for serializing the handoff when debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                handoff_json = orjson.dumps(
+                    handoff.model_dump(mode="json"), option=orjson.OPT_INDENT_2
+                ).decode()
+                logger.debug(f"Handoff data: {handoff_json}")
 
             return True
 
@@ -322,6 +337,13 @@ class AgentCoordinator:
                         session_id, agent_name, next_agent, handoff_data
                     )
 
+            # Research files may still be persisting in the background
+            valuation_agent = self.agents.get("valuation_agent")
+            if valuation_agent is not None:
+                failed_files = await valuation_agent.wait_for_pending_writes(session_id)
+                if failed_files:
+                    raise OSError(f"Failed to write research files: {', '.join(failed_files)}")
+
             # Mark research as completed
             if session_id in self.active_sessions:
                 status = self.active_sessions[session_id]
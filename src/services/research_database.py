@@ -9,6 +9,14 @@ import yaml
 
 logger = logging.getLogger(__name__)
 
+# Agent types whose research each agent type can read as context
+_AGENT_DEPENDENCIES = {
+    "valuation": (),  # First agent, no dependencies
+    "strategic": ("valuation",),  # Reads valuation
+    "historical": ("valuation", "strategic"),  # Reads both
+    "synthesis": ("valuation", "strategic", "historical"),  # Reads all
+}
+
 
 class ResearchDatabase:
     """Manages file-based research storage with YAML metadata."""
@@ -234,17 +242,7 @@ class ResearchDatabase:
             "previous_research": {},
         }
 
-        # Define agent dependencies (what each agent can read)
-        agent_dependencies = {
-            "valuation": [],  # First agent, no dependencies
-            "strategic": ["valuation"],  # Reads valuation
-            "historical": ["valuation", "strategic"],  # Reads both
-            "synthesis": ["valuation", "strategic", "historical"],  # Reads all
-        }
-
-        available_agents = agent_dependencies.get(agent_type, [])
-
-        for dep_agent in available_agents:
+        for dep_agent in _AGENT_DEPENDENCIES.get(agent_type, ()):
             agent_dir = self.sessions_path / session_id / ticker / dep_agent
             if agent_dir.exists():
                 agent_files = []
@@ -263,6 +261,35 @@ class ResearchDatabase:
 
         return context
 
+    def get_context_stamp(
+        self, session_id: str, ticker: str, agent_type: str
+    ) -> tuple[tuple[str, int, int], ...]:
+        """
+        Fingerprint the files get_agent_context would read for an agent.
+
+        The stamp changes whenever a context file is added, removed or rewritten,
+        whichever agent or code path wrote it, so callers can cache the context
+        against it. Only directory listings and stats are needed, not file reads.
+
+        Args:
+            session_id: Session identifier
+            ticker: Stock ticker
+            agent_type: Type of requesting agent
+
+        Returns:
+            Sorted (path, mtime_ns, size) entries for every context file
+        """
+        entries = []
+        for dep_agent in _AGENT_DEPENDENCIES.get(agent_type, ()):
+            agent_dir = self.sessions_path / session_id / ticker / dep_agent
+            for file_path in agent_dir.glob("*.md"):
+                try:
+                    stat = file_path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+
     def add_cross_reference(
         self, session_id: str, ticker: str, source_file: str, target_file: str, relationship: str
     ) -> None:
@@ -276,15 +303,33 @@ class ResearchDatabase:
             target_file: Target file path
             relationship: Description of relationship
         """
+        self.add_cross_references(session_id, ticker, [(source_file, target_file, relationship)])
+
+    def add_cross_references(
+        self, session_id: str, ticker: str, references: list[tuple[str, str, str]]
+    ) -> None:
+        """
+        Add several cross-references with a single read and write of the index.
+
+        Args:
+            session_id: Session identifier
+            ticker: Stock ticker
+            references: (source_file, target_file, relationship) tuples
+        """
+        if not references:
+            return
+
         cross_refs = self._read_cross_references(session_id, ticker)
         if cross_refs:
-            cross_refs["references"].append(
+            created_at = datetime.now(UTC).isoformat()
+            cross_refs["references"].extend(
                 {
                     "source": source_file,
                     "target": target_file,
                     "relationship": relationship,
-                    "created_at": datetime.now(UTC).isoformat(),
+                    "created_at": created_at,
                 }
+                for source_file, target_file, relationship in references
             )
 
             meta_dir = self.sessions_path / session_id / ticker / "meta"
@@ -0,0 +1,99 @@
+"""Incremental extraction of array items from streamed JSON text."""
+
+import logging
+import re
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class JsonArrayItemStream:
+    """
+    Yield complete objects from a named JSON array as text chunks arrive.
+
+    Designed for structured model output such as {"questions": [{...}, {...}]}:
+    each object in the array is decoded as soon as its closing brace is seen,
+    without waiting for the rest of the document.
+
+    Example:
+        >>> stream = JsonArrayItemStream("questions")
+        >>> stream.feed('{"questions": [{"id": 1}, {"i')
+        [{'id': 1}]
+        >>> stream.feed('d": 2}]}')
+        [{'id': 2}]
+    """
+
+    def __init__(self, array_key: str):
+        """
+        Initialize the stream for one top-level array key.
+
+        Args:
+            array_key: Name of the array whose objects should be extracted
+        """
+        self._array_start = re.compile(rf'"{re.escape(array_key)}"\s*:\s*\[')
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start = 0
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """
+        Consume a chunk of JSON text.
+
+        Args:
+            chunk: Next piece of the streamed document
+
+        Returns:
+            Objects from the array that were completed by this chunk
+
+        Raises:
+            orjson.JSONDecodeError: If a completed object is not valid JSON
+        """
+        if self._done:
+            return []
+
+        self._buffer += chunk
+        if not self._in_array:
+            match = self._array_start.search(self._buffer)
+            if not match:
+                return []
+            self._in_array = True
+            self._pos = match.end()
+
+        items = []
+        buffer = self._buffer
+        for index in range(self._pos, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._item_start = index
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append(orjson.loads(buffer[self._item_start : index + 1]))
+            elif char == "]" and self._depth == 0:
+                self._done = True
+                break
+
+        # Reason: drop consumed text so the buffer only holds the object in progress
+        keep_from = self._item_start if self._depth > 0 else len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._item_start -= keep_from
+        self._pos = len(self._buffer)
+        return items
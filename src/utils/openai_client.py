@@ -1,16 +1,22 @@
 """OpenAI SDK wrapper for StockIQ application - FIXED GPT-5 Responses API."""
 
+import asyncio
 import json
 import logging
 import os
 import time
 import random
-from typing import Any, Dict, List, Optional
+from collections.abc import AsyncIterator
+from typing import Any, Dict, List, Optional, Union
 
-from openai import OpenAI, APIStatusError, APIConnectionError, RateLimitError
+import orjson
+from openai import AsyncOpenAI, OpenAI, APIStatusError, APIConnectionError, RateLimitError
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a server-provided Retry-After so one response can't stall a run
+MAX_RETRY_AFTER_SECONDS = 60.0
+
 
 def extract_output_text(resp) -> str:
     """Bulletproof text extraction from GPT-5 Responses API."""
@@ -41,6 +47,18 @@ def extract_output_text(resp) -> str:
     raise ValueError("No assistant output_text found - try increasing max_output_tokens")
 
 
+def _output_text_from_body(body: Dict[str, Any]) -> str:
+    """Extract assistant text from a Responses API body decoded from JSON (e.g. batch output)."""
+    chunks = [
+        block.get("text") or ""
+        for item in body.get("output") or []
+        if item.get("type") == "message" and item.get("role") == "assistant"
+        for block in item.get("content") or []
+        if block.get("type") in ("output_text", "text")
+    ]
+    return "\n".join(chunk for chunk in chunks if chunk).strip()
+
+
 class OpenAIClient:
     """Wrapper for OpenAI SDK with bulletproof GPT-5 Responses API usage."""
 
@@ -55,32 +73,33 @@ class OpenAIClient:
             timeout=600.0,
             max_retries=2  # SDK built-in retries
         )
+        # Async twin for callers running inside the FastAPI event loop
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            timeout=600.0,
+            max_retries=2
+        )
 
         # Model configuration
         self.complex_model = os.getenv("OPENAI_COMPLEX_MODEL", "gpt-5")
         self.simple_model = os.getenv("OPENAI_SIMPLE_MODEL", "gpt-5-mini")
 
-    def create(
+    def _build_request_kwargs(
         self,
         *,
-        messages: List[Dict[str, Any]], 
-        tools: Optional[List[Dict[str, Any]]] = None,
-        reasoning_effort: str = "low",  # Using "low" as you requested
-        verbosity: str = "medium",  # Medium for better output
-        max_output_tokens: int = 8000,  # 8k tokens as you requested
-        temperature: Optional[float] = None,
-        previous_response_id: Optional[str] = None,
-        use_complex_model: bool = False,
-        use_typed_blocks: bool = True  # Use typed content blocks for better tool compatibility
-    ) -> Any:
-        """
-        Create a response using GPT-5 Responses API with bulletproof error handling.
-        
-        Key fixes from researcher:
-        - Increased max_output_tokens to prevent token starvation
-        - Using typed content blocks for better tool compatibility
-        - Low reasoning effort to save tokens for actual output
-        """
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        reasoning_effort: str,
+        verbosity: str,
+        max_output_tokens: int,
+        temperature: Optional[float],
+        previous_response_id: Optional[str],
+        use_complex_model: bool,
+        use_typed_blocks: bool,
+        prompt_cache_key: Optional[str] = None,
+        text_format: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Build Responses API keyword arguments shared by create and acreate."""
         model = self.complex_model if use_complex_model else self.simple_model
         
         # Convert to typed content blocks if needed (better for tools)
@@ -100,7 +119,7 @@ class OpenAIClient:
             "model": model,
             "input": messages,
             "reasoning": {"effort": reasoning_effort},
-            "text": {"format": {"type": "text"}, "verbosity": verbosity},
+            "text": {"format": text_format or {"type": "text"}, "verbosity": verbosity},
             "max_output_tokens": max_output_tokens,
         }
         if tools: 
@@ -110,9 +129,67 @@ class OpenAIClient:
             kwargs["previous_response_id"] = previous_response_id
         if temperature is not None: 
             kwargs["temperature"] = temperature
+        if prompt_cache_key:
+            # Routes requests sharing a long static prefix to the same prompt cache
+            kwargs["prompt_cache_key"] = prompt_cache_key
+        return kwargs
+
+    @staticmethod
+    def _backoff_delay(attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Delay before retrying the given 1-based attempt.
+
+        Honors a numeric Retry-After header on the error's response, otherwise
+        uses exponential backoff with jitter.
+        """
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+        return 1.0 * (2 ** (attempt - 1)) + random.uniform(0, 0.333)
+
+    def create(
+        self,
+        *,
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        reasoning_effort: str = "low",  # Using "low" as you requested
+        verbosity: str = "medium",  # Medium for better output
+        max_output_tokens: int = 8000,  # 8k tokens as you requested
+        temperature: Optional[float] = None,
+        previous_response_id: Optional[str] = None,
+        use_complex_model: bool = False,
+        use_typed_blocks: bool = True,  # Use typed content blocks for better tool compatibility
+        prompt_cache_key: Optional[str] = None,
+        text_format: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Create a response using GPT-5 Responses API with bulletproof error handling.
+        
+        Key fixes from researcher:
+        - Increased max_output_tokens to prevent token starvation
+        - Using typed content blocks for better tool compatibility
+        - Low reasoning effort to save tokens for actual output
+        """
+        kwargs = self._build_request_kwargs(
+            messages=messages,
+            tools=tools,
+            reasoning_effort=reasoning_effort,
+            verbosity=verbosity,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            previous_response_id=previous_response_id,
+            use_complex_model=use_complex_model,
+            use_typed_blocks=use_typed_blocks,
+            prompt_cache_key=prompt_cache_key,
+            text_format=text_format,
+        )
+        model = kwargs["model"]
 
         # Extra backoff on top of SDK's built-ins for rate limits
-        base = 1.0
         for attempt in range(1, 6):  # 6 attempts for better resilience
             try:
                 response = self.client.responses.create(**kwargs)
@@ -120,14 +197,14 @@ class OpenAIClient:
                 return response
                 
             except RateLimitError as e:
-                sleep = base * (2 ** (attempt - 1)) + random.uniform(0, 0.333)
+                sleep = self._backoff_delay(attempt, e)
                 logger.warning(f"Rate limit hit; retrying in {sleep:.2f}s (attempt {attempt}/5)")
                 time.sleep(sleep)
                 continue
             except (APIStatusError, APIConnectionError) as e:
                 code = getattr(e, "status_code", None)
                 if code in (500, 502, 503, 504) or isinstance(e, APIConnectionError):
-                    sleep = base * (2 ** (attempt - 1)) + random.uniform(0, 0.333)
+                    sleep = self._backoff_delay(attempt, e)
                     logger.warning(f"Transient error {code}; retrying in {sleep:.2f}s (attempt {attempt}/5)")
                     time.sleep(sleep)
                     continue
@@ -135,13 +212,71 @@ class OpenAIClient:
         
         raise RuntimeError("Max retries exceeded after 5 attempts")
 
+    async def acreate(
+        self,
+        *,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        reasoning_effort: str = "low",
+        verbosity: str = "medium",
+        max_output_tokens: int = 8000,
+        temperature: Optional[float] = None,
+        previous_response_id: Optional[str] = None,
+        use_complex_model: bool = False,
+        use_typed_blocks: bool = True,
+        prompt_cache_key: Optional[str] = None,
+        text_format: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Async variant of create() that awaits the request and backoff sleeps.
+
+        Lets FastAPI routes issue GPT-5 calls without blocking the event loop.
+        """
+        kwargs = self._build_request_kwargs(
+            messages=messages,
+            tools=tools,
+            reasoning_effort=reasoning_effort,
+            verbosity=verbosity,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            previous_response_id=previous_response_id,
+            use_complex_model=use_complex_model,
+            use_typed_blocks=use_typed_blocks,
+            prompt_cache_key=prompt_cache_key,
+            text_format=text_format,
+        )
+        model = kwargs["model"]
+
+        for attempt in range(1, 6):
+            try:
+                response = await self.async_client.responses.create(**kwargs)
+                logger.info(f"GPT-5 response created with {model}, {max_output_tokens} tokens")
+                return response
+
+            except RateLimitError as e:
+                sleep = self._backoff_delay(attempt, e)
+                logger.warning(f"Rate limit hit; retrying in {sleep:.2f}s (attempt {attempt}/5)")
+                await asyncio.sleep(sleep)
+                continue
+            except (APIStatusError, APIConnectionError) as e:
+                code = getattr(e, "status_code", None)
+                if code in (500, 502, 503, 504) or isinstance(e, APIConnectionError):
+                    sleep = self._backoff_delay(attempt, e)
+                    logger.warning(f"Transient error {code}; retrying in {sleep:.2f}s (attempt {attempt}/5)")
+                    await asyncio.sleep(sleep)
+                    continue
+                raise
+
+        raise RuntimeError("Max retries exceeded after 5 attempts")
+
     def respond_with_web_search(
         self,
         messages: List[Dict[str, Any]],
         reasoning_effort: str = "low",
         verbosity: str = "high",  # High verbosity for lots of data
         max_output_tokens: int = 32000,  # 32k context for comprehensive research
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        text_format: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         GPT-5 response with web search tool for real data research.
@@ -150,6 +285,8 @@ class OpenAIClient:
         - 8000 tokens to ensure we get the final assistant message
         - Low reasoning effort to save tokens for actual output
         - Medium verbosity for good detail
+
+        Pass a json_schema text_format to get structured output instead of prose.
         """
         try:
             response = self.create(
@@ -160,7 +297,8 @@ class OpenAIClient:
                 max_output_tokens=max_output_tokens,
                 temperature=temperature,
                 use_complex_model=False,  # Use GPT-5-mini (200k TPM) for web search
-                use_typed_blocks=True  # Use typed blocks for tool compatibility
+                use_typed_blocks=True,  # Use typed blocks for tool compatibility
+                text_format=text_format,
             )
             
             content = extract_output_text(response)
@@ -175,7 +313,8 @@ class OpenAIClient:
                     verbosity="medium",
                     max_output_tokens=12000,  # Give it even more room
                     use_complex_model=True,
-                    use_typed_blocks=True
+                    use_typed_blocks=True,
+                    text_format=text_format,
                 )
                 content = extract_output_text(response)
             
@@ -186,6 +325,97 @@ class OpenAIClient:
             logger.error(f"GPT-5 web search failed: {str(e)}")
             raise
 
+    def submit_batch(
+        self, requests: List[tuple[str, Dict[str, Any]]], completion_window: str = "24h"
+    ) -> str:
+        """
+        Submit Responses API requests as one Batch API job.
+
+        Batch jobs cost about half as much as live requests and finish within the
+        completion window, which suits non-urgent runs such as overnight scans.
+
+        Args:
+            requests: (custom_id, request kwargs) pairs; build the kwargs with
+                build_web_search_request
+            completion_window: Batch completion window accepted by the API
+
+        Returns:
+            ID of the created batch
+        """
+        jsonl = b"".join(
+            orjson.dumps(
+                {"custom_id": custom_id, "method": "POST", "url": "/v1/responses", "body": body}
+            )
+            + b"\n"
+            for custom_id, body in requests
+        )
+        input_file = self.client.files.create(file=("batch.jsonl", jsonl), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window=completion_window,
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
+    def retrieve_batch_output(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """
+        Fetch the output text of a finished batch.
+
+        Args:
+            batch_id: ID returned by submit_batch
+
+        Returns:
+            Mapping of custom_id to output text for each successful request, or
+            None while the batch is still running
+
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing"):
+            return None
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+        if not batch.output_file_id:
+            return {}
+
+        outputs = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.warning(
+                    f"Batch request {record.get('custom_id')} failed: {record.get('error')}"
+                )
+                continue
+            outputs[record["custom_id"]] = _output_text_from_body(response["body"])
+        return outputs
+
+    def build_web_search_request(
+        self,
+        messages: List[Dict[str, Any]],
+        reasoning_effort: str = "low",
+        verbosity: str = "high",
+        max_output_tokens: int = 32000,
+        text_format: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Build the request body respond_with_web_search sends, for use in a batch."""
+        return self._build_request_kwargs(
+            messages=messages,
+            tools=[{"type": "web_search"}],
+            reasoning_effort=reasoning_effort,
+            verbosity=verbosity,
+            max_output_tokens=max_output_tokens,
+            temperature=None,
+            previous_response_id=None,
+            use_complex_model=False,
+            use_typed_blocks=True,
+            text_format=text_format,
+        )
+
     def create_completion(
         self,
         messages: List[Dict[str, Any]],
@@ -193,6 +423,8 @@ class OpenAIClient:
         temperature: Optional[float] = None,
         response_format: Optional[Dict] = None,
         use_complex_model: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        reasoning_effort: str = "low",
     ) -> str:
         """
         Create a completion using GPT-5 (compatible with legacy code).
@@ -203,6 +435,8 @@ class OpenAIClient:
             temperature: Temperature for response randomness
             response_format: Response format specification
             use_complex_model: Use GPT-5 for complex tasks
+            prompt_cache_key: Routing key for requests that share a static prompt prefix
+            reasoning_effort: GPT-5 reasoning effort (minimal, low, medium, high)
 
         Returns:
             Response content as string
@@ -213,12 +447,13 @@ class OpenAIClient:
         try:
             response = self.create(
                 messages=messages,
-                reasoning_effort="low",  # Low reasoning effort
+                reasoning_effort=reasoning_effort,
                 verbosity="medium",  # Medium verbosity for focused output
                 max_output_tokens=max_tokens or 12000,  # Default to 12k tokens
                 temperature=temperature,
                 use_complex_model=use_complex_model,
-                use_typed_blocks=True
+                use_typed_blocks=True,
+                prompt_cache_key=prompt_cache_key,
             )
 
             content = extract_output_text(response)
@@ -235,7 +470,7 @@ class OpenAIClient:
     def create_structured_completion(
         self,
         messages: List[Dict[str, Any]],
-        response_schema: Dict,
+        response_schema: Union[Dict, str],
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         use_complex_model: bool = True,
@@ -245,7 +480,8 @@ class OpenAIClient:
 
         Args:
             messages: List of message dictionaries for the conversation
-            response_schema: JSON schema for structured response
+            response_schema: JSON schema for structured response, as a dict or a
+                pre-serialized JSON string
             max_tokens: Maximum completion tokens for response
             temperature: Temperature for response randomness
             use_complex_model: Use GPT-5 for complex structured tasks by default
@@ -256,14 +492,9 @@ class OpenAIClient:
         Raises:
             Exception: If OpenAI API call fails or JSON parsing fails
         """
+        content = None
         try:
-            # Add JSON schema instruction to system message
-            json_instruction = {
-                "role": "system",
-                "content": f"Respond with valid JSON matching this schema: {json.dumps(response_schema)}"
-            }
-            
-            structured_messages = [json_instruction] + messages
+            structured_messages = self._with_json_instruction(messages, response_schema)
 
             content = self.create_completion(
                 messages=structured_messages,
@@ -275,7 +506,8 @@ class OpenAIClient:
             if not content:
                 raise ValueError("Empty content received from OpenAI API")
 
-            parsed_response = json.loads(content)
+            # Reason: orjson parses the 20-40KB question payloads several times faster
+            parsed_response = orjson.loads(content)
 
             return parsed_response
 
@@ -285,4 +517,161 @@ class OpenAIClient:
             raise
         except Exception as e:
             logger.error(f"Structured completion failed: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def _with_json_instruction(
+        messages: List[Dict[str, Any]], response_schema: Union[Dict, str]
+    ) -> List[Dict[str, Any]]:
+        """Prepend a system message asking for JSON matching the schema."""
+        # Reason: callers with constant schemas pass them pre-serialized so the
+        # instruction bytes are identical across calls and never re-encoded
+        if not isinstance(response_schema, str):
+            response_schema = orjson.dumps(response_schema).decode()
+
+        # Add JSON schema instruction to system message
+        json_instruction = {
+            "role": "system",
+            "content": f"Respond with valid JSON matching this schema: {response_schema}"
+        }
+        return [json_instruction] + messages
+
+    async def acreate_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        use_complex_model: bool = False,
+    ) -> str:
+        """
+        Async variant of create_completion().
+
+        Args:
+            messages: List of message dictionaries for the conversation
+            max_tokens: Maximum completion tokens for response
+            temperature: Temperature for response randomness
+            use_complex_model: Use GPT-5 for complex tasks
+
+        Returns:
+            Response content as string
+
+        Raises:
+            Exception: If OpenAI API call fails
+        """
+        try:
+            response = await self.acreate(
+                messages=messages,
+                reasoning_effort="low",
+                verbosity="medium",
+                max_output_tokens=max_tokens or 12000,
+                temperature=temperature,
+                use_complex_model=use_complex_model,
+                use_typed_blocks=True
+            )
+
+            content = extract_output_text(response)
+
+            if not content:
+                logger.error("Empty content received from GPT-5")
+
+            return content
+
+        except Exception as e:
+            logger.error(f"GPT-5 completion failed: {str(e)}")
+            raise
+
+    async def acreate_structured_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        response_schema: Union[Dict, str],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        use_complex_model: bool = True,
+    ) -> Dict:
+        """
+        Async variant of create_structured_completion().
+
+        Args:
+            messages: List of message dictionaries for the conversation
+            response_schema: JSON schema for structured response, as a dict or a
+                pre-serialized JSON string
+            max_tokens: Maximum completion tokens for response
+            temperature: Temperature for response randomness
+            use_complex_model: Use GPT-5 for complex structured tasks by default
+
+        Returns:
+            Parsed JSON response as dictionary
+
+        Raises:
+            Exception: If OpenAI API call fails or JSON parsing fails
+        """
+        content = None
+        try:
+            content = await self.acreate_completion(
+                messages=self._with_json_instruction(messages, response_schema),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                use_complex_model=use_complex_model,
+            )
+
+            if not content:
+                raise ValueError("Empty content received from OpenAI API")
+
+            return orjson.loads(content)
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {str(e)}")
+            logger.error(f"Content received: '{content[:200] if content else 'None'}...'")
+            raise
+        except Exception as e:
+            logger.error(f"Structured completion failed: {str(e)}")
+            raise
+
+    async def astream_structured_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        response_schema: Union[Dict, str],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        use_complex_model: bool = True,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a structured completion as raw JSON text deltas.
+
+        Unlike the non-streaming calls there is no retry loop: once text has been
+        handed to the caller a transparent retry would duplicate output.
+
+        Args:
+            messages: List of message dictionaries for the conversation
+            response_schema: JSON schema for structured response, as a dict or a
+                pre-serialized JSON string
+            max_tokens: Maximum completion tokens for response
+            temperature: Temperature for response randomness
+            use_complex_model: Use GPT-5 for complex structured tasks by default
+
+        Yields:
+            Chunks of the JSON document as the model produces them
+
+        Raises:
+            Exception: If OpenAI API call fails
+        """
+        kwargs = self._build_request_kwargs(
+            messages=self._with_json_instruction(messages, response_schema),
+            tools=None,
+            reasoning_effort="low",
+            verbosity="medium",
+            max_output_tokens=max_tokens or 12000,
+            temperature=temperature,
+            previous_response_id=None,
+            use_complex_model=use_complex_model,
+            use_typed_blocks=True,
+        )
+
+        try:
+            stream = await self.async_client.responses.create(**kwargs, stream=True)
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+        except Exception as e:
+            logger.error(f"Streaming structured completion failed: {str(e)}")
+            raise
@@ -169,13 +169,15 @@ def test_old_vs_new_implementation():
         has_web_search = 'respond_with_web_search' in content
         has_proper_workflow = 'temp_md' in content and 'valuation_md' in content
         has_real_data = 'web_search' in content
+        has_raw_research = 'temp.json' in content
         
         print("NEW Implementation Analysis:")
         print(f"   - Uses web search: {'YES' if has_web_search else 'NO'}")
         print(f"   - 2-step workflow: {'YES' if has_proper_workflow else 'NO'}")
         print(f"   - Real data approach: {'YES' if has_real_data else 'NO'}")
+        print(f"   - Raw research audit copy: {'YES' if has_raw_research else 'NO'}")
         
-        return has_web_search and has_proper_workflow and has_real_data
+        return has_web_search and has_proper_workflow and has_real_data and has_raw_research
     else:
         print("FAIL: New agent implementation not found")
         return False
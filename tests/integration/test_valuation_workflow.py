@@ -55,7 +55,9 @@ class TestValuationWorkflow:
                 
             # Basic validation
             assert result.success is True
-            assert len(result.research_files_created) == 2
+            # Reason: temp.json is only written when the research parsed as structured JSON
+            file_names = {os.path.basename(path) for path in result.research_files_created}
+            assert {"temp.md", "valuation.md"} <= file_names <= {"temp.md", "temp.json", "valuation.md"}
             
         else:
             print(f"\nError: {result.error_message}")
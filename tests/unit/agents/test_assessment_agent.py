@@ -1,13 +1,21 @@
 """Unit tests for Assessment Agent."""
 
-from unittest.mock import Mock, patch
+import json
+import random
+from unittest.mock import AsyncMock, Mock, patch
 
+import orjson
 import pytest
 
 from src.agents.assessment_agent import AssessmentAgent
 from src.models.assessment import AssessmentQuestion, AssessmentResponse, AssessmentResult
 
 
+def index_responses(responses: list[AssessmentResponse]) -> dict[int, AssessmentResponse]:
+    """Key responses by question id the way the agent's scoring helpers expect."""
+    return {r.question_id: r for r in responses}
+
+
 class TestAssessmentAgent:
     """Test suite for Assessment Agent functionality."""
 
@@ -93,15 +101,24 @@ class TestAssessmentAgent:
     def test_init(self, assessment_agent):
         """Test AssessmentAgent initialization."""
         assert hasattr(assessment_agent, "client")
-        assert hasattr(assessment_agent, "categories")
-        assert len(assessment_agent.categories) == 4
-        expected_categories = [
+        assert hasattr(assessment_agent, "CATEGORIES")
+        assert len(assessment_agent.CATEGORIES) == 4
+        expected_categories = (
             "general_investing",
             "ticker_specific",
             "sector_expertise",
             "analytical_sophistication",
-        ]
-        assert assessment_agent.categories == expected_categories
+        )
+        assert assessment_agent.CATEGORIES == expected_categories
+
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    def test_client_created_lazily(self, mock_client_class):
+        """Test that the OpenAI client is only built on first use and then reused."""
+        agent = AssessmentAgent()
+        mock_client_class.assert_not_called()
+
+        assert agent.client is agent.client
+        mock_client_class.assert_called_once()
 
     def test_report_complexity_mapping(self, assessment_agent):
         """Test expertise level to report complexity mapping."""
@@ -147,9 +164,19 @@ class TestAssessmentAgent:
         assert assessment_agent._map_percentage_to_expertise_level(90) == 9  # Expert
         assert assessment_agent._map_percentage_to_expertise_level(95) == 10  # Top-tier
 
+    def test_percentage_to_expertise_bucket_boundaries(self, assessment_agent):
+        """Test every percentage against the documented 8%-wide level buckets."""
+        lower_bounds = [0, 28, 36, 44, 52, 60, 68, 76, 84, 92]
+
+        for percentage in [p / 2 for p in range(0, 201)]:
+            expected = sum(percentage >= bound for bound in lower_bounds)
+            assert assessment_agent._map_percentage_to_expertise_level(percentage) == expected
+
     def test_score_percentage_calculation(self, assessment_agent, sample_questions, sample_responses):
         """Test percentage score calculation with weighted questions."""
-        percentage = assessment_agent._calculate_score_percentage(sample_questions, sample_responses)
+        percentage = assessment_agent._calculate_score_percentage(
+            sample_questions, index_responses(sample_responses)
+        )
 
         # Should be calculated as: (earned_points / total_possible_points) * 100
         # With sample data, this should be a valid percentage
@@ -185,14 +212,14 @@ class TestAssessmentAgent:
         mock_client.create_structured_completion.return_value = mock_response
 
         agent = AssessmentAgent()
-        questions = agent.generate_contextual_assessment_questions("AAPL")
+        questions = agent.generate_contextual_assessment_questions("AAPL", use_cache=False)
 
         # Verify results
         assert len(questions) == 20
         assert all(isinstance(q, AssessmentQuestion) for q in questions)
         assert all(q.ticker_context == "AAPL" for q in questions)
         assert all(1 <= q.difficulty_level <= 10 for q in questions)
-        assert all(q.category in agent.categories for q in questions)
+        assert all(q.category in agent.CATEGORIES for q in questions)
 
         # Verify OpenAI client was called correctly
         mock_client.create_structured_completion.assert_called_once()
@@ -200,6 +227,36 @@ class TestAssessmentAgent:
         assert call_args.kwargs["use_complex_model"] is True
         # Note: Temperature is not set for GPT-5 models (compatibility fix)
 
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    def test_generate_questions_randomizes_correct_answer(self, mock_client_class):
+        """Test that option shuffling keeps the correct answer text at the new index."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.create_structured_completion.return_value = {
+            "questions": [
+                {
+                    "id": i,
+                    "difficulty_level": 1,
+                    "category": "general_investing",
+                    "question": f"Sample question {i}?",
+                    "options": ["Correct", "Wrong A", "Wrong B", "Wrong C"],
+                    "correct_answer_index": 0,
+                    "weight": 1.0,
+                }
+                for i in range(1, 21)
+            ]
+        }
+
+        agent = AssessmentAgent()
+        with patch("src.agents.assessment_agent._rng", random.Random(42)):
+            questions = agent.generate_contextual_assessment_questions("AAPL", use_cache=False)
+
+        assert all(q.options[q.correct_answer_index] == "Correct" for q in questions)
+        # A fixed seed moves the answer away from slot 0 for at least one question
+        assert any(q.correct_answer_index != 0 for q in questions)
+        expected_options = ["Correct", "Wrong A", "Wrong B", "Wrong C"]
+        assert all(sorted(q.options) == expected_options for q in questions)
+
     @patch("src.agents.assessment_agent.OpenAIClient")
     def test_generate_contextual_assessment_questions_failure(self, mock_client_class):
         """Test question generation failure handling."""
@@ -211,8 +268,153 @@ class TestAssessmentAgent:
         agent = AssessmentAgent()
 
         with pytest.raises(Exception, match="API Error"):
+            agent.generate_contextual_assessment_questions("AAPL", use_cache=False)
+
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    async def test_generate_contextual_assessment_questions_async(
+        self, mock_client_class, sample_questions
+    ):
+        """Test async question generation awaits the async client."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.acreate_structured_completion = AsyncMock(
+            return_value={
+                "questions": [q.model_dump(exclude={"ticker_context"}) for q in sample_questions]
+            }
+        )
+
+        agent = AssessmentAgent()
+        questions = await agent.generate_contextual_assessment_questions_async(
+            "AAPL", use_cache=False
+        )
+
+        assert len(questions) == len(sample_questions)
+        assert all(q.ticker_context == "AAPL" for q in questions)
+        mock_client.acreate_structured_completion.assert_awaited_once()
+        mock_client.create_structured_completion.assert_not_called()
+
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    async def test_generate_contextual_assessment_questions_batch(
+        self, mock_client_class, sample_questions
+    ):
+        """Test batch generation dedupes tickers and returns one set per ticker."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.acreate_structured_completion = AsyncMock(
+            side_effect=lambda **_: {
+                "questions": [q.model_dump(exclude={"ticker_context"}) for q in sample_questions]
+            }
+        )
+
+        agent = AssessmentAgent()
+        results = await agent.generate_contextual_assessment_questions_batch(
+            ["AAPL", "ASML", "AAPL"], use_cache=False, max_concurrency=2
+        )
+
+        assert list(results) == ["AAPL", "ASML"]
+        assert all(q.ticker_context == "ASML" for q in results["ASML"])
+        assert mock_client.acreate_structured_completion.await_count == 2
+
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    async def test_generate_contextual_assessment_questions_stream(
+        self, mock_client_class, sample_questions
+    ):
+        """Test that streamed questions are yielded as their JSON objects complete."""
+        document = orjson.dumps(
+            {"questions": [q.model_dump(exclude={"ticker_context"}) for q in sample_questions]}
+        ).decode()
+
+        async def fake_stream(**_):
+            for start in range(0, len(document), 37):
+                yield document[start : start + 37]
+
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.astream_structured_completion = fake_stream
+
+        agent = AssessmentAgent()
+        questions = [
+            q
+            async for q in agent.generate_contextual_assessment_questions_stream(
+                "AAPL", use_cache=False
+            )
+        ]
+
+        assert [q.id for q in questions] == [q.id for q in sample_questions]
+        assert all(q.ticker_context == "AAPL" for q in questions)
+        for streamed, original in zip(questions, sample_questions, strict=True):
+            assert (
+                streamed.options[streamed.correct_answer_index]
+                == original.options[original.correct_answer_index]
+            )
+
+    def test_question_messages_share_static_prefix(self, assessment_agent):
+        """Test that only the tail of the user message depends on the ticker."""
+        aapl = assessment_agent._build_question_messages("AAPL")
+        asml = assessment_agent._build_question_messages("ASML")
+
+        assert aapl[0] == asml[0]
+        assert "AAPL" not in aapl[0]["content"]
+        aapl_prefix, aapl_tail = aapl[1]["content"].rsplit("Ticker symbol:", 1)
+        asml_prefix, _ = asml[1]["content"].rsplit("Ticker symbol:", 1)
+        assert aapl_prefix == asml_prefix
+        assert "AAPL" in aapl_tail
+
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    def test_generate_contextual_assessment_questions_cache(
+        self, mock_client_class, sample_questions, tmp_path
+    ):
+        """Test that generated questions are persisted and served from the question bank."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.create_structured_completion.return_value = {
+            "questions": [q.model_dump(exclude={"ticker_context"}) for q in sample_questions]
+        }
+
+        agent = AssessmentAgent()
+        cache_file = tmp_path / "assessment_q_AAPL.json"
+
+        with patch.object(agent, "_questions_cache_path", return_value=str(cache_file)):
+            first = agent.generate_contextual_assessment_questions("AAPL")
+            second = agent.generate_contextual_assessment_questions("AAPL")
+            # A fresh agent has an empty in-memory bank and falls back to the file
+            third = AssessmentAgent()
+            with patch.object(third, "_questions_cache_path", return_value=str(cache_file)):
+                from_disk = third.generate_contextual_assessment_questions("AAPL")
+
+        assert cache_file.exists()
+        mock_client.create_structured_completion.assert_called_once()
+
+        # Same question bank, but answer positions are re-drawn for every request
+        def correct_answers(questions):
+            return [(q.id, q.question, q.options[q.correct_answer_index]) for q in questions]
+
+        assert correct_answers(second) == correct_answers(first)
+        assert correct_answers(from_disk) == correct_answers(first)
+        assert all(sorted(a.options) == sorted(b.options) for a, b in zip(first, second, strict=True))
+
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    def test_question_cache_expires_after_ttl(self, mock_client_class, sample_questions, tmp_path):
+        """Test that question sets older than the TTL are regenerated."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.create_structured_completion.side_effect = lambda **_: {
+            "questions": [q.model_dump(exclude={"ticker_context"}) for q in sample_questions]
+        }
+
+        agent = AssessmentAgent()
+        cache_file = tmp_path / "assessment_q_AAPL.json"
+
+        with (
+            patch.object(agent, "_questions_cache_path", return_value=str(cache_file)),
+            patch("src.agents.assessment_agent.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.question_cache_ttl_seconds = 0
+            agent.generate_contextual_assessment_questions("AAPL")
             agent.generate_contextual_assessment_questions("AAPL")
 
+        assert mock_client.create_structured_completion.call_count == 2
+
     @patch("src.agents.assessment_agent.OpenAIClient")
     def test_evaluate_user_expertise_success(
         self, mock_client_class, sample_questions, sample_responses
@@ -260,9 +462,37 @@ class TestAssessmentAgent:
         with pytest.raises(Exception, match="Evaluation Error"):
             agent.evaluate_user_expertise(sample_questions, sample_responses, "AAPL")
 
+    @patch("src.agents.assessment_agent.OpenAIClient")
+    async def test_evaluate_user_expertise_async(
+        self, mock_client_class, sample_questions, sample_responses
+    ):
+        """Test async expertise evaluation awaits the async client."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.acreate_structured_completion = AsyncMock(
+            return_value={
+                "expertise_level": 7,
+                "explanation": "Solid analytical grasp of the sector.",
+                "confidence_score": 0.8,
+            }
+        )
+
+        agent = AssessmentAgent()
+        result = await agent.evaluate_user_expertise_async(
+            sample_questions, sample_responses, "AAPL"
+        )
+
+        assert result.expertise_level == 7
+        assert result.report_complexity == "advanced"
+        assert result.ticker_context == "AAPL"
+        mock_client.acreate_structured_completion.assert_awaited_once()
+        mock_client.create_structured_completion.assert_not_called()
+
     def test_calculate_category_scores(self, assessment_agent, sample_questions, sample_responses):
         """Test category score calculation."""
-        scores = assessment_agent._calculate_category_scores(sample_questions, sample_responses)
+        scores = assessment_agent._calculate_category_scores(
+            sample_questions, index_responses(sample_responses)
+        )
 
         # Expected scores:
         # Q1: correct (1.0 points) -> general_investing
@@ -301,7 +531,7 @@ class TestAssessmentAgent:
             )
         ]
 
-        scores = assessment_agent._calculate_category_scores(questions, responses)
+        scores = assessment_agent._calculate_category_scores(questions, index_responses(responses))
         expected_score = 0.5 * 1.5  # partial_credit * weight
         assert scores["general_investing"] == expected_score
 
@@ -321,11 +551,18 @@ class TestAssessmentAgent:
         }
 
         # Calculate percentage and suggested level for the new signature
-        percentage_score = assessment_agent._calculate_score_percentage(sample_questions, sample_responses)
+        percentage_score = assessment_agent._calculate_score_percentage(
+            sample_questions, index_responses(sample_responses)
+        )
         suggested_level = assessment_agent._map_percentage_to_expertise_level(percentage_score)
 
         context = assessment_agent._create_evaluation_context(
-            sample_questions, sample_responses, score_breakdown, "AAPL", percentage_score, suggested_level
+            sample_questions,
+            index_responses(sample_responses),
+            score_breakdown,
+            "AAPL",
+            percentage_score,
+            suggested_level,
         )
 
         # Verify context contains expected elements
@@ -335,11 +572,19 @@ class TestAssessmentAgent:
         assert "Overall Score:" in context
         assert "Baseline-Adjusted Suggested Level:" in context
         assert "ADJUSTED SCORING SCALE" in context
-        assert "general_investing: 1.00 points" in context
-        assert "ticker_specific: 0.00 points" in context
-        assert "Q1 (Level 1, general_investing): ✓" in context
-        assert "Q2 (Level 5, ticker_specific): ✗" in context
-        assert "Q3 (Level 10, analytical_sophistication): ✓" in context
+
+        # Score breakdown and per-question details are embedded as JSON
+        payload = json.loads(context.split("RESPONSE DETAILS (JSON):\n", 1)[1])
+        assert payload["score_breakdown"]["general_investing"] == 1.0
+        assert payload["score_breakdown"]["ticker_specific"] == 0.0
+        assert [
+            (r["question_id"], r["difficulty_level"], r["category"], r["correct"])
+            for r in payload["responses"]
+        ] == [
+            (1, 1, "general_investing", True),
+            (2, 5, "ticker_specific", False),
+            (3, 10, "analytical_sophistication", True),
+        ]
 
     def test_get_question_generation_prompt(self, assessment_agent):
         """Test question generation prompt."""
@@ -367,16 +612,16 @@ class TestAssessmentAgent:
         """Test that generated questions follow expected distribution patterns."""
         # This would be an integration test with actual OpenAI calls
         # For unit testing, we verify the schema and validation logic
-        categories = [
+        categories = (
             "general_investing",
             "ticker_specific",
             "sector_expertise",
             "analytical_sophistication",
-        ]
+        )
 
         # Verify categories are properly defined
         agent = AssessmentAgent()
-        assert agent.categories == categories
+        assert agent.CATEGORIES == categories
 
         # Verify schema structure in question generation
         # This validates that the schema enforces 20 questions
@@ -398,7 +643,7 @@ class TestAssessmentAgent:
             )
         ]
 
-        scores = assessment_agent._calculate_category_scores(questions, [])
+        scores = assessment_agent._calculate_category_scores(questions, {})
         assert all(score == 0.0 for score in scores.values())
 
         # Test with mismatched question IDs (valid IDs but don't match questions)
@@ -412,5 +657,5 @@ class TestAssessmentAgent:
             )
         ]
 
-        scores = assessment_agent._calculate_category_scores(questions, responses)
+        scores = assessment_agent._calculate_category_scores(questions, index_responses(responses))
         assert all(score == 0.0 for score in scores.values())
@@ -6,6 +6,11 @@ from src.agents.assessment_agent import AssessmentAgent
 from src.models.assessment import AssessmentQuestion, AssessmentResponse
 
 
+def index_responses(responses: list[AssessmentResponse]) -> dict[int, AssessmentResponse]:
+    """Key responses by question id the way the agent's scoring helpers expect."""
+    return {r.question_id: r for r in responses}
+
+
 class TestAssessmentScoring:
     """Test suite for Assessment Agent scoring algorithms."""
 
@@ -94,7 +99,9 @@ class TestAssessmentScoring:
             AssessmentResponse(question_id=6, selected_option=1, correct_option=1, time_taken=35.0),
         ]
 
-        scores = assessment_agent._calculate_category_scores(varied_difficulty_questions, responses)
+        scores = assessment_agent._calculate_category_scores(
+            varied_difficulty_questions, index_responses(responses)
+        )
         max_score = assessment_agent._calculate_max_possible_score(varied_difficulty_questions)
 
         # Perfect score should equal max possible
@@ -120,7 +127,9 @@ class TestAssessmentScoring:
             AssessmentResponse(question_id=6, selected_option=0, correct_option=1, time_taken=35.0),
         ]
 
-        scores = assessment_agent._calculate_category_scores(varied_difficulty_questions, responses)
+        scores = assessment_agent._calculate_category_scores(
+            varied_difficulty_questions, index_responses(responses)
+        )
 
         # All scores should be zero
         assert all(score == 0.0 for score in scores.values())
@@ -148,7 +157,9 @@ class TestAssessmentScoring:
             ),  # Incorrect
         ]
 
-        scores = assessment_agent._calculate_category_scores(varied_difficulty_questions, responses)
+        scores = assessment_agent._calculate_category_scores(
+            varied_difficulty_questions, index_responses(responses)
+        )
 
         # Expected scores: Q1(1.0) + Q3(1.5) + Q5(2.0) = 4.5 total
         assert scores["general_investing"] == 3.0  # Q1(1.0) + Q5(2.0)
@@ -156,6 +167,37 @@ class TestAssessmentScoring:
         assert scores["sector_expertise"] == 1.5  # Q3(1.5)
         assert scores["analytical_sophistication"] == 0.0  # Q4 incorrect
 
+    def test_score_responses_matches_individual_helpers(
+        self, assessment_agent, varied_difficulty_questions
+    ):
+        """Test that the fused scoring pass agrees with the per-metric helpers."""
+        responses = index_responses(
+            [
+                AssessmentResponse(
+                    question_id=1, selected_option=0, correct_option=0, time_taken=10.0
+                ),
+                AssessmentResponse(
+                    question_id=3, selected_option=2, correct_option=2, time_taken=20.0
+                ),
+                AssessmentResponse(
+                    question_id=4, selected_option=0, correct_option=3, time_taken=25.0
+                ),
+            ]
+        )
+
+        breakdown, percentage = assessment_agent._score_responses(
+            varied_difficulty_questions, responses
+        )
+
+        assert breakdown == assessment_agent._calculate_category_scores(
+            varied_difficulty_questions, responses
+        )
+        assert percentage == assessment_agent._calculate_score_percentage(
+            varied_difficulty_questions, responses
+        )
+        max_score = assessment_agent._calculate_max_possible_score(varied_difficulty_questions)
+        assert percentage == pytest.approx(sum(breakdown.values()) / max_score * 100.0)
+
     def test_partial_credit_scoring(self, assessment_agent):
         """Test scoring with partial credit awards."""
         questions = [
@@ -198,7 +240,7 @@ class TestAssessmentScoring:
             ),
         ]
 
-        scores = assessment_agent._calculate_category_scores(questions, responses)
+        scores = assessment_agent._calculate_category_scores(questions, index_responses(responses))
 
         # Expected: Q1: 0.5 * 2.0 = 1.0, Q2: 0.25 * 1.5 = 0.375
         assert scores["general_investing"] == 1.0
@@ -285,15 +327,15 @@ class TestAssessmentScoring:
             AssessmentResponse(question_id=4, selected_option=3, correct_option=3, time_taken=20.0),
         ]
 
-        scores = assessment_agent._calculate_category_scores(questions, responses)
+        scores = assessment_agent._calculate_category_scores(questions, index_responses(responses))
 
         # Each category should have equal score
-        for category in assessment_agent.categories:
+        for category in assessment_agent.CATEGORIES:
             assert scores[category] == 1.5
 
     def test_edge_case_empty_responses(self, assessment_agent, varied_difficulty_questions):
         """Test scoring with no responses provided."""
-        scores = assessment_agent._calculate_category_scores(varied_difficulty_questions, [])
+        scores = assessment_agent._calculate_category_scores(varied_difficulty_questions, {})
 
         # All scores should be zero
         assert all(score == 0.0 for score in scores.values())
@@ -309,7 +351,9 @@ class TestAssessmentScoring:
             ),
         ]
 
-        scores = assessment_agent._calculate_category_scores(varied_difficulty_questions, responses)
+        scores = assessment_agent._calculate_category_scores(
+            varied_difficulty_questions, index_responses(responses)
+        )
 
         # All scores should be zero since no responses match questions
         assert all(score == 0.0 for score in scores.values())
@@ -334,9 +378,9 @@ class TestAssessmentScoring:
         ]
 
         # Calculate scores multiple times
-        scores1 = assessment_agent._calculate_category_scores(questions, responses)
-        scores2 = assessment_agent._calculate_category_scores(questions, responses)
-        scores3 = assessment_agent._calculate_category_scores(questions, responses)
+        scores1 = assessment_agent._calculate_category_scores(questions, index_responses(responses))
+        scores2 = assessment_agent._calculate_category_scores(questions, index_responses(responses))
+        scores3 = assessment_agent._calculate_category_scores(questions, index_responses(responses))
 
         # All calculations should yield identical results
         assert scores1 == scores2 == scores3
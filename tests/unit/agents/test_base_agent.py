@@ -2,11 +2,13 @@
 
 import shutil
 import tempfile
+from dataclasses import FrozenInstanceError
 from unittest.mock import patch
 
 import pytest
 
 from src.agents.base_agent import BaseAgent
+from src.models.collaboration import HandoffData
 from src.services.research_database import ResearchDatabase
 
 
@@ -74,12 +76,42 @@ class TestBaseAgent:
         )
 
         # Mock agent as strategic to get valuation context
-        with patch.object(mock_agent, '_get_agent_type', return_value='strategic'):
+        with patch.object(mock_agent, '_agent_type', 'strategic'):
             context = mock_agent.read_research_context(session_id, ticker)
 
         assert "valuation" in context["previous_research"]
         assert len(context["previous_research"]["valuation"]) == 1
 
+    def test_read_research_context_cached(self, temp_db):
+        """Test context reads are cached until a context file changes on disk."""
+        session_id = "test-session-123"
+        ticker = "AAPL"
+        temp_db.create_session_directory(session_id, ticker)
+        with patch('src.agents.base_agent.get_research_database', return_value=temp_db):
+            mock_agent = MockAgent("strategic_agent")
+
+        with patch.object(temp_db, 'get_agent_context', wraps=temp_db.get_agent_context) as mock_get:
+            first = mock_agent.read_research_context(session_id, ticker)
+            assert mock_agent.read_research_context(session_id, ticker) is first
+            assert mock_get.call_count == 1
+
+            # Writes by this agent land outside its own context and keep the cache
+            mock_agent.write_research_file(session_id, ticker, "notes.md", "content")
+            mock_agent.read_research_context(session_id, ticker)
+            assert mock_get.call_count == 1
+
+            # Another agent writing a context file is seen immediately
+            temp_db.write_research_file(session_id, ticker, "valuation", "valuation.md", "v1")
+            context = mock_agent.read_research_context(session_id, ticker)
+            assert mock_get.call_count == 2
+            assert len(context["previous_research"]["valuation"]) == 1
+
+            # So is a direct rewrite of that file outside the database
+            valuation_file = temp_db.sessions_path / session_id / ticker / "valuation" / "valuation.md"
+            valuation_file.write_text("rewritten with more content", encoding="utf-8")
+            mock_agent.read_research_context(session_id, ticker)
+            assert mock_get.call_count == 3
+
     def test_write_research_file(self, mock_agent, temp_db):
         """Test writing a research file."""
         session_id = "test-session-123"
@@ -117,6 +149,10 @@ class TestBaseAgent:
             "References financial data"
         )
 
+        # Cross-references are buffered until flushed
+        assert temp_db._read_cross_references(session_id, ticker)["references"] == []
+        mock_agent.flush_cross_references()
+
         # Verify cross-reference was added
         cross_refs = temp_db._read_cross_references(session_id, ticker)
         assert len(cross_refs["references"]) == 1
@@ -137,11 +173,15 @@ class TestBaseAgent:
             token_usage=1500
         )
 
-        assert handoff_data["research_files"] == research_files
-        assert handoff_data["context_summary"] == summary
-        assert handoff_data["confidence_metrics"]["confidence"] == 0.8
-        assert handoff_data["token_usage"] == 1500
-        assert "cross_references" in handoff_data
+        assert isinstance(handoff_data, HandoffData)
+        assert handoff_data.research_files == research_files
+        assert handoff_data.context_summary == summary
+        assert handoff_data.confidence_metrics["confidence"] == 0.8
+        assert handoff_data.token_usage == 1500
+        assert handoff_data.cross_references == []
+
+        with pytest.raises(FrozenInstanceError):
+            handoff_data.token_usage = 0
 
     def test_format_handoff_data_defaults(self, mock_agent):
         """Test formatting handoff data with default values."""
@@ -149,9 +189,30 @@ class TestBaseAgent:
             "session-123", "AAPL", ["file.md"], "Summary"
         )
 
-        assert handoff_data["confidence_metrics"]["confidence"] == 0.5
-        assert handoff_data["token_usage"] == 0
-        assert handoff_data["cross_references"] == []
+        assert handoff_data.confidence_metrics["confidence"] == 0.5
+        assert handoff_data.token_usage == 0
+        assert handoff_data.cross_references == []
+
+    def test_format_context_summary(self, mock_agent):
+        """Test formatting of previous agent summaries for prompts."""
+        context = {
+            "valuation": {"summary": "Valuation findings"},
+            "strategic": {"summary": "Strategic findings"},
+        }
+
+        summary = mock_agent.format_context_summary(context)
+        assert summary == (
+            "VALUATION CONTEXT:\nValuation findings\n\nSTRATEGIC CONTEXT:\nStrategic findings"
+        )
+
+        # Missing or summary-less agents are skipped
+        partial = mock_agent.format_context_summary(
+            {"strategic": {"summary": "Only strategic"}, "valuation": {}}
+        )
+        assert partial == "STRATEGIC CONTEXT:\nOnly strategic"
+
+        assert mock_agent.format_context_summary(None) == "No previous agent context provided."
+        assert mock_agent.format_context_summary({"valuation": None}, default="None") == "None"
 
     def test_get_agent_type_mapping(self, mock_agent):
         """Test agent type mapping from agent names."""
@@ -164,9 +225,10 @@ class TestBaseAgent:
         ]
 
         for agent_name, expected_type in test_cases:
-            mock_agent.agent_name = agent_name
-            agent_type = mock_agent._get_agent_type()
-            assert agent_type == expected_type
+            with patch('src.agents.base_agent.get_research_database', return_value=mock_agent.research_db):
+                agent = MockAgent(agent_name)
+            assert agent._get_agent_type() == expected_type
+            assert agent._agent_type == expected_type
 
     def test_validate_research_context(self, mock_agent):
         """Test research context validation."""
@@ -199,7 +261,9 @@ class TestBaseAgent:
             (7, "advanced"),
             (8, "advanced"),
             (9, "executive"),
-            (10, "executive")
+            (10, "executive"),
+            (0, "foundational"),
+            (11, "executive")
         ]
 
         for expertise_level, expected_depth in test_cases:
@@ -212,7 +276,7 @@ class TestBaseAgent:
             mock_agent.log_research_start("session-123", "AAPL", 5)
 
             mock_log.assert_called_once()
-            call_args = mock_log.call_args[0][0]
+            call_args = mock_log.call_args[0][0] % mock_log.call_args[0][1:]
             assert "Starting test_agent research" in call_args
             assert "AAPL" in call_args
             assert "Session: session-123" in call_args
@@ -227,7 +291,7 @@ class TestBaseAgent:
             mock_agent.log_research_complete("session-123", "AAPL", files_created)
 
             mock_log.assert_called_once()
-            call_args = mock_log.call_args[0][0]
+            call_args = mock_log.call_args[0][0] % mock_log.call_args[0][1:]
             assert "Completed test_agent research" in call_args
             assert "AAPL" in call_args
             assert "Session: session-123" in call_args
@@ -244,10 +308,11 @@ class TestBaseAgent:
 
     def test_add_cross_reference_error_handling(self, mock_agent):
         """Test error handling in add_cross_reference."""
-        with patch.object(mock_agent.research_db, 'add_cross_reference', side_effect=Exception("Test error")):
+        with patch.object(mock_agent.research_db, 'add_cross_references', side_effect=Exception("Test error")):
             with patch.object(mock_agent.logger, 'error') as mock_log:
                 # Should not raise exception, just log error
                 mock_agent.add_cross_reference("session-123", "AAPL", "source.md", "target.md", "relationship")
+                mock_agent.flush_cross_references()
 
                 mock_log.assert_called_once()
                 assert "Error adding cross-reference" in mock_log.call_args[0][0]
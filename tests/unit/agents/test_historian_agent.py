@@ -1,13 +1,15 @@
 """Unit tests for HistorianAgent with 2-step workflow."""
 
+import asyncio
 import os
-from datetime import datetime
-from unittest.mock import mock_open, patch
+import time
+from unittest.mock import patch
 
 import pytest
 
-from src.agents.historian_agent import HistorianAgent
+from src.agents.historian_agent import HistorianAgent, _LogThrottle
 from src.models.collaboration import AgentResult
+from src.services.research_database import ResearchDatabase
 
 
 class TestHistorianAgent:
@@ -190,15 +192,14 @@ Apple Computer Company founded April 1, 1976 in Los Altos garage by Steve Jobs (
 
         with patch.object(agent.openai_client, "respond_with_web_search") as mock_research, patch.object(
             agent.openai_client, "create_completion"
-        ) as mock_analysis, patch.object(agent, "_write_research_files") as mock_write:
+        ) as mock_analysis, patch.object(agent, "_write_research_files") as mock_write, patch.object(
+            agent, "write_research_file"
+        ) as mock_write_file:
 
             # Setup mocks
             mock_research.return_value = mock_research_response
             mock_analysis.return_value = mock_history_response
-            mock_write.return_value = [
-                f"research_database/sessions/{session_id}/{ticker}/historical/temp_history.md",
-                f"research_database/sessions/{session_id}/{ticker}/historical/company_history.md",
-            ]
+            mock_write.return_value = ["historical/temp_history.md", "historical/company_history.md"]
 
             # Execute test
             result = await agent.conduct_research(session_id, ticker, expertise_level, mock_context)
@@ -216,6 +217,69 @@ Apple Computer Company founded April 1, 1976 in Los Altos garage by Steve Jobs (
             mock_analysis.assert_called_once()
             mock_write.assert_called_once()
 
+            # The raw research is written alongside step 2 and handed over as a task
+            mock_write_file.assert_called_once_with(
+                session_id, ticker, "temp_history.md", mock_research_response
+            )
+            assert mock_write.call_args.kwargs["temp_write"] is not None
+
+    @pytest.mark.asyncio
+    async def test_conduct_research_batch(self):
+        """Test batch research dedupes tickers and bounds concurrency."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_research(self, session_id, ticker, expertise_level, context=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return AgentResult(
+                agent_name="historian_agent",
+                success=True,
+                research_files_created=[],
+                summary=f"Historical analysis for {ticker}",
+                error_message=None,
+                token_usage=0,
+                execution_time_seconds=0.01,
+                confidence_score=0.8,
+            )
+
+        with patch.object(HistorianAgent, "conduct_research", fake_research):
+            results = await HistorianAgent.conduct_research_batch(
+                "test_session_123", ["AAPL", "MSFT", "AAPL", "GOOG", "NVDA"], 5, max_concurrency=2
+            )
+
+        assert list(results) == ["AAPL", "MSFT", "GOOG", "NVDA"]
+        assert all(result.success for result in results.values())
+        assert results["MSFT"].summary == "Historical analysis for MSFT"
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_progress_logs_throttled(self, agent):
+        """Test sampled progress logging keeps errors unthrottled."""
+        agent._progress_throttle = _LogThrottle(3)
+
+        with patch.object(agent, "_run_research_phase", return_value="research"), patch.object(
+            agent, "_run_analysis_phase", return_value="analysis"
+        ), patch.object(agent, "write_research_file", return_value="historical/file.md"), patch.object(
+            agent, "log_research_start"
+        ) as mock_start:
+            for index in range(6):
+                await agent.conduct_research("test_session_123", f"T{index}", 5)
+
+        assert mock_start.call_count == 2
+        assert [call.args[1] for call in mock_start.call_args_list] == ["T0", "T3"]
+
+        with patch.object(agent, "_run_research_phase", side_effect=Exception("boom")), patch(
+            "src.agents.historian_agent.logger"
+        ) as mock_logger:
+            await agent.conduct_research("test_session_123", "T6", 5)
+            await agent.conduct_research("test_session_123", "T7", 5)
+
+        assert mock_logger.error.call_count == 2
+
     @pytest.mark.asyncio
     async def test_run_research_phase(self, agent):
         """Test research phase with GPT-5 web search."""
@@ -298,28 +362,29 @@ Apple Computer Company founded April 1, 1976 in Los Altos garage by Steve Jobs (
             assert "No previous agent context provided" in prompt_content
 
     @pytest.mark.asyncio
-    async def test_write_research_files(self, agent):
+    async def test_write_research_files(self, agent, tmp_path):
         """Test historical research file writing to database."""
         session_id = "test_session_123"
         ticker = "AAPL"
         temp_md = "Historical research data"
         history_md = "Company history analysis"
 
-        with patch("builtins.open", mock_open()) as mock_file, patch("os.makedirs") as mock_makedirs:
+        agent.research_db = ResearchDatabase(base_path=str(tmp_path))
+        agent.research_db.create_session_directory(session_id, ticker)
 
-            result = await agent._write_research_files(session_id, ticker, temp_md, history_md)
+        result = await agent._write_research_files(session_id, ticker, temp_md, history_md)
 
-            # Verify file paths
-            assert len(result) == 2
-            assert "temp_history.md" in result[0]
-            assert "company_history.md" in result[1]
-            assert session_id in result[0]
-            assert ticker in result[0]
-            assert "historical" in result[0]
+        # Verify file paths relative to the session directory
+        assert result == ["historical/temp_history.md", "historical/company_history.md"]
 
-            # Verify files were written
-            assert mock_file.call_count == 2
-            mock_makedirs.assert_called()
+        # Verify files were written once each, with metadata, and indexed
+        temp_file = agent.research_db.read_research_file(session_id, ticker, result[0])
+        history_file = agent.research_db.read_research_file(session_id, ticker, result[1])
+        assert temp_file["content"] == temp_md
+        assert history_file["content"] == history_md
+        assert history_file["metadata"]["author"] == "historian_agent"
+        indexed = {f["path"] for f in agent.research_db.get_session_files(session_id, ticker)}
+        assert set(result) <= indexed
 
     def test_get_expertise_depth_config(self, agent):
         """Test expertise level mapping."""
@@ -333,6 +398,10 @@ Apple Computer Company founded April 1, 1976 in Los Altos garage by Steve Jobs (
         config_10 = agent._get_expertise_depth_config(10)
         assert config_10["depth_name"] == "Executive"
 
+        # Out-of-range levels clamp to the nearest depth
+        assert agent._get_expertise_depth_config(0)["depth_name"] == "Foundational"
+        assert agent._get_expertise_depth_config(11)["depth_name"] == "Executive"
+
     @pytest.mark.asyncio
     async def test_error_handling_research_phase(self, agent):
         """Test error handling in research phase."""
@@ -406,11 +475,10 @@ Apple Computer Company founded April 1, 1976 in Los Altos garage by Steve Jobs (
 
     def test_create_error_result(self, agent):
         """Test error result creation."""
-        from datetime import UTC
         session_id = "test_session_123"
         ticker = "INVALID"
         error_message = "Test error"
-        start_time = datetime.now(UTC)
+        start_time = time.perf_counter()
 
         result = agent._create_error_result(session_id, ticker, error_message, start_time)
 
@@ -420,6 +488,7 @@ Apple Computer Company founded April 1, 1976 in Los Altos garage by Steve Jobs (
         assert result.error_message == error_message
         assert ticker in result.summary
         assert result.confidence_score == 0.0
+        assert 0 <= result.execution_time_seconds < 1
 
     def test_agent_initialization(self, agent):
         """Test agent initialization."""
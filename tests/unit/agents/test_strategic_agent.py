@@ -1,12 +1,21 @@
 """Unit tests for StrategicAgent with 2-step workflow."""
 
+import asyncio
 import os
-from datetime import datetime
+import threading
+import time
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from src.agents.strategic_agent import StrategicAgent
+from src.agents.strategic_agent import (
+    ANALYSIS_PROMPT_CACHE_KEYS,
+    ANALYSIS_SYSTEM_PROMPT,
+    OPENAI_TPM_LIMIT,
+    RESEARCH_COMPRESSION_THRESHOLD_CHARS,
+    RESEARCH_TOPICS,
+    StrategicAgent,
+)
 from src.models.collaboration import AgentResult
 
 
@@ -138,10 +147,108 @@ class TestStrategicAgent:
             assert result.confidence_score == 0.8
 
             # Verify method calls
-            mock_research.assert_called_once()
+            assert mock_research.call_count == len(RESEARCH_TOPICS)
             mock_analysis.assert_called_once()
             mock_write.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_conduct_research_batch(self, agent):
+        """Test batch analysis dedupes tickers, bounds concurrency and isolates failures."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_research(session_id, ticker, expertise_level, context=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if ticker == "FAIL":
+                raise RuntimeError("boom")
+            return AgentResult(
+                agent_name="strategic_agent",
+                success=True,
+                research_files_created=[],
+                summary=f"Strategic analysis for {ticker}",
+                error_message=None,
+                token_usage=0,
+                execution_time_seconds=0.01,
+                confidence_score=0.8,
+            )
+
+        with patch.object(agent, "conduct_research", side_effect=fake_research):
+            results = await agent.conduct_research_batch(
+                "test_session_123", ["AAPL", "MSFT", "AAPL", "FAIL", "GOOG"], 5, max_concurrency=2
+            )
+
+        assert list(results) == ["AAPL", "MSFT", "FAIL", "GOOG"]
+        assert results["MSFT"].summary == "Strategic analysis for MSFT"
+        assert results["FAIL"].success is False
+        assert results["FAIL"].error_message == "boom"
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_conduct_research_batch_overlaps_analysis(self, agent, mock_research_response):
+        """Test Step 2 calls for batched tickers run concurrently off the event loop."""
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def slow_analysis(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.3)
+            with lock:
+                in_flight -= 1
+            return "# Strategic Analysis"
+
+        with patch.object(
+            agent.openai_client, "respond_with_web_search", return_value=mock_research_response
+        ), patch.object(
+            agent.openai_client, "create_completion", side_effect=slow_analysis
+        ), patch.object(agent, "_write_research_files", return_value=[]):
+            start = time.perf_counter()
+            results = await agent.conduct_research_batch(
+                "test_session_123", ["AAPL", "MSFT", "GOOG", "AMZN"], 5
+            )
+            elapsed = time.perf_counter() - start
+
+        assert all(result.success for result in results.values())
+        assert peak == 4
+        assert elapsed < 0.9
+
+    @pytest.mark.asyncio
+    async def test_conduct_research_batch_bounds_topic_tokens(self, agent, mock_research_response):
+        """Test batched topic searches never reserve more output tokens than the TPM limit."""
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def slow_search(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return mock_research_response
+
+        with patch.object(
+            agent.openai_client, "respond_with_web_search", side_effect=slow_search
+        ), patch.object(
+            agent.openai_client, "create_completion", return_value="# Strategic Analysis"
+        ), patch.object(agent, "_write_research_files", return_value=[]):
+            results = await agent.conduct_research_batch(
+                "test_session_123", [f"T{i}" for i in range(10)], 1
+            )
+
+        assert all(result.success for result in results.values())
+        assert 1 < peak <= OPENAI_TPM_LIMIT // 12000
+        assert agent._topic_tokens_in_flight == 0
+
     @pytest.mark.asyncio
     async def test_run_research_phase(self, agent):
         """Test research phase with GPT-5 web search."""
@@ -149,22 +256,74 @@ class TestStrategicAgent:
         ticker = "AAPL"
         expertise_level = 5
 
-        mock_response = "Mock competitive data with [Source: Industry Report]"
+        def topic_response(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            title = next(title for title, _ in RESEARCH_TOPICS if f"**{title}**" in prompt)
+            return f"## {title}\n\nMock data with [Source: Industry Report]"
 
         with patch.object(agent.openai_client, "respond_with_web_search") as mock_web_search:
-            mock_web_search.return_value = mock_response
+            mock_web_search.side_effect = topic_response
 
             result = await agent._run_research_phase(session_id, ticker, expertise_level)
 
-            assert result == mock_response
-            mock_web_search.assert_called_once()
+            # One web search per priority area, joined in topic order
+            assert mock_web_search.call_count == len(RESEARCH_TOPICS)
+            assert result == "\n\n".join(
+                f"## {title}\n\nMock data with [Source: Industry Report]"
+                for title, _ in RESEARCH_TOPICS
+            )
 
             # Verify correct parameters passed
-            call_args = mock_web_search.call_args
-            messages = call_args[1]["messages"]
-            assert any(ticker in str(msg) for msg in messages)
-            assert call_args[1]["reasoning_effort"] == "low"
-            assert call_args[1]["max_output_tokens"] == 64000
+            depth_config = agent._get_expertise_depth_config(expertise_level)
+            for call_args in mock_web_search.call_args_list:
+                messages = call_args[1]["messages"]
+                assert any(ticker in str(msg) for msg in messages)
+                assert call_args[1]["reasoning_effort"] == "low"
+                assert call_args[1]["max_output_tokens"] == depth_config["research_max_tokens"]
+
+    @pytest.mark.asyncio
+    async def test_run_research_phase_partial_failure(self, agent):
+        """Test a failed research topic is marked without losing the others."""
+        responses = iter(["## Topic data"] * (len(RESEARCH_TOPICS) - 1))
+
+        def flaky_search(**kwargs):
+            if "**Strategic risks**" in kwargs["messages"][1]["content"]:
+                raise Exception("Search timeout")
+            return next(responses)
+
+        with patch.object(agent.openai_client, "respond_with_web_search", side_effect=flaky_search):
+            result = await agent._run_research_phase("test_session_123", "AAPL", 5)
+
+        assert result.count("## Topic data") == len(RESEARCH_TOPICS) - 1
+        assert "## Strategic risks\n\n[Research unavailable: Search timeout]" in result
+        assert "Strategic Research Failed" not in result
+
+    @pytest.mark.asyncio
+    async def test_response_cache(self, agent, mock_research_response, mock_valuation_context):
+        """Test repeat requests reuse cached responses until the TTL expires."""
+        with patch.object(
+            agent.openai_client, "respond_with_web_search", return_value="## Topic data"
+        ) as mock_web_search, patch.object(
+            agent.openai_client, "create_completion", return_value="# Strategic Analysis"
+        ) as mock_completion:
+            first = await agent._run_research_phase("session_1", "AAPL", 5)
+            second = await agent._run_research_phase("session_2", "AAPL", 5)
+            await agent._run_research_phase("session_2", "AAPL", 8)
+
+            await agent._run_analysis_phase(
+                "session_1", "AAPL", 5, mock_research_response, mock_valuation_context
+            )
+            await agent._run_analysis_phase(
+                "session_2", "AAPL", 5, mock_research_response, mock_valuation_context
+            )
+            await agent._run_analysis_phase("session_2", "AAPL", 5, mock_research_response, None)
+
+            agent._response_cache_ttl = 0
+            await agent._run_research_phase("session_3", "AAPL", 5)
+
+        assert first == second
+        assert mock_web_search.call_count == 3 * len(RESEARCH_TOPICS)
+        assert mock_completion.call_count == 2
 
     @pytest.mark.asyncio
     async def test_run_analysis_phase(self, agent, mock_research_response, mock_valuation_context):
@@ -195,8 +354,39 @@ class TestStrategicAgent:
 
             # Verify GPT-5 parameters
             assert call_args[1]["max_tokens"] == 16000
+            assert call_args[1]["reasoning_effort"] == "low"
             assert call_args[1]["use_complex_model"] is True
 
+    @pytest.mark.asyncio
+    async def test_run_analysis_phase_compresses_long_research(self, agent):
+        """Test long research is condensed by the simple model before Step 2."""
+        long_research = "## Competitive positioning\n" + "x" * RESEARCH_COMPRESSION_THRESHOLD_CHARS
+
+        with patch.object(
+            agent.openai_client,
+            "create_completion",
+            side_effect=["## Competitive positioning\nCondensed", "# Strategic Analysis"],
+        ) as mock_completion:
+            result = await agent._run_analysis_phase("test_session_123", "AAPL", 5, long_research)
+
+        assert result == "# Strategic Analysis"
+        compress_call, analysis_call = mock_completion.call_args_list
+        assert compress_call[1]["use_complex_model"] is False
+        assert compress_call[1]["messages"][1]["content"] == long_research
+        analysis_prompt = analysis_call[1]["messages"][1]["content"]
+        assert "Condensed" in analysis_prompt
+        assert long_research not in analysis_prompt
+
+    @pytest.mark.asyncio
+    async def test_compress_research_falls_back_on_error(self, agent):
+        """Test a failed compression keeps the full research."""
+        long_research = "x" * (RESEARCH_COMPRESSION_THRESHOLD_CHARS + 1)
+
+        with patch.object(
+            agent.openai_client, "create_completion", side_effect=Exception("Rate limited")
+        ):
+            assert await agent._compress_research("AAPL", long_research) == long_research
+
     @pytest.mark.asyncio
     async def test_run_analysis_phase_no_valuation_context(self, agent, mock_research_response):
         """Test strategic analysis phase without valuation context."""
@@ -222,6 +412,31 @@ class TestStrategicAgent:
             prompt_content = str(messages)
             assert "No valuation context provided" in prompt_content
 
+    @pytest.mark.asyncio
+    async def test_analysis_prompt_prefix_shared_across_tickers(self, agent, mock_research_response):
+        """Test the static framework leads the prompt and is identical for every ticker."""
+        with patch.object(agent.openai_client, "create_completion") as mock_completion:
+            mock_completion.return_value = "analysis"
+
+            await agent._run_analysis_phase("s1", "AAPL", 5, mock_research_response)
+            await agent._run_analysis_phase("s2", "MSFT", 6, "Other research")
+            await agent._run_analysis_phase("s3", "GOOG", 9, "Other research")
+
+        first, second, third = (call[1]["messages"] for call in mock_completion.call_args_list)
+        assert first[0] == second[0] == third[0]
+        assert first[0] == {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT}
+        assert "Porter's Five Forces" in first[0]["content"]
+        assert "AAPL" not in first[0]["content"]
+        assert "AAPL" in first[1]["content"] and "MSFT" in second[1]["content"]
+
+        # Cache routing keys are shared across tickers at the same depth
+        first_key, second_key, third_key = (
+            call[1]["prompt_cache_key"] for call in mock_completion.call_args_list
+        )
+        assert first_key == second_key == ANALYSIS_PROMPT_CACHE_KEYS["Intermediate"]
+        assert third_key == ANALYSIS_PROMPT_CACHE_KEYS["Executive"]
+        assert len(set(ANALYSIS_PROMPT_CACHE_KEYS.values())) == 5
+
     @pytest.mark.asyncio
     async def test_write_research_files(self, agent):
         """Test strategic research file writing to database."""
@@ -246,6 +461,22 @@ class TestStrategicAgent:
             assert mock_file.call_count == 2
             mock_makedirs.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_write_research_files_creates_directory_once(self, agent, tmp_path, monkeypatch):
+        """Test the research directory is created once and reused by later writes."""
+        monkeypatch.chdir(tmp_path)
+
+        with patch("os.makedirs", wraps=os.makedirs) as mock_makedirs:
+            first = await agent._write_research_files("test_session_123", "AAPL", "v1", "v1")
+            second = await agent._write_research_files("test_session_123", "AAPL", "v2", "v2")
+
+        # os.makedirs recurses for missing parents, so count calls for the leaf directory
+        assert first == second
+        created = [call.args[0] for call in mock_makedirs.call_args_list]
+        assert created.count(os.path.dirname(first[0])) == 1
+        with open(second[1], encoding="utf-8") as f:
+            assert f.read() == "v2"
+
     def test_get_expertise_depth_config(self, agent):
         """Test expertise level mapping."""
         # Test different expertise levels
@@ -258,6 +489,21 @@ class TestStrategicAgent:
         config_10 = agent._get_expertise_depth_config(10)
         assert config_10["depth_name"] == "Executive"
 
+        # Token ceilings shrink with report length; only low levels use minimal reasoning
+        assert config_1["research_max_tokens"] > config_10["research_max_tokens"]
+        assert config_1["analysis_max_tokens"] > config_10["analysis_max_tokens"]
+        assert config_1["analysis_reasoning_effort"] == "minimal"
+        assert agent._get_expertise_depth_config(4)["analysis_reasoning_effort"] == "minimal"
+        assert config_5["analysis_reasoning_effort"] == "low"
+
+        # Out-of-range levels fall back to Intermediate
+        assert agent._get_expertise_depth_config(0)["depth_name"] == "Intermediate"
+        assert agent._get_expertise_depth_config(11)["depth_name"] == "Intermediate"
+
+        # Configs are shared, so they must be read-only
+        with pytest.raises(TypeError):
+            config_1["depth_name"] = "Changed"
+
     def test_get_strategic_framework(self, agent):
         """Test strategic analysis framework."""
         framework = agent._get_strategic_framework()
@@ -324,6 +570,25 @@ class TestStrategicAgent:
             assert len(result.research_files_created) == 0
             assert result.confidence_score == 0.0
 
+    @pytest.mark.asyncio
+    async def test_conduct_research_skips_analysis_after_research_failure(self, agent):
+        """Test a failed research phase keeps its report and skips the GPT-5 analysis."""
+        with patch.object(
+            agent.openai_client, "respond_with_web_search", side_effect=Exception("API Error")
+        ), patch.object(agent, "_run_analysis_phase") as mock_analysis, patch.object(
+            agent, "_write_research_file"
+        ) as mock_write:
+            result = await agent.conduct_research("test_session_123", "INVALID", 5)
+
+        mock_analysis.assert_not_called()
+        assert result.success is False
+        assert result.error_message == "Strategic research phase failed"
+        assert len(result.research_files_created) == 1
+        assert result.research_files_created[0].endswith("strategic/temp_competition.md")
+        written_path, written_md = mock_write.call_args[0]
+        assert written_path == result.research_files_created[0]
+        assert "Strategic Research Failed" in written_md and "API Error" in written_md
+
     def test_create_execution_summary(self, agent):
         """Test execution summary creation."""
         ticker = "AAPL"
@@ -343,11 +608,10 @@ class TestStrategicAgent:
 
     def test_create_error_result(self, agent):
         """Test error result creation."""
-        from datetime import UTC
         session_id = "test_session_123"
         ticker = "INVALID"
         error_message = "Test error"
-        start_time = datetime.now(UTC)
+        start_time = time.perf_counter()
 
         result = agent._create_error_result(session_id, ticker, error_message, start_time)
 
@@ -357,6 +621,7 @@ class TestStrategicAgent:
         assert result.error_message == error_message
         assert ticker in result.summary
         assert result.confidence_score == 0.0
+        assert 0 <= result.execution_time_seconds < 1
 
     def test_agent_initialization(self, agent):
         """Test agent initialization."""
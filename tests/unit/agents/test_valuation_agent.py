@@ -1,11 +1,15 @@
 """Unit tests for new GPT-5 ValuationAgent with 2-step workflow."""
 
+import asyncio
 import os
+import time
 from unittest.mock import MagicMock, patch, mock_open
 from datetime import datetime
 
+import orjson
 import pytest
 
+from src.agents import valuation_agent
 from src.agents.valuation_agent import ValuationAgent
 from src.models.collaboration import AgentResult
 
@@ -13,6 +17,13 @@ from src.models.collaboration import AgentResult
 class TestNewValuationAgent:
     """Test suite for new GPT-5 ValuationAgent implementation."""
 
+    @pytest.fixture(autouse=True)
+    def research_cache_dir(self, tmp_path, monkeypatch):
+        """Keep the research cache per test so cached responses never leak between tests."""
+        cache_dir = str(tmp_path / "valuation_cache")
+        monkeypatch.setattr(valuation_agent, "RESEARCH_CACHE_DIR", cache_dir)
+        return cache_dir
+
     @pytest.fixture
     def agent(self):
         """Create ValuationAgent instance for testing."""
@@ -102,6 +113,42 @@ class TestNewValuationAgent:
             mock_valuation.assert_called_once()
             mock_write.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_conduct_research_batch(self, agent):
+        """Test batch valuation dedupes tickers, bounds concurrency and isolates failures."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_research(session_id, ticker, expertise_level, context=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if ticker == "FAIL":
+                raise RuntimeError("boom")
+            return AgentResult(
+                agent_name="valuation_agent",
+                success=True,
+                research_files_created=[],
+                summary=f"Valuation for {ticker}",
+                error_message=None,
+                token_usage=0,
+                execution_time_seconds=0.01,
+                confidence_score=0.8,
+            )
+
+        with patch.object(agent, 'conduct_research', side_effect=fake_research):
+            results = await agent.conduct_research_batch(
+                "test_session_123", ["AAPL", "MSFT", "AAPL", "FAIL", "GOOG"], 5, max_concurrency=2
+            )
+
+        assert list(results) == ["AAPL", "MSFT", "FAIL", "GOOG"]
+        assert results["MSFT"].summary == "Valuation for MSFT"
+        assert results["FAIL"].success is False
+        assert results["FAIL"].error_message == "boom"
+        assert peak == 2
+
     @pytest.mark.asyncio
     async def test_run_research_phase(self, agent):
         """Test research phase with GPT-5 web search."""
@@ -126,6 +173,175 @@ class TestNewValuationAgent:
             assert call_args[1]['reasoning_effort'] == "low"
             assert call_args[1]['max_output_tokens'] == 64000
 
+    @pytest.mark.asyncio
+    async def test_research_cache(self, agent, research_cache_dir):
+        """Test research is reused across sessions until the TTL expires."""
+        with patch.object(
+            agent.openai_client, 'respond_with_web_search', return_value="AAPL data [Source: 10-K]"
+        ) as mock_web_search:
+            first = await agent._run_research_phase("session_1", "AAPL", 5)
+            second = await agent._run_research_phase("session_2", "AAPL", 5)
+            assert mock_web_search.call_count == 1
+
+            # A different depth sends a different prompt, so it has its own entry
+            await agent._run_research_phase("session_2", "AAPL", 9)
+            assert mock_web_search.call_count == 2
+
+            agent._research_cache_ttl = 0
+            await agent._run_research_phase("session_3", "AAPL", 5)
+            assert mock_web_search.call_count == 3
+
+        assert first == second == "AAPL data [Source: 10-K]"
+        assert ValuationAgent.cache_clear() == 2
+        assert os.listdir(research_cache_dir) == []
+
+    @pytest.mark.asyncio
+    async def test_research_cache_skips_failures(self, agent):
+        """Test a failed research call is not cached."""
+        with patch.object(
+            agent.openai_client, 'respond_with_web_search', side_effect=[Exception("API Error"), "AAPL data"]
+        ) as mock_web_search:
+            failed = await agent._run_research_phase("session_1", "AAPL", 5)
+            retried = await agent._run_research_phase("session_2", "AAPL", 5)
+
+        assert "Research Failed" in failed
+        assert retried == "AAPL data"
+        assert mock_web_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tickers_do_not_block_event_loop(self, agent):
+        """Test the blocking OpenAI calls overlap when tickers run concurrently."""
+        def slow_call(**kwargs):
+            time.sleep(0.2)
+            return "data"
+
+        with patch.object(agent.openai_client, 'respond_with_web_search', side_effect=slow_call), \
+             patch.object(agent.openai_client, 'create_completion', side_effect=slow_call), \
+             patch.object(agent, '_write_research_files', return_value=["temp.md", "valuation.md"]):
+            start = time.perf_counter()
+            await agent.conduct_research("session_1", "AAPL", 5)
+            single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(agent.conduct_research("session_2", ticker, 5) for ticker in ("MSFT", "GOOG", "AMZN"))
+            )
+            concurrent = time.perf_counter() - start
+
+        assert all(result.success for result in results)
+        assert concurrent < 1.5 * single
+
+    @pytest.fixture
+    def research_payload(self):
+        """Structured Step 1 output as returned by the Responses API."""
+        return orjson.dumps({
+            "currency": "USD",
+            "price": 227.76,
+            "price_date": "2025-08-22",
+            "fcf_per_share": 6.97,
+            "fcf_per_share_history": [
+                {"period": "FY2023", "value": 6.13},
+                {"period": "FY2024", "value": 6.97},
+            ],
+            "shares_out": 15204.0,
+            "net_share_change_pct": -2.6,
+            "net_debt": None,
+            "growth_guidance": "Services: high single digit",
+            "citations": [{"figure": "price", "source": "NASDAQ", "date": "2025-08-22"}],
+            "notes": "",
+        }).decode()
+
+    @pytest.mark.asyncio
+    async def test_structured_research_is_rendered(self, agent, research_payload):
+        """Test Step 1 requests the research schema and renders the payload compactly."""
+        with patch.object(
+            agent.openai_client, 'respond_with_web_search', return_value=research_payload
+        ) as mock_web_search:
+            research = await agent._run_research_phase("session_1", "AAPL", 5)
+            cached = await agent._run_research_phase("session_2", "AAPL", 5)
+
+        text_format = mock_web_search.call_args[1]['text_format']
+        assert text_format['type'] == "json_schema" and text_format['strict'] is True
+        assert research == cached == research_payload
+
+        temp_md = agent._render_research(research)
+        assert 'price: 227.76' in temp_md
+        assert '  "FY2023": 6.13' in temp_md
+        assert 'growth_guidance: "Services: high single digit"' in temp_md
+        assert 'net_debt: null' in temp_md
+        assert agent._extract_citations_from_response(temp_md) == ["NASDAQ, 2025-08-22"]
+
+    @pytest.mark.asyncio
+    async def test_structured_research_keeps_raw_payload(
+        self, agent, research_payload, tmp_path, monkeypatch
+    ):
+        """Test temp.json keeps the raw payload while Step 2 reads the rendered view."""
+        monkeypatch.chdir(tmp_path)
+        valuation_dir = tmp_path / "research_database/sessions/s1/AAPL/valuation"
+
+        with patch.object(
+            agent.openai_client, 'respond_with_web_search', return_value=research_payload
+        ), patch.object(
+            agent.openai_client, 'create_completion', return_value="# Valuation"
+        ) as mock_completion:
+            result = await agent.conduct_research("s1", "AAPL", 5)
+
+        prompt = mock_completion.call_args[1]['messages'][1]['content']
+        assert agent._render_research(research_payload) in prompt
+        assert research_payload not in prompt
+        assert result.research_files_created[-1].endswith("valuation/temp.json")
+        assert (valuation_dir / "temp.json").read_text(encoding="utf-8") == research_payload
+        assert (valuation_dir / "temp.md").read_text(encoding="utf-8") == (
+            agent._render_research(research_payload)
+        )
+
+    @pytest.mark.asyncio
+    async def test_poll_batch_keeps_raw_payload(self, agent, research_payload, tmp_path, monkeypatch):
+        """Test batch research is also persisted verbatim as temp.json."""
+        monkeypatch.chdir(tmp_path)
+        with patch.object(agent.openai_client, 'submit_batch', return_value="batch_123"):
+            await agent.submit_batch("s1", ["AAPL"], 5)
+
+        with patch.object(
+            agent.openai_client, 'retrieve_batch_output',
+            return_value={"s1:AAPL:research": research_payload},
+        ), patch.object(agent, '_run_valuation_phase', return_value="# Valuation") as mock_valuation:
+            await agent.poll_batch("s1", "batch_123")
+
+        assert mock_valuation.call_args[0][3] == agent._render_research(research_payload)
+        temp_json = tmp_path / "research_database/sessions/s1/AAPL/valuation/temp.json"
+        assert temp_json.read_text(encoding="utf-8") == research_payload
+
+    def test_render_research_passes_through_prose(self, agent):
+        """Test output that is not a research payload is used as-is."""
+        assert agent._render_research("# AAPL Research\n- FCF: $100B") == "# AAPL Research\n- FCF: $100B"
+        assert agent._render_research('["not", "a", "payload"]') == '["not", "a", "payload"]'
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_are_coalesced(self, agent):
+        """Test a concurrent burst for the same ticker issues one call per phase."""
+        def slow_web_search(**kwargs):
+            time.sleep(0.05)
+            return "AAPL data"
+
+        with patch.object(
+            agent.openai_client, 'respond_with_web_search', side_effect=slow_web_search
+        ) as mock_web_search, patch.object(
+            agent.openai_client, 'create_completion', return_value="AAPL valuation"
+        ) as mock_completion:
+            research = await asyncio.gather(
+                *(agent._run_research_phase(f"session_{i}", "AAPL", 5) for i in range(3))
+            )
+            valuations = await asyncio.gather(
+                *(agent._run_valuation_phase(f"session_{i}", "AAPL", 5, "AAPL data") for i in range(3))
+            )
+
+        assert research == ["AAPL data"] * 3
+        assert valuations == ["AAPL valuation"] * 3
+        assert mock_web_search.call_count == 1
+        assert mock_completion.call_count == 1
+        assert not agent._inflight
+
     @pytest.mark.asyncio
     async def test_run_valuation_phase(self, agent, mock_research_response):
         """Test valuation phase with GPT-5 analysis."""
@@ -150,6 +366,121 @@ class TestNewValuationAgent:
             assert ticker in prompt_content
             assert "research" in prompt_content.lower()
 
+    @pytest.mark.asyncio
+    async def test_submit_batch_is_idempotent_per_session(self, agent, tmp_path, monkeypatch):
+        """Test a session's batch is submitted once and its ID reused afterwards."""
+        monkeypatch.chdir(tmp_path)
+
+        with patch.object(agent.openai_client, 'submit_batch', return_value="batch_123") as mock_submit:
+            first = await agent.submit_batch("test_session_123", ["AAPL", "MSFT", "AAPL"], 5)
+            second = await agent.submit_batch("test_session_123", ["AAPL", "MSFT"], 5)
+
+        assert first == second == "batch_123"
+        mock_submit.assert_called_once()
+        requests = mock_submit.call_args[0][0]
+        assert [custom_id for custom_id, _ in requests] == [
+            "test_session_123:AAPL:research",
+            "test_session_123:MSFT:research",
+        ]
+        assert "AAPL" in str(requests[0][1]["input"])
+
+    @pytest.mark.asyncio
+    async def test_submit_batch_rejects_different_pending_request(self, agent, tmp_path, monkeypatch):
+        """Test a pending batch is only reused for the same tickers and level."""
+        monkeypatch.chdir(tmp_path)
+
+        with patch.object(agent.openai_client, 'submit_batch', return_value="batch_123") as mock_submit:
+            await agent.submit_batch("s1", ["AAPL", "MSFT"], 5)
+
+            with pytest.raises(RuntimeError, match="batch_123"):
+                await agent.submit_batch("s1", ["GOOG"], 5)
+            with pytest.raises(RuntimeError, match="batch_123"):
+                await agent.submit_batch("s1", ["AAPL", "MSFT"], 8)
+
+        mock_submit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_poll_batch_runs_valuation_for_each_ticker(self, agent, tmp_path, monkeypatch):
+        """Test polling waits for the batch, then values every ticker from its research."""
+        monkeypatch.chdir(tmp_path)
+        with patch.object(agent.openai_client, 'submit_batch', return_value="batch_123"):
+            await agent.submit_batch("s1", ["AAPL", "MSFT"], 5)
+
+        outputs = iter([None, {"s1:AAPL:research": "AAPL research"}])
+        with patch.object(
+            agent.openai_client, 'retrieve_batch_output', side_effect=lambda _: next(outputs)
+        ), patch.object(
+            agent, '_run_valuation_phase', return_value="# Valuation"
+        ) as mock_valuation, patch("asyncio.sleep") as mock_sleep:
+            results = await agent.poll_batch("s1", "batch_123", poll_interval=1.0)
+
+        mock_sleep.assert_called_once_with(1.0)
+        mock_valuation.assert_called_once_with("s1", "AAPL", 5, "AAPL research")
+        assert results["AAPL"].success is True
+        assert results["MSFT"].success is False
+        assert results["MSFT"].error_message == "No research output in batch"
+
+    @pytest.mark.asyncio
+    async def test_poll_batch_times_out(self, agent, tmp_path, monkeypatch):
+        """Test polling gives up at the deadline and leaves the batch pending."""
+        monkeypatch.chdir(tmp_path)
+        with patch.object(agent.openai_client, 'submit_batch', return_value="batch_123"):
+            await agent.submit_batch("s1", ["AAPL"], 5)
+
+        with patch.object(
+            agent.openai_client, 'retrieve_batch_output', return_value=None
+        ) as mock_retrieve, pytest.raises(TimeoutError, match="batch_123"):
+            await agent.poll_batch("s1", "batch_123", poll_interval=0.01, max_wait_seconds=0.05)
+
+        assert mock_retrieve.call_count >= 2
+        with pytest.raises(RuntimeError):
+            await agent.submit_batch("s1", ["MSFT"], 5)
+
+    @pytest.mark.asyncio
+    async def test_poll_batch_uses_and_completes_record(self, agent, tmp_path, monkeypatch):
+        """Test polling reads the level from the record and frees the session afterwards."""
+        monkeypatch.chdir(tmp_path)
+        with patch.object(agent.openai_client, 'submit_batch', side_effect=["batch_1", "batch_2"]):
+            await agent.submit_batch("s1", ["AAPL"], 8)
+
+            with pytest.raises(ValueError, match="batch_other"):
+                await agent.poll_batch("s1", "batch_other")
+
+            with patch.object(
+                agent.openai_client, 'retrieve_batch_output',
+                return_value={"s1:AAPL:research": "AAPL research"},
+            ), patch.object(
+                agent, '_run_valuation_phase', return_value="# Valuation"
+            ) as mock_valuation:
+                await agent.poll_batch("s1", "batch_1")
+
+            mock_valuation.assert_called_once_with("s1", "AAPL", 8, "AAPL research")
+            assert await agent.submit_batch("s1", ["GOOG"], 5) == "batch_2"
+
+    @pytest.mark.asyncio
+    async def test_run_valuation_phase_batched(self, agent):
+        """Test several tickers share one framework prompt and bad items fall back."""
+        with patch.object(
+            agent.openai_client,
+            'create_structured_completion',
+            return_value={"AAPL": "# AAPL Valuation", "MSFT": ""},
+        ) as mock_structured, patch.object(
+            agent, '_run_valuation_phase', return_value="# MSFT Valuation"
+        ) as mock_single:
+            reports = await agent._run_valuation_phase_batched(
+                "s1", ["AAPL", "MSFT"], 5, ["AAPL research", "MSFT research"]
+            )
+
+        assert reports == {"AAPL": "# AAPL Valuation", "MSFT": "# MSFT Valuation"}
+        mock_single.assert_called_once_with("s1", "MSFT", 5, "MSFT research")
+
+        call_kwargs = mock_structured.call_args[1]
+        prompt = call_kwargs['messages'][1]['content']
+        assert prompt.count("Core IRR Decomposition Formula") == 1
+        assert "### TICKER 1: AAPL" in prompt and "### TICKER 2: MSFT" in prompt
+        assert call_kwargs['response_schema']['required'] == ["AAPL", "MSFT"]
+        assert call_kwargs['max_tokens'] == 32000
+
     @pytest.mark.asyncio
     async def test_write_research_files(self, agent):
         """Test research file writing to database."""
@@ -174,6 +505,87 @@ class TestNewValuationAgent:
             assert mock_file.call_count == 2
             mock_makedirs.assert_called()
 
+    @pytest.fixture
+    def async_write_agent(self):
+        """Create a ValuationAgent that persists research files in the background."""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            return ValuationAgent(write_async=True)
+
+    @pytest.mark.asyncio
+    async def test_conduct_research_writes_files_in_background(self, async_write_agent):
+        """Test that the result is returned before research files are persisted."""
+        agent = async_write_agent
+        write_started = asyncio.Event()
+        release_write = asyncio.Event()
+
+        async def slow_write(session_id, ticker, *args):
+            write_started.set()
+            await release_write.wait()
+            return agent._research_file_paths(session_id, ticker)
+
+        with patch.object(agent.openai_client, 'respond_with_web_search', return_value="Research"), \
+             patch.object(agent.openai_client, 'create_completion', return_value="Valuation"), \
+             patch.object(agent, '_write_research_files', side_effect=slow_write):
+            result = await agent.conduct_research("test_session_123", "AAPL", 5)
+
+            assert result.success is True
+            assert result.research_files_created == [
+                "research_database/sessions/test_session_123/AAPL/valuation/temp.md",
+                "research_database/sessions/test_session_123/AAPL/valuation/valuation.md",
+            ]
+            assert len(agent._pending_writes) == 1
+
+            await write_started.wait()
+            release_write.set()
+            assert await agent.wait_for_pending_writes("test_session_123") == []
+            assert not agent._pending_writes
+
+    @pytest.mark.asyncio
+    async def test_background_write_failures_are_reported(self, async_write_agent):
+        """Test failed background writes are returned for their session only."""
+        agent = async_write_agent
+        with patch.object(agent.openai_client, 'respond_with_web_search', return_value="Research"), \
+             patch.object(agent.openai_client, 'create_completion', return_value="Valuation"), \
+             patch.object(agent, '_write_research_files', return_value=[]):
+            await agent.conduct_research("s1", "AAPL", 5)
+            await agent.conduct_research("s2", "MSFT", 5)
+
+        assert await agent.wait_for_pending_writes("s1") == [
+            "research_database/sessions/s1/AAPL/valuation/temp.md",
+            "research_database/sessions/s1/AAPL/valuation/valuation.md",
+        ]
+        assert await agent.wait_for_pending_writes("s1") == []
+        assert len(await agent.wait_for_pending_writes("s2")) == 2
+
+    @pytest.mark.asyncio
+    async def test_conduct_research_sync_writes(self, agent):
+        """Test research files are persisted before returning by default."""
+        files = [
+            "research_database/sessions/test_session_123/AAPL/valuation/temp.md",
+            "research_database/sessions/test_session_123/AAPL/valuation/valuation.md",
+        ]
+        with patch.object(agent.openai_client, 'respond_with_web_search', return_value="Research"), \
+             patch.object(agent.openai_client, 'create_completion', return_value="Valuation"), \
+             patch.object(agent, '_write_research_files', return_value=files) as mock_write:
+            result = await agent.conduct_research("test_session_123", "AAPL", 5)
+
+        mock_write.assert_awaited_once()
+        assert result.success is True
+        assert result.research_files_created == files
+        assert not agent._pending_writes
+
+    @pytest.mark.asyncio
+    async def test_conduct_research_reports_write_failure(self, agent):
+        """Test a failed write yields an error result instead of phantom files."""
+        with patch.object(agent.openai_client, 'respond_with_web_search', return_value="Research"), \
+             patch.object(agent.openai_client, 'create_completion', return_value="Valuation"), \
+             patch.object(agent, '_write_research_files', return_value=[]):
+            result = await agent.conduct_research("test_session_123", "AAPL", 5)
+
+        assert result.success is False
+        assert result.error_message == "Failed to write research files"
+        assert result.research_files_created == []
+
     def test_get_expertise_depth_config(self, agent):
         """Test expertise level mapping."""
         # Test different expertise levels
@@ -186,6 +598,14 @@ class TestNewValuationAgent:
         config_10 = agent._get_expertise_depth_config(10)
         assert config_10["depth_name"] == "Executive"
 
+        # Out-of-range levels clamp to the nearest valid level
+        assert agent._get_expertise_depth_config(0)["depth_name"] == "Foundational"
+        assert agent._get_expertise_depth_config(11)["depth_name"] == "Executive"
+
+        # Configs are shared, so they must be read-only
+        with pytest.raises(TypeError):
+            config_1["depth_name"] = "Changed"
+
     def test_get_owner_returns_formulas(self, agent):
         """Test Owner-Returns formulas are included."""
         formulas = agent._get_owner_returns_formulas()
@@ -272,6 +692,17 @@ class TestNewValuationAgent:
         assert "NASDAQ, 2025-08-24" in citations
         assert "FactSet Database" in citations
 
+    def test_create_error_result(self, agent):
+        """Test error result creation from a perf_counter start time."""
+        result = agent._create_error_result(
+            "test_session_123", "INVALID", "Test error", time.perf_counter()
+        )
+
+        assert result.success is False
+        assert result.error_message == "Test error"
+        assert "INVALID" in result.summary
+        assert 0 <= result.execution_time_seconds < 1
+
     def test_log_research_start(self, agent, caplog):
         """Test research start logging."""
         import logging
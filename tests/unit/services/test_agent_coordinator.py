@@ -3,6 +3,7 @@
 import asyncio
 
 import pytest
+from pydantic import ValidationError
 
 from src.models.collaboration import AgentHandoff, ResearchStatus
 from src.services.agent_coordinator import AgentCoordinator
@@ -310,3 +311,15 @@ class TestAgentCoordinator:
             context_summary="This is a comprehensive analysis with detailed findings and recommendations."
         )
         assert invalid_handoff_same_agent.validate_handoff_integrity() is False
+
+    def test_agent_handoff_is_immutable(self):
+        """Test that handoffs cannot be modified after creation."""
+        handoff = AgentHandoff(
+            source_agent="valuation_agent",
+            target_agent="strategic_agent",
+            research_files=["valuation/analysis_v1.md"],
+            context_summary="Summary",
+        )
+
+        with pytest.raises(ValidationError):
+            handoff.target_agent = "historian_agent"
@@ -2,6 +2,7 @@
 
 import shutil
 import tempfile
+from unittest.mock import patch
 
 import pytest
 import yaml
@@ -218,6 +219,25 @@ class TestResearchDatabase:
         assert "valuation" in context["previous_research"]
         assert len(context["previous_research"]["valuation"]) == 1
 
+    def test_get_context_stamp(self, temp_db):
+        """Test the context stamp tracks only the files an agent reads as context."""
+        session_id = "test-session-123"
+        ticker = "AAPL"
+        temp_db.create_session_directory(session_id, ticker)
+
+        empty = temp_db.get_context_stamp(session_id, ticker, "strategic")
+        temp_db.write_research_file(session_id, ticker, "historical", "history.md", "History")
+        assert temp_db.get_context_stamp(session_id, ticker, "strategic") == empty
+
+        temp_db.write_research_file(session_id, ticker, "valuation", "dcf.md", "DCF")
+        stamp = temp_db.get_context_stamp(session_id, ticker, "strategic")
+        assert len(stamp) == 1
+        assert temp_db.get_context_stamp(session_id, ticker, "valuation") == ()
+
+        file_path = temp_db.sessions_path / session_id / ticker / "valuation" / "dcf.md"
+        file_path.write_text("A longer rewritten DCF analysis", encoding="utf-8")
+        assert temp_db.get_context_stamp(session_id, ticker, "strategic") != stamp
+
     def test_add_cross_reference(self, temp_db):
         """Test adding cross-references between files."""
         session_id = "test-session-123"
@@ -243,6 +263,27 @@ class TestResearchDatabase:
         assert ref["relationship"] == "DCF analysis references competitive advantages"
         assert "created_at" in ref
 
+    def test_add_cross_references_batch(self, temp_db):
+        """Test adding several cross-references in one call."""
+        session_id = "test-session-123"
+        ticker = "AAPL"
+
+        temp_db.create_session_directory(session_id, ticker)
+
+        with patch.object(temp_db, "_write_yaml_file", wraps=temp_db._write_yaml_file) as mock_write:
+            temp_db.add_cross_references(
+                session_id,
+                ticker,
+                [
+                    ("historical/company_history.md", "historical/temp_history.md", "Cites"),
+                    ("historical/company_history.md", "valuation/dcf.md", "Builds on"),
+                ],
+            )
+
+        mock_write.assert_called_once()
+        cross_refs = temp_db._read_cross_references(session_id, ticker)
+        assert [ref["relationship"] for ref in cross_refs["references"]] == ["Cites", "Builds on"]
+
     def test_file_index_updates(self, temp_db):
         """Test that file index is updated when files are written."""
         session_id = "test-session-123"
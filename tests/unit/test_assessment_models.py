@@ -4,7 +4,12 @@
 import pytest
 from pydantic import ValidationError
 
-from src.models.assessment import AssessmentQuestion, AssessmentResponse, UserSession
+from src.models.assessment import (
+    QUESTION_CATEGORIES,
+    AssessmentQuestion,
+    AssessmentResponse,
+    UserSession,
+)
 
 
 class TestUserSessionModel:
@@ -143,6 +148,40 @@ class TestAssessmentQuestion:
             with pytest.raises(ValidationError):
                 AssessmentQuestion(**question_data, weight=weight)
 
+    def test_category_validation(self):
+        """Test that only the known question categories are accepted."""
+        question_data = {
+            "id": 1,
+            "difficulty_level": 5,
+            "question": "Test question",
+            "options": ["A", "B", "C", "D"],
+            "correct_answer_index": 0,
+            "ticker_context": "AAPL",
+            "weight": 1.0,
+        }
+
+        for category in QUESTION_CATEGORIES:
+            assert AssessmentQuestion(**question_data, category=category).category == category
+
+        with pytest.raises(ValidationError):
+            AssessmentQuestion(**question_data, category="market_timing")
+
+    def test_question_is_immutable(self):
+        """Test that validated questions cannot be modified in place."""
+        question = AssessmentQuestion(
+            id=1,
+            difficulty_level=5,
+            category="general_investing",
+            question="Test question",
+            options=["A", "B", "C", "D"],
+            correct_answer_index=0,
+            ticker_context="AAPL",
+            weight=1.0,
+        )
+
+        with pytest.raises(ValidationError):
+            question.correct_answer_index = 3
+
 
 class TestAssessmentResponse:
     """Test AssessmentResponse model."""
@@ -0,0 +1,42 @@
+"""Unit tests for streamed JSON array extraction."""
+
+import orjson
+
+from src.utils.json_stream import JsonArrayItemStream
+
+
+class TestJsonArrayItemStream:
+    """Test incremental extraction of array items."""
+
+    def test_items_emitted_as_soon_as_complete(self):
+        """Test that each object is returned by the chunk that closes it."""
+        stream = JsonArrayItemStream("questions")
+
+        assert stream.feed('{"questions": [{"id": 1, "options": ["a", "b"]}, {"id"') == [
+            {"id": 1, "options": ["a", "b"]}
+        ]
+        assert stream.feed(": 2}") == [{"id": 2}]
+        assert stream.feed("]}") == []
+
+    def test_character_by_character_feed(self):
+        """Test tricky string contents survive arbitrary chunk boundaries."""
+        payload = {
+            "questions": [
+                {"id": i, "question": 'Braces {} and "quotes" ] \\\\ inside', "options": ["}"]}
+                for i in range(1, 6)
+            ]
+        }
+        stream = JsonArrayItemStream("questions")
+
+        items = []
+        for char in orjson.dumps(payload).decode():
+            items.extend(stream.feed(char))
+
+        assert items == payload["questions"]
+
+    def test_ignores_text_after_array_end(self):
+        """Test that nothing is emitted once the array has closed."""
+        stream = JsonArrayItemStream("questions")
+
+        assert stream.feed('{"questions": [], "extra": [{"id": 9}]}') == []
+        assert stream.feed('{"id": 10}') == []
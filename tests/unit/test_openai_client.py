@@ -0,0 +1,141 @@
+"""Unit tests for OpenAIClient Batch API and retry helpers."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import orjson
+import pytest
+from openai import RateLimitError
+
+from src.utils.openai_client import OpenAIClient
+
+
+class TestOpenAIClientBatch:
+    """Test batch submission and output parsing."""
+
+    @pytest.fixture
+    def client(self):
+        """Create an OpenAIClient with a mocked SDK client."""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            client = OpenAIClient()
+        client.client = MagicMock()
+        return client
+
+    def test_submit_batch_uploads_jsonl(self, client):
+        """Test each request becomes one /v1/responses line in the uploaded file."""
+        client.client.files.create.return_value = SimpleNamespace(id="file_123")
+        client.client.batches.create.return_value = SimpleNamespace(id="batch_123")
+        body = client.build_web_search_request(
+            messages=[{"role": "user", "content": "Research AAPL"}], max_output_tokens=1000
+        )
+
+        batch_id = client.submit_batch([("s1:AAPL:research", body), ("s1:MSFT:research", body)])
+
+        assert batch_id == "batch_123"
+        _, jsonl = client.client.files.create.call_args[1]["file"]
+        lines = [orjson.loads(line) for line in jsonl.splitlines()]
+        assert [line["custom_id"] for line in lines] == ["s1:AAPL:research", "s1:MSFT:research"]
+        assert lines[0]["url"] == "/v1/responses"
+        assert lines[0]["body"]["tools"] == [{"type": "web_search"}]
+        assert lines[0]["body"]["max_output_tokens"] == 1000
+        assert lines[0]["body"]["text"]["format"] == {"type": "text"}
+        client.client.batches.create.assert_called_once_with(
+            input_file_id="file_123", endpoint="/v1/responses", completion_window="24h"
+        )
+
+    def test_build_web_search_request_text_format(self, client):
+        """Test a json_schema text format replaces the default plain text format."""
+        text_format = {"type": "json_schema", "name": "payload", "schema": {}, "strict": True}
+
+        body = client.build_web_search_request(
+            messages=[{"role": "user", "content": "Research AAPL"}], text_format=text_format
+        )
+
+        assert body["text"]["format"] == text_format
+
+    def test_retrieve_batch_output(self, client):
+        """Test output text is returned per custom_id and failed requests are skipped."""
+
+        def record(custom_id, status_code, text):
+            body = {
+                "output": [
+                    {"type": "reasoning", "summary": []},
+                    {
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "output_text", "text": text}],
+                    },
+                ]
+            }
+            return orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "response": {"status_code": status_code, "body": body},
+                    "error": None,
+                }
+            ).decode()
+
+        client.client.batches.retrieve.return_value = SimpleNamespace(
+            status="completed", output_file_id="file_out"
+        )
+        client.client.files.content.return_value = SimpleNamespace(
+            text="\n".join(
+                [record("s1:AAPL:research", 200, "AAPL data"), record("s1:MSFT:research", 500, "")]
+            )
+        )
+
+        assert client.retrieve_batch_output("batch_123") == {"s1:AAPL:research": "AAPL data"}
+
+    def test_retrieve_batch_output_status(self, client):
+        """Test running batches return None and failed batches raise."""
+        client.client.batches.retrieve.return_value = SimpleNamespace(
+            status="in_progress", output_file_id=None
+        )
+        assert client.retrieve_batch_output("batch_123") is None
+
+        client.client.batches.retrieve.return_value = SimpleNamespace(
+            status="expired", output_file_id=None
+        )
+        with pytest.raises(RuntimeError, match="expired"):
+            client.retrieve_batch_output("batch_123")
+
+
+class TestOpenAIClientRetry:
+    """Test retry backoff for rate-limited requests."""
+
+    @staticmethod
+    def _rate_limit_error(headers: dict[str, str]) -> RateLimitError:
+        request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+        response = httpx.Response(429, headers=headers, request=request)
+        return RateLimitError("Rate limited", response=response, body=None)
+
+    def test_backoff_honors_retry_after(self):
+        """Test a numeric Retry-After header overrides exponential backoff."""
+        error = self._rate_limit_error({"retry-after": "7"})
+
+        assert OpenAIClient._backoff_delay(1, error) == 7.0
+        assert OpenAIClient._backoff_delay(1, self._rate_limit_error({"retry-after": "999"})) == 60.0
+
+    def test_backoff_without_retry_after(self):
+        """Test exponential backoff is used when no usable Retry-After is sent."""
+        http_date = self._rate_limit_error({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"})
+
+        assert 4.0 <= OpenAIClient._backoff_delay(3) < 4.34
+        assert 4.0 <= OpenAIClient._backoff_delay(3, http_date) < 4.34
+
+    def test_create_retries_rate_limit(self):
+        """Test create() sleeps for Retry-After and then succeeds."""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            client = OpenAIClient()
+        client.client = MagicMock()
+        client.client.responses.create.side_effect = [
+            self._rate_limit_error({"retry-after": "2"}),
+            "response",
+        ]
+
+        with patch("src.utils.openai_client.time.sleep") as mock_sleep:
+            assert client.create(messages=[{"role": "user", "content": "Hi"}]) == "response"
+
+        mock_sleep.assert_called_once_with(2.0)
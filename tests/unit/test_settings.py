@@ -62,6 +62,13 @@ class TestSettingsModel:
         assert settings.debug is False
         assert settings.max_tokens_per_request == 2000
 
+    def test_settings_are_immutable(self):
+        """Test that the shared settings instance cannot be mutated."""
+        settings = Settings(openai_api_key="test_key")
+
+        with pytest.raises(ValidationError):
+            settings.port = 9000
+
 
 class TestSettingsEnvironmentLoading:
     """Test suite for environment variable loading."""